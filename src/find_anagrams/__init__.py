@@ -7,32 +7,152 @@ from array import array
 from collections import defaultdict
 from functools import partial
 
+from find_anagrams.bloom import (  # noqa: F401
+    BloomFilter, FilteredAnagramIndex
+)
+from find_anagrams.compact import CompactAnagramIndex  # noqa: F401
+from find_anagrams.external import iter_anagram_groups_external  # noqa: F401
+from find_anagrams.index import AnagramIndex, BaseAnagramIndex
+from find_anagrams.mapped import (  # noqa: F401
+    MmapAnagramIndex, write_index_file
+)
+from find_anagrams.signatures import (  # noqa: F401
+    letter_counts, prime_product, sign_many, sorted_letters
+)
+from find_anagrams.near_anagrams import NearAnagramIndex
+from find_anagrams.sub_anagrams import SubAnagramIndex
+from find_anagrams.words import WordStore  # noqa: F401
 
-def find_anagrams(word, words):
+# a copy of the last list of words, a signature function, a version of the
+# index of the list and the index
+_cached_index = None
+
+
+def find_anagrams(word, words, signature=sorted_letters):
     """Find anagrams of given word in given list of words.
 
     :param word: A word to which anagrams needs to be found.
+    An index of the last list of words is reused while the list has the
+    same words, see 'get_anagram_index'. An index built once, e.g.
+    'AnagramIndex' or 'MmapAnagramIndex', can be passed instead of the list
+    to skip the comparison.
     :param words: A list of words that may or may not contain anagrams for
-    the given word.
+    the given word or an already built index.
+    :param signature: A signature function, see 'find_anagrams.signatures'.
+    It is ignored if an index is given.
     :return: A list of anagrams if any found.
     """
-    # prepare storage with data related to words
-    storage = prepare_storage_with_words(words)
-    # get indexes of anagrams related to parameters of given word
-    letters_amount = len(word)
-    indexes = storage[letters_amount][''.join(sorted(word.lower()))]
-    # gather words from original list and return in required format
-    return [words[idx] for idx in indexes]
+    return get_anagram_index(words, signature).lookup(word)
+
+
+def find_anagrams_many(words_to_query, words, signature=sorted_letters):
+    """Find anagrams of each of given words in given list of words.
+
+    It is much faster than calling 'find_anagrams' for each word because
+    the index is shared and every distinct signature is looked up once.
+    :param words_to_query: An iterable of words to which anagrams needs to
+    be found.
+    :param words: A list of words or an already built index.
+    :param signature: A signature function. It is ignored if an index is
+    given.
+    :return: A list of lists of anagrams in order of queried words.
+    """
+    return get_anagram_index(words, signature).lookup_many(words_to_query)
+
+
+def iter_anagram_groups(words, min_size=2, signature=sorted_letters):
+    """Iterate over all groups of anagrams in given list of words.
+
+    :param words: A list of words or an already built index.
+    :param min_size: Minimal amount of words in a group.
+    :param signature: A signature function. It is ignored if an index is
+    given.
+    :return: Generator of lists of words which are anagrams of each other.
+    """
+    return get_anagram_index(words, signature).iter_groups(min_size)
+
+
+def find_sub_anagrams(letters, words, min_length=None, max_length=None,
+                      limit=None, signature=sorted_letters):
+    """Find words which can be formed from a subset of given letters.
+
+    :param letters: A string of available letters. Each letter can be used
+    once.
+    :param words: A list of words or an already built anagram index.
+    :param min_length: Minimal length of found words.
+    :param max_length: Maximal length of found words.
+    :param limit: Maximal amount of found words.
+    :param signature: A signature function. It is ignored if an index is
+    given.
+    :return: A list of words ordered by length descending.
+    """
+    index = get_anagram_index(words, signature)
+    sub_index = index.get_derived(SubAnagramIndex, SubAnagramIndex)
+    return sub_index.find(letters, min_length, max_length, limit)
+
+
+def find_near_anagrams(word, words, max_edits=1, signature=sorted_letters):
+    """Find words which letters differ from letters of given word slightly.
+
+    Letters of found words differ from letters of the word by up to
+    'max_edits' inserted, deleted or substituted letters regardless of
+    their order. Exact anagrams are not included.
+    :param word: A word to which near anagrams needs to be found.
+    :param words: A list of words or an already built anagram index.
+    :param max_edits: Maximal amount of edits.
+    :param signature: A signature function. It is ignored if an index is
+    given.
+    :return: A list of words ordered by amount of edits.
+    """
+    index = get_anagram_index(words, signature)
+    near_index = index.get_derived(
+        (NearAnagramIndex, max_edits),
+        lambda source: NearAnagramIndex(source, max_edits),
+    )
+    return near_index.find(word, max_edits)
+
+
+def get_anagram_index(words, signature=sorted_letters):
+    """Get an index of anagrams for given list of words.
+
+    The index of the last given list or tuple is built over a shallow copy
+    of it and is reused while the list is equal to the copy and the index is
+    not changed, so repeated calls with the same words don't rebuild the
+    index and changes of the list in place are never missed. The comparison
+    is much cheaper than signing the words. Only the last list is kept.
+    :param words: A list of words to be indexed or an already built index
+    which is returned as is.
+    :param signature: A signature function.
+    :return: An instance of 'AnagramIndex' or given index.
+    """
+    global _cached_index
+
+    if isinstance(words, BaseAnagramIndex):
+        return words
+    if not isinstance(words, (list, tuple)):
+        return AnagramIndex(words, signature=signature)
+
+    cached = _cached_index
+    if cached is not None:
+        words_copy, cached_signature, version, index = cached
+        if cached_signature is signature and index.version == version and \
+                words_copy == words:
+            return index
+
+    words_copy = words[:]
+    index = AnagramIndex(words_copy, signature=signature)
+    _cached_index = (words_copy, signature, index.version, index)
+    return index
 
 
-def prepare_storage_with_words(words):
+def prepare_storage_with_words(words, signature=sorted_letters):
     """Prepare a storage with given words for fast lookup of anagrams.
 
     It gets given list of words and generates the following structure:
 
     {
         <amount of letters in words>: {
-            <sorted sequence of letters of words>: [
+            <signature of words, sorted sequence of letters by default>: [
                 <index of a word with these parameters in given list>,
                 ...
             ]
@@ -40,12 +160,13 @@ def prepare_storage_with_words(words):
         }
         ...
     }
+    :param words: A list of words.
+    :param signature: A signature function, see 'find_anagrams.signatures'.
     :return: The structure described above.
     """
     result = defaultdict(partial(defaultdict, lambda: array('L')))
-    for idx, item in enumerate(words):
+    for idx, (item, key) in enumerate(zip(words, sign_many(words, signature))):
         letters_amount = len(item)
-        sorted_letters = ''.join(sorted(item.lower()))
-        result[letters_amount][sorted_letters].append(idx)
+        result[letters_amount][key].append(idx)
 
     return result
@@ -0,0 +1,219 @@
+"""Bloom filter of signatures of words."""
+import hashlib
+import math
+import struct
+
+from six import text_type
+
+from find_anagrams.index import BaseAnagramIndex
+
+MAGIC = b'ANABLOOM'
+
+_header = struct.Struct('<3Q')
+_hash = struct.Struct('<2Q')
+
+
+def _get_hashes(key):
+    """Get two independent 64-bit hashes of given key.
+
+    Hashes don't depend on a process, so a filter can be saved and loaded.
+    :param key: A signature, a string or an integer.
+    :return: A tuple of two integers.
+    """
+    if isinstance(key, text_type):
+        data = key.encode('utf-8')
+    else:
+        data = str(key).encode('ascii')
+    return _hash.unpack(hashlib.md5(data).digest())
+
+
+class BloomFilter(object):
+    """Bloom filter (https://en.wikipedia.org/wiki/Bloom_filter).
+
+    It is a compact probabilistic set: it may answer that it contains a key
+    which has never been added with a configured probability, but it never
+    misses an added key. Positions of bits are derived from two hashes by
+    double hashing.
+    Usage example:
+
+    .. code-block:: python
+
+        >>> bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+        >>> bloom_filter.add('art')
+        >>>
+        >>> assert 'art' in bloom_filter
+
+    """
+
+    __slots__ = ('_bits', '_size', '_hashes_amount', '_count')
+
+    def __init__(self, capacity, error_rate=0.01):
+        """Initialize a filter.
+
+        :param capacity: Expected amount of keys.
+        :param error_rate: Probability of false positives when the filter
+        contains the expected amount of keys.
+        :raise ValueError: If the error rate is not between 0 and 1.
+        """
+        super(BloomFilter, self).__init__()
+
+        if not 0 < error_rate < 1:
+            raise ValueError('Error rate must be between 0 and 1')
+
+        capacity = max(capacity, 1)
+        size = -capacity * math.log(error_rate) / math.log(2) ** 2
+        self._size = max(int(math.ceil(size / 8)) * 8, 8)
+        self._hashes_amount = max(
+            int(round(float(self._size) / capacity * math.log(2))), 1
+        )
+        self._bits = bytearray(self._size // 8)
+        self._count = 0
+
+    @property
+    def nbytes(self):
+        """Get amount of bytes occupied by bits of the filter."""
+        return len(self._bits)
+
+    def _iter_positions(self, key):
+        """Iterate over positions of bits of given key.
+
+        :param key: A key.
+        :return: Generator of positions.
+        """
+        first_hash, second_hash = _get_hashes(key)
+        size = self._size
+        for idx in range(self._hashes_amount):
+            yield (first_hash + idx * second_hash) % size
+
+    def add(self, key):
+        """Add a key to the filter.
+
+        :param key: A key.
+        """
+        bits = self._bits
+        for position in self._iter_positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+        self._count += 1
+
+    def __contains__(self, key):
+        """May the filter contain given key or not.
+
+        :param key: A key to check.
+        :return: False if the key has never been added, True if it has been
+        added or in case of a false positive.
+        """
+        bits = self._bits
+        for position in self._iter_positions(key):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __len__(self):
+        """Get amount of added keys."""
+        return self._count
+
+    def save(self, path):
+        """Write the filter to a file.
+
+        :param path: A path to a file.
+        """
+        with open(path, 'wb') as filter_file:
+            filter_file.write(MAGIC)
+            filter_file.write(_header.pack(
+                self._size, self._hashes_amount, self._count
+            ))
+            filter_file.write(self._bits)
+
+    @classmethod
+    def load(cls, path):
+        """Read a filter from a file written by 'save'.
+
+        :param path: A path to a file.
+        :raise ValueError: If the file is not a filter file.
+        :return: A filter.
+        """
+        with open(path, 'rb') as filter_file:
+            if filter_file.read(len(MAGIC)) != MAGIC:
+                raise ValueError('{} is not a Bloom filter file'.format(path))
+            size, hashes_amount, count = _header.unpack(
+                filter_file.read(_header.size)
+            )
+            bits = bytearray(filter_file.read())
+
+        bloom_filter = cls.__new__(cls)
+        bloom_filter._size = size
+        bloom_filter._hashes_amount = hashes_amount
+        bloom_filter._count = count
+        bloom_filter._bits = bits
+        return bloom_filter
+
+
+class FilteredAnagramIndex(BaseAnagramIndex):
+    """Anagram index with a Bloom filter of signatures in front of it.
+
+    Words without anagrams are rejected by the filter without touching the
+    underlying index, e.g. without reading pages of 'MmapAnagramIndex' from
+    a disk. Only false positives, which rate is configurable, and words with
+    anagrams reach the index.
+    Usage example:
+
+    .. code-block:: python
+
+        >>> index = FilteredAnagramIndex(MmapAnagramIndex('index.bin'))
+        >>>
+        >>> assert index.lookup('Rat') == ['TAR', 'art']
+
+    """
+
+    __slots__ = ('_index', '_filter')
+
+    def __init__(self, index, error_rate=0.01, bloom_filter=None):
+        """Initialize an index.
+
+        :param index: An anagram index to be filtered. It must not be
+        changed while the filtered index is used.
+        :param error_rate: Probability of false positives of the filter.
+        :param bloom_filter: A previously built and saved filter of the
+        index. If not given, a filter is built from all groups of the index.
+        """
+        super(FilteredAnagramIndex, self).__init__(
+            index._words, index.signature
+        )
+
+        self._index = index
+        if bloom_filter is None:
+            signature = index.signature
+            signatures = [
+                signature(group[0])
+                for group in index.iter_groups(min_size=1)
+            ]
+            bloom_filter = BloomFilter(len(signatures), error_rate)
+            for key in signatures:
+                bloom_filter.add(key)
+        self._filter = bloom_filter
+
+    @property
+    def bloom_filter(self):
+        """Get the filter of signatures."""
+        return self._filter
+
+    def _find_indexes(self, signature):
+        """Find indexes of words with given signature.
+
+        :param signature: Signature of words.
+        :return: A sequence of indexes of words in the indexed list.
+        """
+        if signature not in self._filter:
+            return ()
+        return self._index._find_indexes(signature)
+
+    def _iter_indexes_of_groups(self):
+        """Iterate over groups of indexes of words with the same signature.
+
+        :return: An iterator over sequences of indexes of words.
+        """
+        return self._index._iter_indexes_of_groups()
+
+    def __len__(self):
+        """Get amount of words in the index."""
+        return len(self._index)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""Tests of Bloom filter of signatures."""
+import os
+import shutil
+import tempfile
+import unittest
+
+from six.moves import range
+
+from find_anagrams import (
+    AnagramIndex, BloomFilter, FilteredAnagramIndex, find_anagrams,
+    prime_product
+)
+
+
+class TestBloomFilter(unittest.TestCase):
+    """Tests of Bloom filter."""
+
+    def test_contains(self):
+        """Test that added keys are always found."""
+        bloom_filter = BloomFilter(100)
+
+        for key in range(100):
+            bloom_filter.add(key)
+            bloom_filter.add(str(key) + u'é')
+
+        self.assertEqual(len(bloom_filter), 200)
+        for key in range(100):
+            self.assertIn(key, bloom_filter)
+            self.assertIn(str(key) + u'é', bloom_filter)
+
+    def test_error_rate(self):
+        """Test that false positives rate is close to the configured one."""
+        bloom_filter = BloomFilter(1000, error_rate=0.01)
+        for key in range(1000):
+            bloom_filter.add(key)
+
+        false_positives = sum(
+            1 for key in range(1000, 11000) if key in bloom_filter
+        )
+
+        self.assertLess(false_positives, 200)
+
+    def test_invalid_error_rate(self):
+        """Test creation with invalid error rate."""
+        with self.assertRaises(ValueError):
+            BloomFilter(10, error_rate=1)
+
+    def test_save_and_load(self):
+        """Test writing a filter to a file and reading it back."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, 'filter.bin')
+        bloom_filter = BloomFilter(10)
+        bloom_filter.add('art')
+
+        bloom_filter.save(path)
+        loaded_filter = BloomFilter.load(path)
+
+        self.assertIn('art', loaded_filter)
+        self.assertEqual(len(loaded_filter), 1)
+        self.assertEqual(loaded_filter.nbytes, bloom_filter.nbytes)
+
+
+class TestFilteredAnagramIndex(unittest.TestCase):
+    """Tests of anagram index with a Bloom filter."""
+
+    def setUp(self):
+        """Create an index."""
+        self.index = AnagramIndex(['TLDR', 'TAR', 'art', 'TBD'])
+
+    def test_lookup(self):
+        """Test finding of anagrams through the filter."""
+        index = FilteredAnagramIndex(self.index)
+
+        self.assertListEqual(index.lookup('Rat'), ['TAR', 'art'])
+        self.assertListEqual(index.lookup('dog'), [])
+        self.assertIn('art', index)
+        self.assertEqual(len(index), 4)
+        self.assertListEqual(find_anagrams('tar', index), ['TAR', 'art'])
+
+    def test_rejected_words_do_not_reach_index(self):
+        """Test that words rejected by the filter don't touch the index."""
+        index = FilteredAnagramIndex(self.index, error_rate=0.0001)
+        self.index._storage = None
+
+        self.assertListEqual(index.lookup('dog'), [])
+
+    def test_integer_signatures(self):
+        """Test filtering of an index with integer signatures."""
+        index = FilteredAnagramIndex(
+            AnagramIndex(['TAR', 'art', 'a-b'], signature=prime_product)
+        )
+
+        self.assertListEqual(index.lookup('rat'), ['TAR', 'art'])
+        self.assertListEqual(index.lookup('b-a'), ['a-b'])
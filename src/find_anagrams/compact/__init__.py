@@ -0,0 +1,132 @@
+"""Compact index of anagrams."""
+from array import array
+
+from six.moves import range
+
+from find_anagrams.index import BaseAnagramIndex
+from find_anagrams.signatures import sorted_letters
+
+
+def build_compact_arrays(words):
+    """Build flat arrays of a compact index of given words.
+
+    :param words: An iterable of words to be indexed.
+    :return: A tuple of (keys, key_offsets, group_offsets, indexes) where
+    'keys' is a byte string of sorted signatures encoded with UTF-8 and the
+    rest are arrays described in 'CompactAnagramIndex'.
+    """
+    groups = {}
+    for idx, item in enumerate(words):
+        signature = sorted_letters(item).encode('utf-8')
+        indexes = groups.get(signature)
+        if indexes is None:
+            indexes = groups[signature] = array('L')
+        indexes.append(idx)
+
+    keys = bytearray()
+    key_offsets = array('L', [0])
+    group_offsets = array('L', [0])
+    flat_indexes = array('L')
+    for signature in sorted(groups):
+        keys += signature
+        key_offsets.append(len(keys))
+        flat_indexes.extend(groups.pop(signature))
+        group_offsets.append(len(flat_indexes))
+
+    return bytes(keys), key_offsets, group_offsets, flat_indexes
+
+
+class CompactAnagramIndex(BaseAnagramIndex):
+    """Index of anagrams stored in a few flat arrays.
+
+    Instead of a dictionary with an array per signature it uses
+    a compressed sparse row layout:
+
+    * signatures of all groups encoded with UTF-8, sorted and concatenated
+      into a single byte string;
+    * an array of offsets of signatures in that byte string;
+    * an array of offsets of groups in an array of indexes;
+    * a flat array of indexes of words grouped by signatures.
+
+    Signature of group `i` is `keys[key_offsets[i]:key_offsets[i + 1]]`
+    and indexes of its words are
+    `indexes[group_offsets[i]:group_offsets[i + 1]]`. Groups are found by
+    binary search over sorted signatures. That costs a few bytes per word
+    instead of a dictionary entry and an array object per signature.
+    Signatures are always computed by 'sorted_letters'.
+    Usage example:
+
+    .. code-block:: python
+
+        >>> index = CompactAnagramIndex(['TLDR', 'TAR', 'art', 'TBD'])
+        >>>
+        >>> assert index.lookup('Rat') == ['TAR', 'art']
+
+    """
+
+    __slots__ = ('_keys', '_key_offsets', '_group_offsets', '_indexes')
+
+    def __init__(self, words):
+        """Initialize an index.
+
+        :param words: A list of words to be indexed. The list is not copied,
+        so it must not be changed while the index is used.
+        """
+        super(CompactAnagramIndex, self).__init__(words)
+
+        (self._keys, self._key_offsets,
+         self._group_offsets, self._indexes) = build_compact_arrays(words)
+
+    @property
+    def nbytes(self):
+        """Get amount of bytes occupied by the arrays of the index.
+
+        Memory of the indexed list of words is not taken into account.
+        """
+        return len(self._keys) + sum(
+            len(item) * item.itemsize
+            for item in (self._key_offsets, self._group_offsets,
+                         self._indexes)
+        )
+
+    def _find_group(self, signature):
+        """Find a number of a group of words with given signature.
+
+        :param signature: Signature encoded with UTF-8.
+        :return: A number of a group or -1 if there is no such group.
+        """
+        keys = self._keys
+        key_offsets = self._key_offsets
+        low, high = 0, len(key_offsets) - 1
+        while low < high:
+            middle = (low + high) // 2
+            key = keys[key_offsets[middle]:key_offsets[middle + 1]]
+            if key < signature:
+                low = middle + 1
+            elif key > signature:
+                high = middle
+            else:
+                return middle
+        return -1
+
+    def _find_indexes(self, signature):
+        """Find indexes of words with given signature.
+
+        :param signature: Signature of words.
+        :return: A sequence of indexes of words in the indexed list.
+        """
+        group = self._find_group(signature.encode('utf-8'))
+        if group < 0:
+            return ()
+        group_offsets = self._group_offsets
+        return self._indexes[group_offsets[group]:group_offsets[group + 1]]
+
+    def _iter_indexes_of_groups(self):
+        """Iterate over groups of indexes of words with the same signature.
+
+        :return: An iterator over sequences of indexes of words.
+        """
+        group_offsets = self._group_offsets
+        indexes = self._indexes
+        for group in range(len(group_offsets) - 1):
+            yield indexes[group_offsets[group]:group_offsets[group + 1]]
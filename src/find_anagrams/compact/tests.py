@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""Tests of compact anagram index."""
+import unittest
+
+from find_anagrams import AnagramIndex, CompactAnagramIndex
+
+
+class TestCompactAnagramIndex(unittest.TestCase):
+    """Tests of compact anagram index."""
+
+    def setUp(self):
+        """Create an index."""
+        self.words = ['TLDR', 'TAR', 'art', 'TBD', 'rat', u'été']
+        self.index = CompactAnagramIndex(self.words)
+
+    def test_lookup(self):
+        """Test finding of anagrams in the index."""
+        self.assertListEqual(self.index.lookup('Rat'), ['TAR', 'art', 'rat'])
+        self.assertListEqual(self.index.lookup('drlt'), ['TLDR'])
+        self.assertListEqual(self.index.lookup(u'téé'),
+                             [u'été'])
+        self.assertListEqual(self.index.lookup('no_anagrams'), [])
+        self.assertListEqual(self.index.lookup(''), [])
+
+    def test_same_as_dict_storage(self):
+        """Test that every word has the same anagrams as in dict storage."""
+        index = AnagramIndex(self.words)
+
+        for word in self.words:
+            self.assertListEqual(self.index.lookup(word), index.lookup(word))
+
+    def test_iter_groups(self):
+        """Test iteration over groups of anagrams."""
+        self.assertListEqual(list(self.index.iter_groups()),
+                             [['TAR', 'art', 'rat']])
+        self.assertEqual(len(list(self.index.iter_groups(min_size=1))), 4)
+
+    def test_contains(self):
+        """Test checking if a word is in the index."""
+        self.assertIn('art', self.index)
+        self.assertNotIn('tra', self.index)
+
+    def test_empty(self):
+        """Test an index of empty list of words."""
+        index = CompactAnagramIndex([])
+
+        self.assertListEqual(index.lookup('rat'), [])
+        self.assertEqual(len(index), 0)
@@ -0,0 +1,169 @@
+"""Grouping of anagrams in corpora which don't fit in memory.
+
+Words are partitioned by a hash of their signatures into spill files on
+a disk, so all anagrams of a word get into the same file. Then each file is
+grouped in memory independently. A file which is still too big to be
+grouped in memory is partitioned again with another hash, so memory usage
+is bounded regardless of size of a corpus.
+"""
+import os
+import shutil
+import tempfile
+import zlib
+
+from six import text_type
+from six.moves import range
+
+from find_anagrams.signatures import sorted_letters
+
+# default limit of memory used to group a partition
+DEFAULT_MAX_MEMORY = 256 * 1024 * 1024
+# approximate ratio of memory occupied by grouped words to their size
+# in a spill file, it accounts for string objects, lists and a dictionary
+_memory_factor = 12
+
+
+def _get_partition(key, salt, partitions):
+    """Get a partition of a signature.
+
+    The hash doesn't depend on a process, unlike built-in 'hash'.
+    :param key: A signature.
+    :param salt: A salt that makes hashes of every level of partitioning
+    independent.
+    :param partitions: Amount of partitions.
+    :return: A number of a partition.
+    """
+    if isinstance(key, text_type):
+        data = key.encode('utf-8')
+    else:
+        data = str(key).encode('ascii')
+    return (zlib.crc32(salt + data) & 0xFFFFFFFF) % partitions
+
+
+def _spill(words, directory, salt, partitions, signature, buffer_size):
+    """Write words into partition files by hashes of their signatures.
+
+    :param words: An iterable of words.
+    :param directory: A directory for files.
+    :param salt: A salt of hashes.
+    :param partitions: Amount of partitions.
+    :param signature: A signature function.
+    :param buffer_size: Size of a write buffer of each file.
+    :raise ValueError: If a word contains a line break.
+    :return: A list of paths of files.
+    """
+    paths = [
+        os.path.join(directory, 'partition-{}'.format(idx))
+        for idx in range(partitions)
+    ]
+    files = [open(path, 'wb', buffer_size) for path in paths]
+    try:
+        for word in words:
+            if '\n' in word:
+                raise ValueError('Words must not contain line breaks')
+            partition = _get_partition(signature(word), salt, partitions)
+            files[partition].write(word.encode('utf-8') + b'\n')
+    finally:
+        for spill_file in files:
+            spill_file.close()
+    return paths
+
+
+def _iter_words_of_file(path):
+    """Read words from a spill file.
+
+    :param path: A path to a spill file.
+    :return: Generator of words.
+    """
+    with open(path, 'rb') as spill_file:
+        for line in spill_file:
+            yield line[:-1].decode('utf-8')
+
+
+def _group_partition(path, min_size, signature, max_memory, partitions,
+                     buffer_size, level):
+    """Group words of a spill file by signatures.
+
+    :param path: A path to a spill file.
+    :param min_size: Minimal amount of words in a group.
+    :param signature: A signature function.
+    :param max_memory: Limit of memory used to group a partition.
+    :param partitions: Amount of partitions of the next level.
+    :param buffer_size: Size of a write buffer of each spill file.
+    :param level: Level of partitioning.
+    :return: Generator of groups of anagrams.
+    """
+    size = os.path.getsize(path)
+    if size * _memory_factor > max_memory and level < 8:
+        # partitioning with another hash splits a big partition
+        # unless all its words have the same signature
+        directory = tempfile.mkdtemp(dir=os.path.dirname(path))
+        try:
+            salt = 'level-{}'.format(level).encode('ascii')
+            sub_paths = _spill(
+                _iter_words_of_file(path), directory, salt, partitions,
+                signature, buffer_size
+            )
+            os.remove(path)
+            for sub_path in sub_paths:
+                for group in _group_partition(
+                        sub_path, min_size, signature, max_memory,
+                        partitions, buffer_size, level + 1):
+                    yield group
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        return
+
+    groups = {}
+    for word in _iter_words_of_file(path):
+        groups.setdefault(signature(word), []).append(word)
+    os.remove(path)
+
+    for group in groups.values():
+        if len(group) >= min_size:
+            yield group
+
+
+def iter_anagram_groups_external(words, min_size=2, signature=sorted_letters,
+                                 max_memory=DEFAULT_MAX_MEMORY,
+                                 partitions=64, buffer_size=64 * 1024,
+                                 tmp_dir=None):
+    """Iterate over groups of anagrams in a corpus of any size.
+
+    Usage example:
+
+    .. code-block:: python
+
+        >>> for group in iter_anagram_groups_external(
+        ...         iter_words_from_file('corpus.txt'),
+        ...         max_memory=64 * 1024 * 1024):
+        ...     print(group)
+
+    :param words: An iterable of words. It is consumed once and lazily.
+    Words must not contain line breaks.
+    :param min_size: Minimal amount of words in a group.
+    :param signature: A signature function, the same as used by
+    'find_anagrams' by default.
+    :param max_memory: Approximate limit of memory in bytes used to group
+    a partition.
+    :param partitions: Amount of spill files a corpus is split into.
+    :param buffer_size: Size of a write buffer of each spill file, so up to
+    'partitions * buffer_size' bytes are used for buffers.
+    :param tmp_dir: A directory for spill files, a system temporary
+    directory by default.
+    :return: Generator of lists of words which are anagrams of each other.
+    Groups are returned in arbitrary order, words within a group are in
+    order of the corpus.
+    """
+    directory = tempfile.mkdtemp(dir=tmp_dir)
+    try:
+        paths = _spill(
+            words, directory, b'level-0', partitions, signature, buffer_size
+        )
+        for path in paths:
+            for group in _group_partition(path, min_size, signature,
+                                          max_memory, partitions,
+                                          buffer_size, 1):
+                yield group
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
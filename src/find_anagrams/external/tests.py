@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""Tests of grouping of anagrams out of memory."""
+import os
+import shutil
+import tempfile
+import unittest
+
+from find_anagrams import (
+    iter_anagram_groups, iter_anagram_groups_external, letter_counts,
+    sorted_letters
+)
+
+WORDS = ['TLDR', 'TAR', 'art', 'TBD', 'dog', 'God', 'rat', u'été', u'téé']
+
+
+def normalize(groups):
+    """Sort groups to compare them regardless of order."""
+    return sorted(sorted(group) for group in groups)
+
+
+class TestIterAnagramGroupsExternal(unittest.TestCase):
+    """Tests of grouping of anagrams out of memory."""
+
+    def setUp(self):
+        """Create a directory for spill files."""
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the directory for spill files."""
+        shutil.rmtree(self.tmp_dir)
+
+    def assertSameAsInMemory(self, **kwargs):
+        """Assert if groups differ from groups built in memory."""
+        min_size = kwargs.pop('min_size', 2)
+        signature = kwargs.get('signature', sorted_letters)
+
+        groups = iter_anagram_groups_external(
+            iter(WORDS), min_size, tmp_dir=self.tmp_dir, **kwargs
+        )
+
+        expected = iter_anagram_groups(list(WORDS), min_size, signature)
+        self.assertListEqual(normalize(groups), normalize(expected))
+
+    def test_groups(self):
+        """Test grouping of words."""
+        self.assertSameAsInMemory()
+        self.assertSameAsInMemory(min_size=1, partitions=3)
+        self.assertSameAsInMemory(signature=letter_counts)
+
+    def test_repartitioning(self):
+        """Test grouping when partitions don't fit in memory."""
+        self.assertSameAsInMemory(max_memory=1, partitions=2)
+        self.assertSameAsInMemory(min_size=1, max_memory=1, partitions=2)
+
+    def test_order_of_words(self):
+        """Test that words in a group are in order of the corpus."""
+        groups = list(iter_anagram_groups_external(
+            ['rat', 'TAR', 'art'], tmp_dir=self.tmp_dir
+        ))
+
+        self.assertListEqual(groups, [['rat', 'TAR', 'art']])
+
+    def test_spill_files_are_removed(self):
+        """Test that spill files are removed when iteration is stopped."""
+        groups = iter_anagram_groups_external(
+            WORDS, tmp_dir=self.tmp_dir, max_memory=1
+        )
+        next(groups)
+        groups.close()
+
+        self.assertListEqual(os.listdir(self.tmp_dir), [])
+
+    def test_line_breaks(self):
+        """Test that words with line breaks are rejected."""
+        with self.assertRaises(ValueError):
+            list(iter_anagram_groups_external(['a\nb'], tmp_dir=self.tmp_dir))
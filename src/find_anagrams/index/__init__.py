@@ -0,0 +1,483 @@
+"""Reusable index of anagrams."""
+import multiprocessing
+from array import array
+
+from six import string_types
+from six.moves import range
+
+from find_anagrams.signatures import sign_many, sorted_letters
+from find_anagrams.words import WordStore, iter_words_from_file
+
+
+def build_storage(words, start=0, signature=sorted_letters):
+    """Group indexes of given words by their signatures.
+
+    :param words: An iterable of words.
+    :param start: Index of the first word.
+    :param signature: A signature function.
+    :return: A dictionary where keys are signatures and values are arrays
+    of indexes of words with these signatures in ascending order.
+    """
+    storage = {}
+    for idx, key in enumerate(sign_many(words, signature), start):
+        indexes = storage.get(key)
+        if indexes is None:
+            indexes = storage[key] = array('L')
+        indexes.append(idx)
+    return storage
+
+
+def _build_storage_of_chunk(chunk):
+    """Group indexes of words of a chunk by their signatures.
+
+    It is executed in a worker process. The result is packed into a few
+    flat objects because pickling of a dictionary with an array per
+    signature takes more time than building it.
+    :param chunk: A tuple of (words, index of the first word, signature
+    function).
+    :return: A tuple of (signatures, sizes of groups, indexes of words)
+    where indexes of words are grouped by signatures in one array.
+    Signatures which are strings are joined into one string and their
+    lengths are returned as well.
+    """
+    storage = build_storage(*chunk)
+    group_sizes = array('L', (len(indexes) for indexes in storage.values()))
+    flat_indexes = array('L')
+    for indexes in storage.values():
+        flat_indexes.extend(indexes)
+
+    signatures = list(storage)
+    if all(isinstance(key, string_types) for key in signatures):
+        key_lengths = array('L', (len(key) for key in signatures))
+        signatures = (''.join(signatures), key_lengths)
+    return signatures, group_sizes, flat_indexes
+
+
+def _iter_signatures(signatures):
+    """Iterate over signatures returned by '_build_storage_of_chunk'.
+
+    :param signatures: A list of signatures or a tuple of (joined
+    signatures, lengths of signatures).
+    :return: An iterable of signatures.
+    """
+    if isinstance(signatures, list):
+        return signatures
+
+    joined_signatures, key_lengths = signatures
+    result = []
+    key_offset = 0
+    for key_length in key_lengths:
+        result.append(joined_signatures[key_offset:key_offset + key_length])
+        key_offset += key_length
+    return result
+
+
+def build_storage_in_parallel(words, processes=None, chunk_size=None,
+                              signature=sorted_letters):
+    """Group indexes of given words by their signatures using processes.
+
+    Words are split into chunks which are processed by a pool of processes.
+    Partial results are merged in order of chunks, so the result is exactly
+    the same as the one of 'build_storage'.
+    :param words: A list of words.
+    :param processes: Amount of processes. It equals to amount of CPUs
+    by default.
+    :param chunk_size: Amount of words in a chunk. By default words are
+    split into 4 chunks per process.
+    :param signature: A signature function. It must be defined at the top
+    level of a module to be passed to processes.
+    :return: A dictionary returned by 'build_storage'.
+    """
+    processes = processes or multiprocessing.cpu_count()
+    if chunk_size is None:
+        chunk_size = max(len(words) // (processes * 4), 1)
+    chunks = (
+        (words[start:start + chunk_size], start, signature)
+        for start in range(0, len(words), chunk_size)
+    )
+
+    storage = {}
+    pool = multiprocessing.Pool(processes)
+    try:
+        for signatures, group_sizes, flat_indexes in pool.imap(
+                _build_storage_of_chunk, chunks):
+            group_offset = 0
+            for key, group_size in zip(_iter_signatures(signatures),
+                                       group_sizes):
+                indexes = flat_indexes[group_offset:group_offset + group_size]
+                group_offset += group_size
+
+                existing_indexes = storage.get(key)
+                if existing_indexes is None:
+                    storage[key] = indexes
+                else:
+                    existing_indexes.extend(indexes)
+    finally:
+        pool.terminate()
+        pool.join()
+    return storage
+
+
+class ExtendedWords(object):
+    """Sequence of words that extends a list without changing it.
+
+    Words are appended after the words of the original list, so indexes of
+    the original words stay the same.
+    """
+
+    __slots__ = ('_words', '_size', '_added')
+
+    def __init__(self, words):
+        """Initialize a sequence.
+
+        :param words: A list of words to be extended.
+        """
+        super(ExtendedWords, self).__init__()
+
+        self._words = words
+        self._size = len(words)
+        self._added = []
+
+    def append(self, word):
+        """Append a word to the end of the sequence.
+
+        :param word: A word.
+        """
+        self._added.append(word)
+
+    def __getitem__(self, idx):
+        """Get a word by given index.
+
+        :param idx: A non-negative index of a word.
+        :return: The word.
+        """
+        if idx < self._size:
+            return self._words[idx]
+        return self._added[idx - self._size]
+
+    def __len__(self):
+        """Get amount of words."""
+        return self._size + len(self._added)
+
+
+class BaseAnagramIndex(object):
+    """Base class for indexes of anagrams.
+
+    Subclasses store indexes of words grouped by signatures and must
+    implement '_find_indexes' method. Subclasses which can be changed
+    increment the version of the index on every change, so indexes derived
+    from it are rebuilt.
+    """
+
+    __slots__ = ('_words', '_signature', '_version', '_derived',
+                 '_derived_version')
+
+    def __init__(self, words, signature=sorted_letters):
+        """Initialize an index.
+
+        :param words: A list of words to be indexed. The list is not copied,
+        so it must not be changed while the index is used.
+        :param signature: A signature function, see 'find_anagrams.signatures'.
+        """
+        super(BaseAnagramIndex, self).__init__()
+
+        self._words = words
+        self._signature = signature
+        self._version = 0
+        # indexes derived from the index by their keys and their version
+        self._derived = {}
+        self._derived_version = 0
+
+    @property
+    def signature(self):
+        """Get the signature function of the index."""
+        return self._signature
+
+    @property
+    def version(self):
+        """Get the version of the index which changes with its words."""
+        return self._version
+
+    def get_derived(self, key, build):
+        """Get an index derived from the index, e.g. 'SubAnagramIndex'.
+
+        A derived index is built once and is kept by the index until the
+        index is changed, so it is freed together with the index.
+        :param key: A key of the derived index, e.g. its class and options.
+        :param build: A function which builds the derived index from the
+        index.
+        :return: The derived index.
+        """
+        if self._derived_version != self._version:
+            self._derived = {}
+            self._derived_version = self._version
+        derived = self._derived.get(key)
+        if derived is None:
+            derived = self._derived[key] = build(self)
+        return derived
+
+    def _find_indexes(self, signature):
+        """Find indexes of words with given signature.
+
+        :param signature: Signature of words.
+        :return: A sequence of indexes of words in the indexed list.
+        """
+        raise NotImplementedError
+
+    def _iter_indexes_of_groups(self):
+        """Iterate over groups of indexes of words with the same signature.
+
+        :return: An iterator over sequences of indexes of words.
+        """
+        raise NotImplementedError
+
+    def lookup(self, word):
+        """Find anagrams of given word in the index.
+
+        :param word: A word to which anagrams needs to be found.
+        :return: A list of anagrams if any found. Anagrams are ordered as
+        they are in the indexed list of words.
+        """
+        return self._lookup_signature(self._signature(word))
+
+    def _lookup_signature(self, signature):
+        """Find words with given signature.
+
+        :param signature: Signature of words.
+        :return: A list of words.
+        """
+        words = self._words
+        return [words[idx] for idx in self._find_indexes(signature)]
+
+    def lookup_many(self, words):
+        """Find anagrams of each of given words in the index.
+
+        Every distinct signature is looked up only once per call.
+        :param words: An iterable of words to which anagrams needs to be
+        found.
+        :return: A list of lists of anagrams in order of given words.
+        """
+        found = {}
+        result = []
+        for signature in sign_many(words, self._signature):
+            anagrams = found.get(signature)
+            if anagrams is None:
+                anagrams = found[signature] = self._lookup_signature(signature)
+            result.append(list(anagrams))
+        return result
+
+    def iter_groups(self, min_size=2):
+        """Iterate over groups of anagrams in the index.
+
+        Groups are built lazily, one at a time.
+        :param min_size: Minimal amount of words in a group. Groups of a single
+        word are skipped by default.
+        :return: Generator of lists of words which are anagrams of each other.
+        """
+        words = self._words
+        for indexes in self._iter_indexes_of_groups():
+            if len(indexes) >= min_size:
+                yield [words[idx] for idx in indexes]
+
+    def group_of(self, word):
+        """Get a group of anagrams which given word belongs to.
+
+        :param word: A word from the index.
+        :raise KeyError: If the word is not in the index.
+        :return: A list of anagrams including the word itself.
+        """
+        group = self.lookup(word)
+        if word not in group:
+            raise KeyError(word)
+        return group
+
+    def __contains__(self, word):
+        """Is given word in the index or not.
+
+        :param word: A word to check.
+        :return: True if the word is indexed, False otherwise.
+        """
+        words = self._words
+        indexes = self._find_indexes(self._signature(word))
+        return any(words[idx] == word for idx in indexes)
+
+    def __len__(self):
+        """Get amount of words in the index."""
+        return len(self._words)
+
+
+class AnagramIndex(BaseAnagramIndex):
+    """Index of anagrams built once from a list of words.
+
+    It groups indexes of given words by their signatures, so anagrams of
+    any word are found in O(len(word)) without rebuilding the index.
+    Usage example:
+
+    .. code-block:: python
+
+        >>> index = AnagramIndex(['TLDR', 'TAR', 'art', 'TBD'])
+        >>>
+        >>> assert index.lookup('Rat') == ['TAR', 'art']
+        >>> assert 'art' in index
+        >>>
+        >>> index.add('tra')
+        >>> index.remove('TAR')
+        >>> assert index.lookup('Rat') == ['art', 'tra']
+
+    Words can be added and removed without rebuilding the index. Added words
+    are appended after the indexed list which itself is not changed. Removed
+    words are marked with tombstones until 'compact' is executed, so indexes
+    of words never change.
+    """
+
+    __slots__ = ('_storage', '_removed', '_size')
+
+    def __init__(self, words, processes=1, chunk_size=None,
+                 signature=sorted_letters):
+        """Initialize an index.
+
+        :param words: A list of words to be indexed. The list is not copied,
+        so it must not be changed while the index is used.
+        :param processes: Amount of processes that build the index. It is
+        built in the current process by default. If None, amount of CPUs
+        is used.
+        :param chunk_size: Amount of words processed by a process at once
+        if the index is built in parallel.
+        :param signature: A signature function, see 'find_anagrams.signatures'.
+        """
+        super(AnagramIndex, self).__init__(words, signature)
+
+        # indexes of removed words
+        self._removed = set()
+        self._size = len(words)
+        if processes == 1:
+            self._storage = build_storage(words, signature=signature)
+        else:
+            self._storage = build_storage_in_parallel(
+                words, processes, chunk_size, signature
+            )
+
+    @classmethod
+    def from_iterable(cls, words, signature=sorted_letters):
+        """Build an index from an iterable of words.
+
+        Words are consumed one by one and are kept in a compact 'WordStore'
+        owned by the index, so no list of words is materialized and peak
+        memory is bounded by the size of the index.
+        :param words: An iterable of words, e.g. a generator.
+        :param signature: A signature function.
+        :return: An index.
+        """
+        return cls(WordStore(words), signature=signature)
+
+    @classmethod
+    def from_file(cls, path, encoding='utf-8', signature=sorted_letters):
+        """Build an index from a file with words separated by whitespaces.
+
+        The file is read line by line, see 'from_iterable'.
+        :param path: A path to a file.
+        :param encoding: Encoding of the file.
+        :param signature: A signature function.
+        :return: An index.
+        """
+        return cls.from_iterable(
+            iter_words_from_file(path, encoding), signature
+        )
+
+    def _find_indexes(self, signature):
+        """Find indexes of words with given signature.
+
+        :param signature: Signature of words.
+        :return: A sequence of indexes of words in the indexed list.
+        """
+        indexes = self._storage.get(signature, ())
+        removed = self._removed
+        if removed and indexes:
+            return [idx for idx in indexes if idx not in removed]
+        return indexes
+
+    def _iter_indexes_of_groups(self):
+        """Iterate over groups of indexes of words with the same signature.
+
+        :return: An iterator over sequences of indexes of words.
+        """
+        removed = self._removed
+        for indexes in self._storage.values():
+            if removed:
+                indexes = [idx for idx in indexes if idx not in removed]
+            yield indexes
+
+    def add(self, word):
+        """Add a word to the index.
+
+        Nothing happens if the word is already in the index.
+        :param word: A word to be added.
+        """
+        signature = self._signature(word)
+        if word in self._lookup_signature(signature):
+            return
+
+        words = self._words
+        if not isinstance(words, (ExtendedWords, WordStore)):
+            # a list of words given by a caller must not be changed
+            words = self._words = ExtendedWords(words)
+
+        indexes = self._storage.get(signature)
+        if indexes is None:
+            indexes = self._storage[signature] = array('L')
+        indexes.append(len(words))
+        words.append(word)
+        self._size += 1
+        self._version += 1
+
+    def update(self, words):
+        """Add given words to the index.
+
+        :param words: An iterable of words to be added.
+        """
+        for word in words:
+            self.add(word)
+
+    def remove(self, word):
+        """Remove all occurrences of a word from the index.
+
+        :param word: A word to be removed.
+        :raise KeyError: If the word is not in the index.
+        """
+        words = self._words
+        found = [
+            idx for idx in self._find_indexes(self._signature(word))
+            if words[idx] == word
+        ]
+        if not found:
+            raise KeyError(word)
+        self._removed.update(found)
+        self._size -= len(found)
+        self._version += 1
+
+    def compact(self):
+        """Drop tombstones of removed words from the index.
+
+        Indexes of remaining words don't change.
+        """
+        removed = self._removed
+        if not removed:
+            return
+
+        words = self._words
+        storage = self._storage
+        signatures = set(self._signature(words[idx]) for idx in removed)
+        for signature in signatures:
+            indexes = array(
+                'L', (idx for idx in storage[signature] if idx not in removed)
+            )
+            if indexes:
+                storage[signature] = indexes
+            else:
+                del storage[signature]
+        removed.clear()
+        self._version += 1
+
+    def __len__(self):
+        """Get amount of words in the index."""
+        return self._size
@@ -0,0 +1,166 @@
+"""Tests of anagram index."""
+import os
+import shutil
+import tempfile
+import unittest
+
+from find_anagrams import AnagramIndex
+from find_anagrams.index import build_storage, build_storage_in_parallel
+
+
+class TestAnagramIndex(unittest.TestCase):
+    """Tests of anagram index."""
+
+    def setUp(self):
+        """Create an index."""
+        self.index = AnagramIndex(['TLDR', 'TAR', 'art', 'TBD', 'rat'])
+
+    def test_lookup(self):
+        """Test finding of anagrams in the index."""
+        self.assertListEqual(self.index.lookup('Rat'), ['TAR', 'art', 'rat'])
+        self.assertListEqual(self.index.lookup('no_anagrams'), [])
+
+    def test_lookup_many(self):
+        """Test finding of anagrams of many words."""
+        self.assertListEqual(self.index.lookup_many(['Rat', 'dog', 'tar']), [
+            ['TAR', 'art', 'rat'], [], ['TAR', 'art', 'rat'],
+        ])
+
+    def test_iter_groups(self):
+        """Test iteration over groups of anagrams."""
+        self.index.remove('art')
+
+        # order of groups is not defined
+        self.assertListEqual(list(self.index.iter_groups()), [['TAR', 'rat']])
+        self.assertListEqual(sorted(self.index.iter_groups(min_size=1)), [
+            ['TAR', 'rat'], ['TBD'], ['TLDR'],
+        ])
+
+        self.index.remove('TBD')
+        self.index.compact()
+
+        self.assertListEqual(sorted(self.index.iter_groups(min_size=1)), [
+            ['TAR', 'rat'], ['TLDR'],
+        ])
+
+    def test_group_of(self):
+        """Test getting a group of anagrams of indexed word."""
+        self.assertListEqual(self.index.group_of('art'), ['TAR', 'art', 'rat'])
+
+        with self.assertRaises(KeyError):
+            self.index.group_of('tra')
+
+    def test_contains(self):
+        """Test checking if a word is in the index."""
+        self.assertIn('art', self.index)
+        self.assertNotIn('tra', self.index)
+        self.assertNotIn('dog', self.index)
+
+    def test_len(self):
+        """Test amount of words in the index."""
+        self.assertEqual(len(self.index), 5)
+
+    def test_add(self):
+        """Test adding words to the index."""
+        self.index.add('tra')
+        self.index.add('tra')
+        self.index.update(['dog', 'God'])
+
+        self.assertListEqual(self.index.lookup('rat'),
+                             ['TAR', 'art', 'rat', 'tra'])
+        self.assertListEqual(self.index.lookup('odg'), ['dog', 'God'])
+        self.assertIn('tra', self.index)
+        self.assertEqual(len(self.index), 8)
+
+    def test_add_does_not_change_list(self):
+        """Test that the indexed list is not changed by adding words."""
+        words = ['art']
+        index = AnagramIndex(words)
+
+        index.add('rat')
+
+        self.assertListEqual(words, ['art'])
+        self.assertListEqual(index.lookup('tar'), ['art', 'rat'])
+
+    def test_remove(self):
+        """Test removing words from the index."""
+        self.index.remove('TAR')
+
+        self.assertListEqual(self.index.lookup('rat'), ['art', 'rat'])
+        self.assertNotIn('TAR', self.index)
+        self.assertEqual(len(self.index), 4)
+
+        with self.assertRaises(KeyError):
+            self.index.remove('TAR')
+
+        self.index.add('TAR')
+
+        self.assertListEqual(self.index.lookup('rat'), ['art', 'rat', 'TAR'])
+
+    def test_compact(self):
+        """Test dropping tombstones of removed words."""
+        self.index.remove('TAR')
+        self.index.remove('TBD')
+
+        self.index.compact()
+
+        self.assertListEqual(self.index.lookup('rat'), ['art', 'rat'])
+        self.assertListEqual(self.index.lookup('tbd'), [])
+        self.assertListEqual(self.index.lookup('tldr'), ['TLDR'])
+        self.assertEqual(len(self.index), 3)
+
+    def test_derived_index(self):
+        """Test that a derived index is rebuilt after every change."""
+        def build(index):
+            return list(index.iter_groups(min_size=1))
+
+        derived = self.index.get_derived('key', build)
+        self.assertIs(self.index.get_derived('key', build), derived)
+
+        for change in (lambda: self.index.add('tra'),
+                       lambda: self.index.remove('tra'),
+                       self.index.compact):
+            version = self.index.version
+            change()
+            self.assertGreater(self.index.version, version)
+            self.assertIsNot(self.index.get_derived('key', build), derived)
+            derived = self.index.get_derived('key', build)
+
+    def test_parallel_build(self):
+        """Test that index built in parallel is the same as sequential one."""
+        words = ['TLDR', 'TAR', 'art', 'TBD', 'rat', 'dog', 'god', 'tra']
+
+        index = AnagramIndex(words, processes=2, chunk_size=3)
+
+        self.assertEqual(build_storage_in_parallel(words, 2, 3),
+                         build_storage(words))
+        for word in words:
+            self.assertListEqual(index.lookup(word),
+                                 AnagramIndex(words).lookup(word))
+
+    def test_from_iterable(self):
+        """Test building an index from a generator of words."""
+        index = AnagramIndex.from_iterable(
+            word for word in ('TAR', 'TBD', 'art')
+        )
+
+        self.assertListEqual(index.lookup('rat'), ['TAR', 'art'])
+        self.assertEqual(len(index), 3)
+
+        index.add('rat')
+        index.remove('TAR')
+
+        self.assertListEqual(index.lookup('rat'), ['art', 'rat'])
+
+    def test_from_file(self):
+        """Test building an index from a file."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, 'dictionary.txt')
+        with open(path, 'w') as dict_file:
+            dict_file.write('TLDR\nTAR\nart\nTBD\n')
+
+        index = AnagramIndex.from_file(path)
+
+        self.assertListEqual(index.lookup('rat'), ['TAR', 'art'])
+        self.assertEqual(len(index), 4)
@@ -0,0 +1,291 @@
+"""Memory-mapped on-disk index of anagrams.
+
+An index file is built once from a dictionary by 'write_index_file' and
+then is opened by any number of processes with 'MmapAnagramIndex'. The file
+is mapped into memory read-only and is queried in place, so opening takes
+constant time and its pages are shared by all processes on a host.
+
+The file has the following layout, all integers are unsigned little-endian:
+
+* magic bytes 'ANAGRAM1';
+* header: amount of groups, amount of words, size of signatures and size of
+  words in bytes, 8 bytes each;
+* offsets of signatures, (groups + 1) integers of 4 bytes;
+* offsets of groups in the array of indexes, (groups + 1) integers;
+* indexes of words grouped by signatures, (words) integers;
+* offsets of words, (words + 1) integers;
+* sorted signatures encoded with UTF-8;
+* words encoded with UTF-8.
+
+The first four sections are exactly the arrays of 'CompactAnagramIndex'.
+"""
+import mmap
+import struct
+import sys
+from array import array
+
+from find_anagrams.compact import CompactAnagramIndex, build_compact_arrays
+from find_anagrams.index import BaseAnagramIndex
+
+MAGIC = b'ANAGRAM1'
+
+_header = struct.Struct('<4Q')
+_item = struct.Struct('<I')
+_max_item = 2 ** 32 - 1
+# memory views of mapped pages can be used as arrays directly
+# if native integers match the file format
+_native_views = (
+    hasattr(memoryview, 'cast') and sys.byteorder == 'little' and
+    array('I').itemsize == _item.size
+)
+
+
+class MappedArray(object):
+    """Read-only array of unsigned 4-byte integers stored in a buffer."""
+
+    __slots__ = ('_buffer', '_offset', '_length')
+
+    itemsize = _item.size
+
+    def __init__(self, buffer, offset, length):
+        """Initialize an array.
+
+        :param buffer: A buffer, e.g. 'mmap' object, with the array.
+        :param offset: Offset of the first item in the buffer.
+        :param length: Amount of items.
+        """
+        super(MappedArray, self).__init__()
+
+        self._buffer = buffer
+        self._offset = offset
+        self._length = length
+
+    def __getitem__(self, idx):
+        """Get an item or a tuple of items if a slice is given.
+
+        :param idx: A non-negative index or a slice without step.
+        :return: An integer or a tuple of integers.
+        """
+        if isinstance(idx, slice):
+            start, stop, _ = idx.indices(self._length)
+            amount = max(stop - start, 0)
+            return struct.unpack_from(
+                '<{}I'.format(amount), self._buffer,
+                self._offset + start * _item.size
+            )
+        if not 0 <= idx < self._length:
+            raise IndexError(idx)
+        return _item.unpack_from(
+            self._buffer, self._offset + idx * _item.size
+        )[0]
+
+    def __len__(self):
+        """Get amount of items in the array."""
+        return self._length
+
+
+def map_array(buffer, offset, length):
+    """Get an array of unsigned 4-byte integers stored in a buffer.
+
+    A memory view is returned where possible because it is much faster than
+    'MappedArray'. It must be released before the buffer is closed.
+    :param buffer: A buffer, e.g. 'mmap' object, with the array.
+    :param offset: Offset of the first item in the buffer.
+    :param length: Amount of items.
+    :return: A memory view or 'MappedArray'.
+    """
+    if not _native_views:
+        return MappedArray(buffer, offset, length)
+
+    view = memoryview(buffer)
+    try:
+        return view[offset:offset + length * _item.size].cast('I')
+    finally:
+        view.release()
+
+
+class MappedWords(object):
+    """Read-only sequence of words stored in a buffer."""
+
+    __slots__ = ('_buffer', '_offsets', '_offset')
+
+    def __init__(self, buffer, offsets, offset):
+        """Initialize a sequence.
+
+        :param buffer: A buffer, e.g. 'mmap' object, with the words.
+        :param offsets: An array of offsets of words returned by
+        'map_array'.
+        :param offset: Offset of the first word in the buffer.
+        """
+        super(MappedWords, self).__init__()
+
+        self._buffer = buffer
+        self._offsets = offsets
+        self._offset = offset
+
+    @property
+    def offsets(self):
+        """Get an array of offsets of words."""
+        return self._offsets
+
+    def __getitem__(self, idx):
+        """Get a word by given index.
+
+        :param idx: Index of a word.
+        :return: The word.
+        """
+        if idx < 0:
+            idx += len(self)
+        start, stop = self._offsets[idx:idx + 2]
+        return self._buffer[
+            self._offset + start:self._offset + stop
+        ].decode('utf-8')
+
+    def __len__(self):
+        """Get amount of words."""
+        return len(self._offsets) - 1
+
+
+class MappedBytes(object):
+    """Read-only byte string stored in a buffer."""
+
+    __slots__ = ('_buffer', '_offset', '_length')
+
+    def __init__(self, buffer, offset, length):
+        """Initialize a byte string.
+
+        :param buffer: A buffer, e.g. 'mmap' object, with the bytes.
+        :param offset: Offset of the first byte in the buffer.
+        :param length: Amount of bytes.
+        """
+        super(MappedBytes, self).__init__()
+
+        self._buffer = buffer
+        self._offset = offset
+        self._length = length
+
+    def __getitem__(self, idx):
+        """Get bytes by given slice.
+
+        :param idx: A slice without step.
+        :return: A byte string.
+        """
+        start, stop, _ = idx.indices(self._length)
+        return self._buffer[self._offset + start:self._offset + stop]
+
+    def __len__(self):
+        """Get amount of bytes."""
+        return self._length
+
+
+def _write_array(index_file, items):
+    """Write given integers as little-endian 4-byte items.
+
+    :param index_file: A file opened for binary writing.
+    :param items: An iterable of integers.
+    """
+    items = array('I', items)
+    if sys.byteorder == 'big':
+        items.byteswap()
+    items.tofile(index_file)
+
+
+def write_index_file(words, path):
+    """Build an index of given words and write it to a file.
+
+    :param words: A list of words to be indexed.
+    :param path: A path to the index file.
+    :raise ValueError: If the index is too big for the file format.
+    """
+    keys, key_offsets, group_offsets, indexes = build_compact_arrays(words)
+
+    encoded_words = bytearray()
+    word_offsets = array('L', [0])
+    for word in words:
+        encoded_words += word.encode('utf-8')
+        word_offsets.append(len(encoded_words))
+
+    if max(len(keys), len(encoded_words), len(indexes)) > _max_item:
+        raise ValueError('Index is too big to be written into a file')
+
+    with open(path, 'wb') as index_file:
+        index_file.write(MAGIC)
+        index_file.write(_header.pack(
+            len(key_offsets) - 1, len(word_offsets) - 1,
+            len(keys), len(encoded_words),
+        ))
+        for items in (key_offsets, group_offsets, indexes, word_offsets):
+            _write_array(index_file, items)
+        index_file.write(keys)
+        index_file.write(encoded_words)
+
+
+class MmapAnagramIndex(CompactAnagramIndex):
+    """Index of anagrams queried in place in a memory-mapped file.
+
+    Nothing is deserialized while opening a file, the arrays of
+    'CompactAnagramIndex' are read directly from mapped pages.
+    Usage example:
+
+    .. code-block:: python
+
+        >>> write_index_file(['TLDR', 'TAR', 'art', 'TBD'], 'index.bin')
+        >>>
+        >>> with MmapAnagramIndex('index.bin') as index:
+        ...     assert index.lookup('Rat') == ['TAR', 'art']
+
+    """
+
+    __slots__ = ('_mmap',)
+
+    def __init__(self, path):
+        """Open an index file.
+
+        :param path: A path to a file written by 'write_index_file'.
+        :raise ValueError: If the file is not an index file.
+        """
+        with open(path, 'rb') as index_file:
+            buffer = mmap.mmap(
+                index_file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+
+        if buffer[:len(MAGIC)] != MAGIC:
+            buffer.close()
+            raise ValueError('{} is not an anagram index file'.format(path))
+
+        groups, words, keys_size, _ = _header.unpack_from(buffer, len(MAGIC))
+        offset = len(MAGIC) + _header.size
+
+        arrays = []
+        for length in (groups + 1, groups + 1, words, words + 1):
+            arrays.append(map_array(buffer, offset, length))
+            offset += length * _item.size
+        key_offsets, group_offsets, indexes, word_offsets = arrays
+
+        # arrays are not built from words but are read from the file,
+        # so initializer of 'CompactAnagramIndex' is skipped
+        BaseAnagramIndex.__init__(
+            self, MappedWords(buffer, word_offsets, offset + keys_size)
+        )
+
+        self._mmap = buffer
+        self._keys = MappedBytes(buffer, offset, keys_size)
+        self._key_offsets = key_offsets
+        self._group_offsets = group_offsets
+        self._indexes = indexes
+
+    def close(self):
+        """Unmap the file."""
+        for items in (self._key_offsets, self._group_offsets, self._indexes,
+                      self._words.offsets):
+            if isinstance(items, memoryview):
+                items.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        """Enter a context."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Exit a context and unmap the file."""
+        self.close()
@@ -0,0 +1,13 @@
+"""Build an index file from a dictionary.
+
+Usage: python -m find_anagrams.mapped <dictionary file> <index file>
+"""
+import sys
+
+from find_anagrams.mapped import write_index_file
+
+if len(sys.argv) != 3:
+    sys.exit(__doc__.splitlines()[-1])
+
+with open(sys.argv[1]) as dict_file:
+    write_index_file(dict_file.read().split(), sys.argv[2])
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""Tests of memory-mapped anagram index."""
+import io
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+from find_anagrams import (
+    AnagramIndex, MmapAnagramIndex, find_anagrams, write_index_file
+)
+from find_anagrams.mapped import MappedArray
+
+
+class TestMmapAnagramIndex(unittest.TestCase):
+    """Tests of memory-mapped anagram index."""
+
+    def setUp(self):
+        """Write an index file."""
+        self.words = ['TLDR', 'TAR', 'art', 'TBD', 'rat', u'été']
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'index.bin')
+        write_index_file(self.words, self.path)
+        self.index = MmapAnagramIndex(self.path)
+
+    def tearDown(self):
+        """Remove the index file."""
+        self.index.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_lookup(self):
+        """Test finding of anagrams in the index."""
+        self.assertListEqual(self.index.lookup('Rat'), ['TAR', 'art', 'rat'])
+        self.assertListEqual(self.index.lookup(u'téé'), [u'été'])
+        self.assertListEqual(self.index.lookup('no_anagrams'), [])
+
+    def test_same_as_dict_storage(self):
+        """Test that every word has the same anagrams as in dict storage."""
+        index = AnagramIndex(self.words)
+
+        for word in self.words:
+            self.assertListEqual(self.index.lookup(word), index.lookup(word))
+
+    def test_contains_and_len(self):
+        """Test checking if a word is in the index and amount of words."""
+        self.assertIn('art', self.index)
+        self.assertNotIn('tra', self.index)
+        self.assertEqual(len(self.index), len(self.words))
+
+    def test_find_anagrams(self):
+        """Test that 'find_anagrams' accepts the opened index."""
+        self.assertListEqual(find_anagrams('tar', self.index),
+                             ['TAR', 'art', 'rat'])
+
+    def test_not_index_file(self):
+        """Test opening of a file which is not an index."""
+        path = os.path.join(self.tmp_dir, 'dictionary.txt')
+        with io.open(path, 'w', encoding='utf-8') as dict_file:
+            dict_file.write(u'\n'.join(self.words))
+
+        with self.assertRaises(ValueError):
+            MmapAnagramIndex(path)
+
+    def test_empty(self):
+        """Test an index file of empty list of words."""
+        path = os.path.join(self.tmp_dir, 'empty.bin')
+        write_index_file([], path)
+
+        with MmapAnagramIndex(path) as index:
+            self.assertListEqual(index.lookup('rat'), [])
+            self.assertEqual(len(index), 0)
+
+
+class TestMappedArray(unittest.TestCase):
+    """Tests of array of integers stored in a buffer."""
+
+    def test_get_item(self):
+        """Test getting items and slices."""
+        items = MappedArray(b'\xff' + struct.pack('<3I', 1, 2, 3), 1, 3)
+
+        self.assertEqual(len(items), 3)
+        self.assertEqual(items[2], 3)
+        self.assertTupleEqual(items[1:3], (2, 3))
+        self.assertTupleEqual(items[2:1], ())
+
+        with self.assertRaises(IndexError):
+            items[3]
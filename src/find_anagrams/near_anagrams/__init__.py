@@ -0,0 +1,155 @@
+"""Search of near anagrams.
+
+Near anagrams of a word are words which letters differ from letters of the
+word by a few inserted, deleted or substituted letters regardless of their
+order, e.g. 'rat' -> 'tart' (insertion), 'rat' -> 'at' (deletion),
+'rat' -> 'tab' (substitution).
+"""
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+from six.moves import range
+
+from find_anagrams.signatures import sorted_letters
+from find_anagrams.words import WordStore
+
+_hash_mask = 0xFFFFFFFF
+# a typecode of unsigned integers of at least 32 bits, 'Q' is not available
+# on Python 2
+_typecode = 'I' if array('I').itemsize >= 4 else 'L'
+
+
+def get_deletions(letters, max_deletions):
+    """Get all strings obtained by deletion of up to a few letters.
+
+    :param letters: A string.
+    :param max_deletions: Maximal amount of deleted letters.
+    :return: A set of strings including the given one.
+    """
+    result = {letters}
+    level = {letters}
+    for _ in range(max_deletions):
+        level = set(
+            item[:idx] + item[idx + 1:]
+            for item in level for idx in range(len(item))
+        )
+        result.update(level)
+    return result
+
+
+def get_distance(letters, other_letters):
+    """Get amount of edits that turn one multiset of letters into another.
+
+    An edit is insertion, deletion or substitution of a letter.
+    :param letters: A string of letters.
+    :param other_letters: Another string of letters.
+    :return: Amount of edits.
+    """
+    counter, other_counter = Counter(letters), Counter(other_letters)
+    return max(sum((counter - other_counter).values()),
+               sum((other_counter - counter).values()))
+
+
+class NearAnagramIndex(object):
+    """Index of near anagrams.
+
+    It uses a symmetric deletion neighbourhood: two multisets of letters are
+    within 'k' edits only if they have a common multiset obtained by deletion
+    of up to 'k' letters from each of them. Such deletions of sorted letters
+    of every group of anagrams are precomputed. To keep the index compact
+    deletions are stored in two parallel arrays of 32-bit integers sorted by
+    hashes of the deletions: the hashes and numbers of groups.
+    A query enumerates deletions of its own letters, finds groups by binary
+    search and verifies distances, so hash collisions never affect results.
+    Usage example:
+
+    .. code-block:: python
+
+        >>> index = NearAnagramIndex(AnagramIndex(['TAR', 'tart', 'at']))
+        >>>
+        >>> assert index.find('rat') == ['tart', 'at']
+
+    The index is a snapshot of groups of the anagram index, so it must be
+    rebuilt after words are added to or removed from the anagram index.
+    """
+
+    __slots__ = ('_index', '_max_edits', '_groups', '_hashes',
+                 '_group_numbers')
+
+    def __init__(self, index, max_edits=1):
+        """Initialize an index.
+
+        :param index: An anagram index, e.g. 'AnagramIndex'.
+        :param max_edits: Maximal amount of edits supported by the index.
+        """
+        super(NearAnagramIndex, self).__init__()
+
+        self._index = index
+        self._max_edits = max_edits
+        # a word of each group is enough to find the whole group
+        self._groups = WordStore(
+            group[0] for group in index.iter_groups(min_size=1)
+        )
+
+        deletions = []
+        for group, word in enumerate(self._groups):
+            for deletion in get_deletions(sorted_letters(word), max_edits):
+                deletions.append((hash(deletion) & _hash_mask, group))
+        deletions.sort()
+        self._hashes = array(_typecode, (item[0] for item in deletions))
+        self._group_numbers = array(_typecode,
+                                    (item[1] for item in deletions))
+
+    @property
+    def max_edits(self):
+        """Get maximal amount of edits supported by the index."""
+        return self._max_edits
+
+    def _find_candidates(self, deletion):
+        """Find groups which have given deletion in their neighbourhood.
+
+        :param deletion: A string of sorted letters.
+        :return: Generator of numbers of groups.
+        """
+        hashes = self._hashes
+        key = hash(deletion) & _hash_mask
+        idx = bisect_left(hashes, key)
+        while idx < len(hashes) and hashes[idx] == key:
+            yield self._group_numbers[idx]
+            idx += 1
+
+    def find(self, word, max_edits=None):
+        """Find near anagrams of given word.
+
+        Exact anagrams of the word are not included.
+        :param word: A word.
+        :param max_edits: Maximal amount of edits. It equals to the maximum
+        supported by the index by default.
+        :raise ValueError: If more edits are requested than the index
+        supports.
+        :return: A list of words ordered by amount of edits.
+        """
+        if max_edits is None:
+            max_edits = self._max_edits
+        elif max_edits > self._max_edits:
+            raise ValueError(
+                'The index supports up to {} edits'.format(self._max_edits)
+            )
+
+        letters = sorted_letters(word)
+        candidates = set()
+        for deletion in get_deletions(letters, max_edits):
+            candidates.update(self._find_candidates(deletion))
+
+        found = []
+        for group in sorted(candidates):
+            representative = self._groups[group]
+            distance = get_distance(letters, sorted_letters(representative))
+            if 0 < distance <= max_edits:
+                found.append((distance, group, representative))
+
+        result = []
+        for _, _, representative in sorted(found):
+            result.extend(self._index.lookup(representative))
+        return result
@@ -0,0 +1,63 @@
+"""Tests of index of near anagrams."""
+import unittest
+
+from find_anagrams import AnagramIndex, NearAnagramIndex
+from find_anagrams.near_anagrams import get_deletions, get_distance
+
+
+class TestNearAnagramIndex(unittest.TestCase):
+    """Tests of index of near anagrams."""
+
+    def setUp(self):
+        """Create an index."""
+        self.words = ['TAR', 'art', 'tart', 'at', 'tab', 'bat', 'dog', 'a']
+        self.index = NearAnagramIndex(AnagramIndex(self.words))
+
+    def test_find(self):
+        """Test finding of words within one edit."""
+        # insertion, deletion and substitution,
+        # order of groups within the same amount of edits is not defined
+        self.assertListEqual(sorted(self.index.find('rat')),
+                             ['at', 'bat', 'tab', 'tart'])
+        self.assertListEqual(sorted(self.index.find('ta')),
+                             ['TAR', 'a', 'art', 'bat', 'tab'])
+        self.assertListEqual(self.index.find('xyz'), [])
+
+    def test_find_with_more_edits(self):
+        """Test finding of words within a few edits."""
+        index = NearAnagramIndex(AnagramIndex(self.words), max_edits=2)
+
+        self.assertListEqual(index.find('rat', max_edits=1),
+                             self.index.find('rat'))
+        found = index.find('rat')
+        self.assertListEqual(sorted(found[:-1]),
+                             ['at', 'bat', 'tab', 'tart'])
+        self.assertEqual(found[-1], 'a')
+
+        with self.assertRaises(ValueError):
+            self.index.find('rat', max_edits=2)
+
+    def test_same_as_brute_force(self):
+        """Test that results are the same as of checking every word."""
+        for word in ('rat', 'dogs', 'tb', '', 'ttar'):
+            expected = sorted(
+                item for item in self.words
+                if 0 < get_distance(word.lower(), item.lower()) <= 1
+            )
+            self.assertListEqual(sorted(self.index.find(word)), expected)
+
+
+class TestHelpers(unittest.TestCase):
+    """Tests of helper functions."""
+
+    def test_get_deletions(self):
+        """Test getting strings with deleted letters."""
+        self.assertSetEqual(get_deletions('aab', 1), {'aab', 'ab', 'aa'})
+        self.assertSetEqual(get_deletions('ab', 2), {'ab', 'a', 'b', ''})
+
+    def test_get_distance(self):
+        """Test getting distance between multisets of letters."""
+        self.assertEqual(get_distance('art', 'tar'), 0)
+        self.assertEqual(get_distance('art', 'artt'), 1)
+        self.assertEqual(get_distance('art', 'abt'), 1)
+        self.assertEqual(get_distance('art', 'b'), 3)
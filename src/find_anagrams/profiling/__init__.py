@@ -1,6 +1,12 @@
 """A module for performance testing of find anagrams function."""
 import os
 
+from find_anagrams.words import iter_words_from_file
+
+# a file with around 479k words obtained from
+# https://github.com/dwyl/english-words
+DICTIONARY_PATH = os.path.join(os.path.dirname(__file__), 'dictionary.txt')
+
 
 def read_dictionary():
     """Read words from a file 'dictionary.txt' and return a list of words.
@@ -9,7 +15,4 @@ def read_dictionary():
     https://github.com/dwyl/english-words and is used as sample data.
     :return: A list of words read from a file.
     """
-    cur_path = os.path.dirname(__file__)
-    with open(os.path.join(cur_path, 'dictionary.txt')) as dict_file:
-        result = dict_file.read().split()
-    return result
+    return list(iter_words_from_file(DICTIONARY_PATH))
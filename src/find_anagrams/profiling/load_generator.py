@@ -0,0 +1,118 @@
+"""Generate load on a server of anagram lookups.
+
+Words of the dictionary are requested by many concurrent connections, every
+connection pipelines a few requests. Throughput and percentiles of latency
+are printed. A local server of the dictionary is started unless a port of a
+running server is given:
+
+    python find_anagrams/profiling/load_generator.py --connections 100
+    python find_anagrams/profiling/load_generator.py --port 8765
+"""
+import argparse
+import asyncio
+import random
+import subprocess
+import sys
+from timeit import default_timer
+
+from find_anagrams.profiling import DICTIONARY_PATH, read_dictionary
+
+
+async def run_connection(host, port, queries, pipeline, latencies):
+    """Send queries through a connection and measure their latency.
+
+    :param host: A host of a server.
+    :param port: A port of a server.
+    :param queries: A list of words.
+    :param pipeline: Amount of requests sent without waiting for responses.
+    :param latencies: A list to which latencies of requests are appended.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    for start in range(0, len(queries), pipeline):
+        chunk = queries[start:start + pipeline]
+        start_time = default_timer()
+        writer.write(''.join(word + '\n' for word in chunk).encode('utf-8'))
+        for _ in chunk:
+            await reader.readline()
+            latencies.append(default_timer() - start_time)
+    writer.close()
+
+
+async def generate_load(host, port, words, args):
+    """Run all connections and print results.
+
+    :param host: A host of a server.
+    :param port: A port of a server.
+    :param words: A list of words to be requested.
+    :param args: Parsed arguments of the command line.
+    """
+    rnd = random.Random(args.seed)
+    per_connection = args.queries // args.connections
+    latencies = []
+    start_time = default_timer()
+    await asyncio.gather(*[
+        run_connection(
+            host, port,
+            [rnd.choice(words) for _ in range(per_connection)],
+            args.pipeline, latencies,
+        )
+        for _ in range(args.connections)
+    ])
+    duration = default_timer() - start_time
+
+    latencies.sort()
+    print('{} requests by {} connections in {:.2f} s: {:.0f} requests/s'
+          .format(len(latencies), args.connections, duration,
+                  len(latencies) / duration))
+    for percent in (50, 90, 99):
+        latency = latencies[min(len(latencies) * percent // 100,
+                                len(latencies) - 1)]
+        print('p{}: {:.2f} ms'.format(percent, latency * 1e3))
+
+
+def start_server():
+    """Start a local server of the dictionary.
+
+    :return: A tuple of a process, a host and a port.
+    """
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'find_anagrams.server', DICTIONARY_PATH,
+         '--port', '0'],
+        stdout=subprocess.PIPE, universal_newlines=True,
+    )
+    # the server prints its address when it is ready
+    line = process.stdout.readline()
+    if not line:
+        sys.exit('The server has not started')
+    host, port = line.split()[-1].rsplit(':', 1)
+    return process, host, int(port)
+
+
+def main():
+    """Generate load on a server."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int,
+                        help='a port of a running server')
+    parser.add_argument('--connections', type=int, default=50)
+    parser.add_argument('--queries', type=int, default=200000,
+                        help='total amount of requests')
+    parser.add_argument('--pipeline', type=int, default=16)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    process = None
+    host, port = args.host, args.port
+    if port is None:
+        process, host, port = start_server()
+    try:
+        words = read_dictionary()
+        asyncio.run(generate_load(host, port, words, args))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Measure speedup of parallel build of anagram index.
+
+The index is built from the dictionary and from a synthetic corpus with
+different amounts of processes. Size of the synthetic corpus can be passed
+as the first argument, it is 50M words by default.
+"""
+import multiprocessing
+import random
+import string
+import sys
+import time
+
+from six.moves import range
+
+from find_anagrams import AnagramIndex
+from find_anagrams.profiling import read_dictionary
+
+
+def generate_corpus(size, seed=0):
+    """Generate a list of random words.
+
+    :param size: Amount of words.
+    :param seed: Seed of random generator, so a corpus is reproducible.
+    :return: A list of words.
+    """
+    rnd = random.Random(seed)
+    letters = string.ascii_lowercase
+    return [
+        ''.join(rnd.choice(letters) for _ in range(rnd.randint(2, 12)))
+        for _ in range(size)
+    ]
+
+
+def measure_speedup(title, words):
+    """Build index with different amounts of processes and print speedup.
+
+    :param title: A title of given words.
+    :param words: A list of words.
+    """
+    cpu_count = multiprocessing.cpu_count()
+    processes_counts = sorted(set(
+        [1, cpu_count] + [2 ** power for power in range(1, 6)
+                          if 2 ** power < cpu_count]
+    ))
+
+    base_time = None
+    for processes in processes_counts:
+        start_time = time.time()
+        AnagramIndex(words, processes=processes)
+        build_time = time.time() - start_time
+
+        base_time = base_time or build_time
+        print('{title} ({words} words), {processes} processes: {time:.2f} s, '
+              'speedup {speedup:.2f}'.format(
+                  title=title,
+                  words=len(words),
+                  processes=processes,
+                  time=build_time,
+                  speedup=base_time / build_time,
+              ))
+
+
+if __name__ == '__main__':
+    corpus_size = int(sys.argv[1]) if len(sys.argv) > 1 else 50000000
+
+    measure_speedup('dictionary', read_dictionary())
+    measure_speedup('synthetic corpus', generate_corpus(corpus_size))
@@ -1,18 +1,258 @@
-"""Performance tests a function that finds anagrams."""
-from find_anagrams import find_anagrams
-from find_anagrams.profiling import read_dictionary
-from utils import timed
+"""Benchmark suite of anagram indexes.
 
-dictionary = read_dictionary()
+For every variant of anagram storage it measures build time, memory per word
+traced by 'tracemalloc' and percentiles of query latency over several query
+mixes. Results are printed and written as JSON, so they can be compared
+across commits:
 
-# a word to find anagrams for
-word = 'rat'
+    python find_anagrams/profiling/performance_test.py -o new.json
+    python find_anagrams/profiling/performance_test.py -o new.json \
+        --compare old.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from timeit import default_timer
 
+from find_anagrams import (
+    AnagramIndex, CompactAnagramIndex, FilteredAnagramIndex, MmapAnagramIndex,
+    letter_counts, prepare_storage_with_words, prime_product,
+    write_index_file
+)
+from find_anagrams.profiling import DICTIONARY_PATH, read_dictionary
+from find_anagrams.signatures import sorted_letters
 
-@timed('{} len={}'.format(word, len(word)))
-def find_anagrams_in_dictionary():
-    """Find anagrams."""
-    return find_anagrams(word, dictionary)
 
+class NestedStorage(object):
+    """Adapter of the storage of 'prepare_storage_with_words'."""
 
-print(find_anagrams_in_dictionary())
+    def __init__(self, words):
+        """Build the storage.
+
+        :param words: A list of words.
+        """
+        self._words = words
+        self._storage = prepare_storage_with_words(words)
+
+    def lookup(self, word):
+        """Find anagrams of given word.
+
+        :param word: A word.
+        :return: A list of anagrams.
+        """
+        words = self._words
+        groups = self._storage.get(len(word), {})
+        indexes = groups.get(sorted_letters(word), ())
+        return [words[idx] for idx in indexes]
+
+
+def get_variants(tmp_dir):
+    """Get factories of all variants of anagram storage.
+
+    :param tmp_dir: A directory for index files.
+    :return: A list of tuples of (name, factory).
+    """
+    index_path = os.path.join(tmp_dir, 'index.bin')
+
+    def build_mmap_index(words):
+        """Write an index file and open it."""
+        write_index_file(words, index_path)
+        return MmapAnagramIndex(index_path)
+
+    return [
+        ('nested_defaultdict', NestedStorage),
+        ('dict', AnagramIndex),
+        ('dict_letter_counts',
+         lambda words: AnagramIndex(words, signature=letter_counts)),
+        ('dict_prime_product',
+         lambda words: AnagramIndex(words, signature=prime_product)),
+        # words are read from the file into a 'WordStore' of the index,
+        # so unlike other variants its memory includes the words
+        ('word_store', lambda words: AnagramIndex.from_file(DICTIONARY_PATH)),
+        ('compact', CompactAnagramIndex),
+        ('mmap', build_mmap_index),
+        ('bloom_dict',
+         lambda words: FilteredAnagramIndex(AnagramIndex(words))),
+        ('bloom_mmap',
+         lambda words: FilteredAnagramIndex(build_mmap_index(words))),
+    ]
+
+
+def get_query_mixes(words, amount, seed):
+    """Generate lists of queries.
+
+    :param words: A list of words.
+    :param amount: Amount of queries in a mix.
+    :param seed: Seed of random generator, so mixes are reproducible.
+    :return: A dictionary of mixes by names.
+    """
+    rnd = random.Random(seed)
+    hits = [rnd.choice(words) for _ in range(amount)]
+    # shuffled letters of a word with one letter replaced rarely have
+    # anagrams in a dictionary
+    misses = []
+    for _ in range(amount):
+        letters = list(rnd.choice(words))
+        letters[rnd.randrange(len(letters))] = rnd.choice('qxzj')
+        rnd.shuffle(letters)
+        misses.append(''.join(letters))
+    mixed = [
+        rnd.choice(hits) if rnd.random() < 0.2 else rnd.choice(misses)
+        for _ in range(amount)
+    ]
+    return {'hits': hits, 'misses': misses, 'mixed_20_80': mixed}
+
+
+def get_percentile(sorted_values, percent):
+    """Get a percentile of sorted values by the nearest-rank method.
+
+    :param sorted_values: A sorted list of numbers.
+    :param percent: A percent from 0 to 100.
+    :return: A value.
+    """
+    rank = max(int(round(percent / 100.0 * len(sorted_values))), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def measure_variant(factory, words, query_mixes):
+    """Measure build time, memory and query latency of a variant.
+
+    :param factory: A callable that builds an index from words.
+    :param words: A list of words.
+    :param query_mixes: A dictionary of lists of queries by names.
+    :return: A dictionary of results.
+    """
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    start_time = default_timer()
+    index = factory(words)
+    build_time = default_timer() - start_time
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        'build_seconds': build_time,
+        'bytes_per_word': float(after - before) / len(words),
+        'peak_bytes_per_word': float(peak - before) / len(words),
+        'queries': {},
+    }
+    lookup = index.lookup
+    for name, queries in sorted(query_mixes.items()):
+        latencies = []
+        for word in queries:
+            start_time = default_timer()
+            lookup(word)
+            latencies.append(default_timer() - start_time)
+        latencies.sort()
+        result['queries'][name] = {
+            'p50_us': get_percentile(latencies, 50) * 1e6,
+            'p99_us': get_percentile(latencies, 99) * 1e6,
+            'mean_us': sum(latencies) / len(latencies) * 1e6,
+        }
+
+    if hasattr(index, 'close'):
+        index.close()
+    return result
+
+
+def get_metadata():
+    """Get information about an environment of a run."""
+    try:
+        commit = subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], stderr=subprocess.STDOUT,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).decode('ascii').strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def print_results(results, baseline=None):
+    """Print results and their ratios to a baseline.
+
+    :param results: A dictionary of results of all variants.
+    :param baseline: A dictionary of results of a previous run.
+    """
+    def ratio(path):
+        value, base = results['variants'], baseline and baseline['variants']
+        for key in path:
+            value = value[key]
+            base = base.get(key) if isinstance(base, dict) else None
+        if not base:
+            return ''
+        return ' ({:+.0%})'.format(float(value) / base - 1)
+
+    for name, variant in sorted(results['variants'].items()):
+        print('{name}: build {build:.3f} s{build_ratio}, '
+              '{memory:.1f} bytes per word{memory_ratio}'.format(
+                  name=name,
+                  build=variant['build_seconds'],
+                  build_ratio=ratio((name, 'build_seconds')),
+                  memory=variant['bytes_per_word'],
+                  memory_ratio=ratio((name, 'bytes_per_word')),
+              ))
+        for mix, latency in sorted(variant['queries'].items()):
+            print('    {mix}: p50 {p50:.2f} us{p50_ratio}, '
+                  'p99 {p99:.2f} us{p99_ratio}'.format(
+                      mix=mix,
+                      p50=latency['p50_us'],
+                      p50_ratio=ratio((name, 'queries', mix, 'p50_us')),
+                      p99=latency['p99_us'],
+                      p99_ratio=ratio((name, 'queries', mix, 'p99_us')),
+                  ))
+
+
+def main():
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-o', '--output', help='a path to a JSON file')
+    parser.add_argument('--compare', help='a path to a JSON file of '
+                                          'a previous run')
+    parser.add_argument('--queries', type=int, default=10000,
+                        help='amount of queries in a mix')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--variant', action='append',
+                        help='a variant to measure, all by default')
+    args = parser.parse_args()
+
+    words = read_dictionary()
+    query_mixes = get_query_mixes(words, args.queries, args.seed)
+    results = {'metadata': get_metadata(), 'words': len(words),
+               'variants': {}}
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        for name, factory in get_variants(tmp_dir):
+            if args.variant and name not in args.variant:
+                continue
+            results['variants'][name] = measure_variant(
+                factory, words, query_mixes
+            )
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""Compare speed of signature functions and anagram index build."""
+import time
+
+from find_anagrams import AnagramIndex
+from find_anagrams.profiling import read_dictionary
+from find_anagrams.signatures import SIGNATURES, numpy, sign_many
+
+dictionary = read_dictionary()
+# words to find anagrams for, every 100th word of the dictionary
+queries = dictionary[::100]
+
+for name, signature in sorted(SIGNATURES.items()):
+    for use_numpy in (False, True):
+        if use_numpy and (numpy is None or name == 'sorted_letters'):
+            continue
+
+        start_time = time.time()
+        for _ in sign_many(dictionary, signature, use_numpy):
+            pass
+        sign_time = time.time() - start_time
+
+        print('{name}{numpy}: signing {sign:.3f} s'.format(
+            name=name, numpy=' (NumPy)' if use_numpy else '', sign=sign_time,
+        ))
+
+    start_time = time.time()
+    index = AnagramIndex(dictionary, signature=signature)
+    build_time = time.time() - start_time
+
+    start_time = time.time()
+    for word in queries:
+        index.lookup(word)
+    lookup_time = time.time() - start_time
+
+    print('{name}: build {build:.3f} s, {lookup:.2f} us per lookup'.format(
+        name=name,
+        build=build_time,
+        lookup=lookup_time * 1000000 / len(queries),
+    ))
@@ -0,0 +1,68 @@
+"""Compare memory and lookup speed of anagram storages."""
+import os
+import tempfile
+import timeit
+
+from memory_profiler import memory_usage
+
+from find_anagrams import (
+    AnagramIndex, CompactAnagramIndex, MmapAnagramIndex,
+    prepare_storage_with_words, write_index_file
+)
+from find_anagrams.profiling import DICTIONARY_PATH, read_dictionary
+
+dictionary = read_dictionary()
+# words to find anagrams for, every 100th word of the dictionary
+queries = dictionary[::100]
+# an index file is built in advance, only its opening is measured
+index_path = os.path.join(tempfile.mkdtemp(), 'index.bin')
+write_index_file(dictionary, index_path)
+
+
+def measure_memory(factory):
+    """Measure memory retained by a storage created by given factory.
+
+    :param factory: A callable that creates a storage from the dictionary.
+    :return: A tuple of (storage, amount of retained MiB).
+    """
+    before = memory_usage(-1)[0]
+    storage = factory(dictionary)
+    after = memory_usage(-1)[0]
+    return storage, after - before
+
+
+for title, factory in (
+    ('nested defaultdict of arrays', prepare_storage_with_words),
+    ('dict of arrays', AnagramIndex),
+    ('compact CSR arrays', CompactAnagramIndex),
+    ('memory-mapped file', lambda words: MmapAnagramIndex(index_path)),
+    # memory of this one includes words which are stored by the index
+    ('dict of arrays streamed from file with words',
+     lambda words: AnagramIndex.from_file(DICTIONARY_PATH)),
+):
+    storage, memory = measure_memory(factory)
+    if isinstance(storage, dict):
+        def lookup(word):
+            """Find anagrams in nested storage."""
+            indexes = storage[len(word)][''.join(sorted(word.lower()))]
+            return [dictionary[idx] for idx in indexes]
+    else:
+        lookup = storage.lookup
+
+    lookup_time = timeit.timeit(
+        lambda: [lookup(word) for word in queries], number=1
+    )
+    print('{title}: {memory:.1f} MiB, {per_word:.1f} bytes per word, '
+          '{per_lookup:.2f} us per lookup'.format(
+              title=title,
+              memory=memory,
+              per_word=memory * 1024 * 1024 / len(dictionary),
+              per_lookup=lookup_time * 1000000 / len(queries),
+          ))
+    if type(storage) is CompactAnagramIndex:
+        print('compact CSR arrays: {} bytes of arrays, {:.1f} bytes '
+              'per word'.format(storage.nbytes,
+                                float(storage.nbytes) / len(dictionary)))
+    del storage
+
+os.remove(index_path)
@@ -0,0 +1,255 @@
+"""Asynchronous server of anagram lookups.
+
+An index is loaded once and served over TCP, so callers don't have to embed
+the dictionary. The protocol is line based: a client sends a word per line
+encoded in UTF-8 and receives a line with its anagrams separated by spaces,
+an empty line if there are no anagrams, or a line 'ERROR <name of an
+exception>' if the lookup has failed. Requests can be pipelined, responses
+are sent in order of requests.
+
+Concurrent requests of all connections are coalesced into batches, so an
+index is probed by 'lookup_many' once per iteration of an event loop instead
+of once per request.
+
+The module requires Python 3.7+.
+"""
+import asyncio
+
+from find_anagrams import get_anagram_index
+
+
+class LookupBatcher(object):
+    """Coalescer of concurrent lookups into batches.
+
+    Lookups requested during an iteration of an event loop are collected
+    and performed by a single call of 'lookup_many' at the end of the
+    iteration, or as soon as the batch is full.
+    Usage example:
+
+    .. code-block:: python
+
+        >>> batcher = LookupBatcher(AnagramIndex(['TAR', 'art']))
+        >>> results = await asyncio.gather(
+        ...     batcher.lookup('rat'), batcher.lookup('tar'))
+        >>>
+        >>> assert results == [['TAR', 'art'], ['TAR', 'art']]
+        >>> assert batcher.batches == 1
+
+    """
+
+    __slots__ = ('_index', '_max_batch_size', '_pending', '_scheduled',
+                 '_batches', '_requests')
+
+    def __init__(self, index, max_batch_size=1024):
+        """Initialize a batcher.
+
+        :param index: An anagram index, e.g. 'AnagramIndex'.
+        :param max_batch_size: Maximal amount of words in a batch.
+        """
+        super(LookupBatcher, self).__init__()
+
+        self._index = index
+        self._max_batch_size = max_batch_size
+        self._pending = []
+        self._scheduled = False
+        self._batches = 0
+        self._requests = 0
+
+    @property
+    def batches(self):
+        """Get amount of performed batches."""
+        return self._batches
+
+    @property
+    def requests(self):
+        """Get amount of requested lookups."""
+        return self._requests
+
+    def submit(self, word):
+        """Request anagrams of given word.
+
+        :param word: A word.
+        :return: A future of a list of anagrams.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((word, future))
+        self._requests += 1
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif not self._scheduled:
+            self._scheduled = True
+            loop.call_soon(self._flush)
+        return future
+
+    async def lookup(self, word):
+        """Find anagrams of given word.
+
+        :param word: A word.
+        :return: A list of anagrams.
+        """
+        return await self.submit(word)
+
+    def _flush(self):
+        """Perform lookups of all pending requests."""
+        self._scheduled = False
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        self._batches += 1
+        try:
+            results = self._index.lookup_many([word for word, _ in pending])
+        except Exception as exc:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), anagrams in zip(pending, results):
+            if not future.done():
+                future.set_result(anagrams)
+
+
+class AnagramServer(object):
+    """TCP server of anagram lookups.
+
+    Usage example:
+
+    .. code-block:: python
+
+        >>> server = AnagramServer(AnagramIndex.from_file('dictionary.txt'))
+        >>> await server.start('127.0.0.1', 8765)
+        >>> await server.serve_forever()
+
+    """
+
+    __slots__ = ('_batcher', '_max_pipeline', '_server', '_connections')
+
+    def __init__(self, words, max_batch_size=1024, max_pipeline=1024):
+        """Initialize a server.
+
+        :param words: An anagram index or a list of words to be indexed.
+        :param max_batch_size: Maximal amount of words in a batch of lookups.
+        :param max_pipeline: Maximal amount of unanswered requests of a
+        connection. Reading of requests is paused when it is reached.
+        """
+        super(AnagramServer, self).__init__()
+
+        self._batcher = LookupBatcher(
+            get_anagram_index(words), max_batch_size
+        )
+        self._max_pipeline = max_pipeline
+        self._server = None
+        # handler tasks of open connections by their writers
+        self._connections = {}
+
+    @property
+    def batcher(self):
+        """Get the batcher of lookups."""
+        return self._batcher
+
+    @property
+    def address(self):
+        """Get a tuple of a host and a port the server listens on."""
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self, host='127.0.0.1', port=0, reuse_port=False):
+        """Start listening for connections.
+
+        :param host: A host to listen on.
+        :param port: A port to listen on, a free port by default.
+        :param reuse_port: Allow several processes to listen on the same
+        port, so worker processes can share the load.
+        """
+        self._server = await asyncio.start_server(
+            self._handle_connection, host, port,
+            reuse_port=reuse_port or None,
+        )
+
+    async def serve_forever(self):
+        """Serve connections until the server is closed."""
+        await self._server.wait_closed()
+
+    async def close(self):
+        """Stop listening for connections and close open ones."""
+        self._server.close()
+        handlers = list(self._connections.values())
+        for writer in list(self._connections):
+            writer.close()
+        await self._server.wait_closed()
+        # let handlers of closed connections finish
+        await asyncio.gather(*handlers, return_exceptions=True)
+
+    async def _handle_connection(self, reader, writer):
+        """Read requests of a connection and send responses.
+
+        :param reader: A stream reader of the connection.
+        :param writer: A stream writer of the connection.
+        """
+        self._connections[writer] = asyncio.current_task()
+        responses = asyncio.Queue(self._max_pipeline)
+        receiver = asyncio.ensure_future(
+            self._receive_requests(reader, responses)
+        )
+        sender = asyncio.ensure_future(self._send_responses(responses, writer))
+        try:
+            await asyncio.wait((receiver, sender),
+                               return_when=asyncio.FIRST_COMPLETED)
+            if sender.done():
+                # responses can't be sent anymore, so the receiver which can
+                # wait for a place in the full queue is stopped
+                receiver.cancel()
+            await asyncio.gather(receiver, sender, return_exceptions=True)
+        finally:
+            receiver.cancel()
+            sender.cancel()
+            self._connections.pop(writer, None)
+
+    async def _receive_requests(self, reader, responses):
+        """Read requests and put futures of their responses in a queue.
+
+        :param reader: A stream reader of a connection.
+        :param responses: A queue of futures of responses, None ends it.
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                word = line.decode('utf-8', 'replace').strip()
+                await responses.put(self._batcher.submit(word))
+        except (ConnectionError, ValueError):
+            # the connection is broken or a line is too long
+            pass
+        await responses.put(None)
+
+    @staticmethod
+    async def _send_responses(responses, writer):
+        """Send responses in order of requests.
+
+        :param responses: A queue of futures of responses, None ends it.
+        :param writer: A stream writer of a connection.
+        """
+        try:
+            while True:
+                future = await responses.get()
+                if future is None:
+                    break
+                try:
+                    response = ' '.join(await future)
+                except asyncio.CancelledError:
+                    # it is an 'Exception' on Python 3.7
+                    raise
+                except Exception as exc:
+                    response = 'ERROR {}'.format(type(exc).__name__)
+                if writer.is_closing():
+                    # the connection is closed, remaining responses are
+                    # dropped until the receiver stops
+                    continue
+                writer.write(response.encode('utf-8') + b'\n')
+                if responses.empty():
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
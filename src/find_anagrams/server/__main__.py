@@ -0,0 +1,50 @@
+"""Serve anagram lookups of a dictionary or an index file.
+
+Usage: python -m find_anagrams.server <dictionary or index file> [options]
+"""
+import argparse
+import asyncio
+
+from find_anagrams import AnagramIndex, MmapAnagramIndex
+from find_anagrams.mapped import MAGIC
+from find_anagrams.server import AnagramServer
+
+
+def load_index(path):
+    """Open an index file or build an index of a dictionary.
+
+    :param path: A path to an index file written by 'write_index_file' or
+    to a dictionary with words separated by whitespaces.
+    :return: An anagram index.
+    """
+    with open(path, 'rb') as words_file:
+        is_index_file = words_file.read(len(MAGIC)) == MAGIC
+    if is_index_file:
+        return MmapAnagramIndex(path)
+    return AnagramIndex.from_file(path)
+
+
+async def serve(args):
+    """Start a server and serve until it is stopped.
+
+    :param args: Parsed arguments of the command line.
+    """
+    server = AnagramServer(load_index(args.path), args.max_batch_size)
+    await server.start(args.host, args.port, args.reuse_port)
+    # the line is awaited by the load generator
+    print('Serving on {}:{}'.format(*server.address), flush=True)
+    await server.serve_forever()
+
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument('path', help='a dictionary or an index file')
+parser.add_argument('--host', default='127.0.0.1')
+parser.add_argument('--port', type=int, default=8765)
+parser.add_argument('--max-batch-size', type=int, default=1024)
+parser.add_argument('--reuse-port', action='store_true',
+                    help='let several worker processes share the port')
+
+try:
+    asyncio.run(serve(parser.parse_args()))
+except KeyboardInterrupt:
+    pass
@@ -0,0 +1,204 @@
+"""Tests of the server of anagram lookups.
+
+They are loaded by 'find_anagrams.tests' on Python 3.7+ only, since the
+package requires it.
+"""
+import asyncio
+import unittest
+from functools import wraps
+
+from mock import mock
+
+from find_anagrams import AnagramIndex
+from find_anagrams.server import AnagramServer, LookupBatcher
+
+
+def run_in_loop(test):
+    """Decorate a coroutine test and run it in a new event loop.
+
+    :param test: A coroutine function of a test.
+    :return: Decorated function.
+    """
+    @wraps(test)
+    def wrapper(self):
+        """Run the test until it is complete."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(test(self))
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+    return wrapper
+
+
+def run_with_server(test):
+    """Decorate a coroutine test and run it with a started server.
+
+    The server is available as 'server' attribute of a test case and is
+    closed after the test.
+    :param test: A coroutine function of a test.
+    :return: Decorated function.
+    """
+    @run_in_loop
+    @wraps(test)
+    async def wrapper(self):
+        """Start the server, run the test and close the server."""
+        self.server = AnagramServer(['TAR', 'art', 'TBD', u'été'])
+        await self.server.start()
+        try:
+            await test(self)
+        finally:
+            await self.server.close()
+
+    return wrapper
+
+
+class TestLookupBatcher(unittest.TestCase):
+    """Tests of coalescing of lookups."""
+
+    def setUp(self):
+        """Build an index."""
+        self.index = AnagramIndex(['TAR', 'art', 'TBD', u'été'])
+
+    @run_in_loop
+    async def test_concurrent_lookups_are_batched(self):
+        """Test that concurrent lookups are performed by a single batch."""
+        batcher = LookupBatcher(self.index)
+
+        results = await asyncio.gather(
+            batcher.lookup('rat'), batcher.lookup('dbt'),
+            batcher.lookup('no_anagrams'), batcher.lookup(u'téé'),
+        )
+
+        self.assertListEqual(
+            results, [['TAR', 'art'], ['TBD'], [], [u'été']]
+        )
+        self.assertEqual(batcher.batches, 1)
+        self.assertEqual(batcher.requests, 4)
+
+    @run_in_loop
+    async def test_max_batch_size(self):
+        """Test that a full batch is performed immediately."""
+        batcher = LookupBatcher(self.index, max_batch_size=2)
+
+        results = await asyncio.gather(
+            *[batcher.lookup('rat') for _ in range(5)]
+        )
+
+        self.assertListEqual(results, [['TAR', 'art']] * 5)
+        self.assertEqual(batcher.batches, 3)
+
+    @run_in_loop
+    async def test_sequential_lookups(self):
+        """Test that sequential lookups are performed by separate batches."""
+        batcher = LookupBatcher(self.index)
+
+        self.assertListEqual(await batcher.lookup('rat'), ['TAR', 'art'])
+        self.assertListEqual(await batcher.lookup('dbt'), ['TBD'])
+        self.assertEqual(batcher.batches, 2)
+
+    @run_in_loop
+    async def test_error_is_propagated(self):
+        """Test that an error of the index is raised by every lookup."""
+        batcher = LookupBatcher(None)
+
+        results = await asyncio.gather(
+            batcher.lookup('rat'), batcher.lookup('tar'),
+            return_exceptions=True,
+        )
+
+        self.assertIsInstance(results[0], AttributeError)
+        self.assertIs(results[0], results[1])
+
+    @run_in_loop
+    async def test_cancelled_lookup(self):
+        """Test that a cancelled lookup doesn't break the batch."""
+        batcher = LookupBatcher(self.index)
+
+        cancelled = batcher.submit('rat')
+        cancelled.cancel()
+
+        self.assertListEqual(await batcher.lookup('tar'), ['TAR', 'art'])
+
+
+class TestAnagramServer(unittest.TestCase):
+    """Tests of the server of anagram lookups."""
+
+    async def request(self, words):
+        """Send pipelined requests and read responses.
+
+        :param words: A list of words.
+        :return: A list of responses.
+        """
+        reader, writer = await asyncio.open_connection(*self.server.address)
+        writer.write(u''.join(word + u'\n' for word in words).encode('utf-8'))
+        await writer.drain()
+        responses = [
+            (await reader.readline()).decode('utf-8') for _ in words
+        ]
+        writer.close()
+        return responses
+
+    @run_with_server
+    async def test_pipelined_requests(self):
+        """Test that responses are sent in order of requests."""
+        responses = await self.request(['rat', 'no_anagrams', u'téé', 'dbt'])
+
+        self.assertListEqual(
+            responses, [u'TAR art\n', u'\n', u'été\n', u'TBD\n']
+        )
+
+    @run_with_server
+    async def test_concurrent_connections(self):
+        """Test that requests of concurrent connections are batched."""
+        results = await asyncio.gather(
+            *[self.request(['rat', 'dbt']) for _ in range(10)]
+        )
+
+        self.assertListEqual(results, [[u'TAR art\n', u'TBD\n']] * 10)
+        self.assertEqual(self.server.batcher.requests, 20)
+        self.assertLess(self.server.batcher.batches, 20)
+
+    @run_with_server
+    async def test_client_disconnects(self):
+        """Test that the server keeps working after a client has gone."""
+        _, writer = await asyncio.open_connection(*self.server.address)
+        writer.write(b'rat\n' * 100)
+        writer.close()
+
+        self.assertListEqual(await self.request(['rat']), [u'TAR art\n'])
+
+    @run_with_server
+    async def test_lookup_error(self):
+        """Test that a failed lookup gets an error response."""
+        with mock.patch.object(AnagramIndex, 'lookup_many',
+                               side_effect=RuntimeError('broken')):
+            responses = await self.request(['rat', 'dbt'])
+
+        self.assertListEqual(responses, [u'ERROR RuntimeError\n'] * 2)
+        self.assertListEqual(await self.request(['rat']), [u'TAR art\n'])
+
+    @run_in_loop
+    async def test_sender_stops(self):
+        """Test that requests are not read if responses can't be sent."""
+        async def fail_later(responses, writer):
+            # the queue is filled meanwhile
+            await asyncio.sleep(0.01)
+            writer.close()
+            raise ConnectionResetError
+
+        server = AnagramServer(['TAR', 'art'], max_pipeline=1)
+        await server.start()
+        with mock.patch.object(AnagramServer, '_send_responses',
+                               staticmethod(fail_later)):
+            _, writer = await asyncio.open_connection(*server.address)
+            writer.write(b'rat\n' * 100)
+            await writer.drain()
+            await asyncio.sleep(0.05)
+
+            # the handler doesn't wait for a place in the full queue
+            await asyncio.wait_for(server.close(), 1)
+
+        writer.close()
@@ -0,0 +1,228 @@
+"""Signatures of words.
+
+A signature is a key which is the same for all anagrams of a word and is
+different for words which are not anagrams. Several signature functions are
+available:
+
+* 'sorted_letters' - a sorted sequence of lowercased letters. It works for
+  any words and is used by default;
+* 'letter_counts' - counts of letters 'a'-'z' packed into an integer,
+  8 bits per letter;
+* 'prime_product' - a product of prime numbers assigned to letters 'a'-'z'
+  if it fits into 64 bits.
+
+The last two are computed in O(len(word)) without sorting and allocation of
+a list and a string. They fall back to 'sorted_letters' for words which
+contain other characters or are too long, so any signature function can be
+used for any words. Many words can be signed at once by 'sign_many' which
+can use NumPy, if it is installed, for integer signatures.
+"""
+import string
+from itertools import islice
+
+from six.moves import map
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_letters = string.ascii_lowercase
+# a weight of a letter is 1 shifted to the position of its counter
+_letter_weights = dict(
+    (letter, 1 << (8 * idx)) for idx, letter in enumerate(_letters)
+)
+# counters of letters are 8 bits wide, so they can't overflow
+# in a word shorter than 256 letters
+_max_letter_counts_length = 255
+_primes = (
+    2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67,
+    71, 73, 79, 83, 89, 97, 101,
+)
+_letter_primes = dict(zip(_letters, _primes))
+_max_prime_product = 2 ** 64 - 1
+# amount of words signed by NumPy at once
+_bulk_size = 65536
+
+
+def sorted_letters(word):
+    """Get a signature of given word.
+
+    It is a sorted sequence of lowercased letters of the word.
+    :param word: A word.
+    :return: Signature of the word.
+    """
+    return ''.join(sorted(word.lower()))
+
+
+def letter_counts(word):
+    """Get a signature of given word.
+
+    It is an integer where each byte is amount of a letter in the word,
+    the lowest byte is for 'a'. Words with letters other than 'a'-'z'
+    and words longer than 255 letters fall back to 'sorted_letters'.
+    :param word: A word.
+    :return: Signature of the word.
+    """
+    word = word.lower()
+    if len(word) <= _max_letter_counts_length:
+        weights = _letter_weights
+        key = 0
+        try:
+            for letter in word:
+                key += weights[letter]
+        except KeyError:
+            pass
+        else:
+            return key
+    return sorted_letters(word)
+
+
+def prime_product(word):
+    """Get a signature of given word.
+
+    It is a product of prime numbers assigned to letters of the word.
+    Words with letters other than 'a'-'z' and words which product doesn't
+    fit into 64 bits fall back to 'sorted_letters'.
+    :param word: A word.
+    :return: Signature of the word.
+    """
+    word = word.lower()
+    primes = _letter_primes
+    key = 1
+    try:
+        for letter in word:
+            key *= primes[letter]
+    except KeyError:
+        pass
+    else:
+        if key <= _max_prime_product:
+            return key
+    return sorted_letters(word)
+
+
+SIGNATURES = {
+    'sorted_letters': sorted_letters,
+    'letter_counts': letter_counts,
+    'prime_product': prime_product,
+}
+
+
+def _letter_codes(words):
+    """Convert words into a matrix of numbers of lowercased letters.
+
+    :param words: A list of words.
+    :return: A tuple of (matrix, mask, lengths). Each row of the matrix
+    contains numbers of letters of a word counting from 0 for 'a'. Padding
+    of shorter words and all characters other than 'a'-'z' are replaced
+    with 26. The mask marks words which consist of letters 'a'-'z' only.
+    """
+    words = [word.lower() for word in words]
+    lengths = numpy.array([len(word) for word in words], dtype=numpy.int64)
+    codes = numpy.array(words, dtype=numpy.str_)
+    codes = codes.view(numpy.uint32).reshape(len(words), -1)
+    codes = codes.astype(numpy.int64) - ord('a')
+
+    padding = numpy.arange(codes.shape[1]) >= lengths[:, numpy.newaxis]
+    is_letter = (codes >= 0) & (codes < len(_letters))
+    mask = (is_letter | padding).all(axis=1)
+    codes[~is_letter | padding] = len(_letters)
+    return codes, mask, lengths
+
+
+def _letter_counts_with_numpy(words):
+    """Get 'letter_counts' signatures of given words using NumPy.
+
+    :param words: A list of words.
+    :return: A list of signatures.
+    """
+    codes, mask, lengths = _letter_codes(words)
+    mask &= lengths <= _max_letter_counts_length
+    # count letters of all words at once, the last column counts padding
+    # and other characters
+    width = len(_letters) + 1
+    rows = numpy.arange(len(words))[:, numpy.newaxis] * width
+    counts = numpy.bincount(
+        (rows + codes).ravel(), minlength=len(words) * width
+    )
+    counts = counts.reshape(len(words), width)[:, :-1].astype(numpy.uint8)
+
+    # a row of counters is exactly the packed integer in little-endian order
+    data = counts.tobytes()
+    size = len(_letters)
+    from_bytes = int.from_bytes
+    return [
+        from_bytes(data[idx * size:(idx + 1) * size], 'little')
+        if ok else sorted_letters(word)
+        for idx, (word, ok) in enumerate(zip(words, mask.tolist()))
+    ]
+
+
+def _prime_product_with_numpy(words):
+    """Get 'prime_product' signatures of given words using NumPy.
+
+    :param words: A list of words.
+    :return: A list of signatures.
+    """
+    codes, mask, _ = _letter_codes(words)
+    # padding is mapped to 1 which doesn't change a product
+    primes = numpy.array(_primes + (1,), dtype=numpy.uint64)
+    log_primes = numpy.log2(primes.astype(numpy.float64))
+    # products wrap around on overflow, so products which may not fit
+    # into 64 bits are computed precisely one by one
+    mask &= log_primes[codes].sum(axis=1) < 63.5
+    products = primes[codes].prod(axis=1, dtype=numpy.uint64)
+    return [
+        product if ok else prime_product(word)
+        for word, product, ok in zip(words, products.tolist(), mask.tolist())
+    ]
+
+
+_numpy_signatures = {
+    letter_counts: _letter_counts_with_numpy,
+    prime_product: _prime_product_with_numpy,
+}
+
+
+def sign_many(words, signature=sorted_letters, use_numpy=False):
+    """Get signatures of many words.
+
+    Words are signed one by one or, if requested, integer signatures are
+    computed by NumPy in bulks of words. Words are consumed lazily in both
+    cases, so it can be used for a stream of words.
+    :param words: An iterable of words.
+    :param signature: A signature function.
+    :param use_numpy: Use NumPy or not. If None, it is used if it is
+    installed and there is a vectorized version of the signature function.
+    Which way is faster depends on lengths of words, so it is not used by
+    default (see 'find_anagrams/profiling/signatures_benchmark.py').
+    :raise ValueError: If NumPy is requested but can't be used.
+    :return: An iterator over signatures in order of words.
+    """
+    bulk_signature = _numpy_signatures.get(signature)
+    if use_numpy is None:
+        use_numpy = numpy is not None and bulk_signature is not None
+    elif use_numpy and (numpy is None or bulk_signature is None):
+        raise ValueError(
+            'NumPy is not installed or signature is not vectorized'
+        )
+
+    if not use_numpy:
+        return map(signature, words)
+    return _sign_in_bulks(words, bulk_signature)
+
+
+def _sign_in_bulks(words, bulk_signature):
+    """Get signatures of words by bulks.
+
+    :param words: An iterable of words.
+    :param bulk_signature: A function that signs a list of words.
+    :return: Generator of signatures.
+    """
+    words = iter(words)
+    while True:
+        bulk = list(islice(words, _bulk_size))
+        if not bulk:
+            return
+        for key in bulk_signature(bulk):
+            yield key
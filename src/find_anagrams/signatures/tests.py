@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Tests of signatures of words."""
+import unittest
+
+from find_anagrams.signatures import (
+    SIGNATURES, letter_counts, numpy, prime_product, sign_many, sorted_letters
+)
+
+WORDS = (
+    'Rat', 'tar', 'art', 'TLDR', 'dog', 'God', '', u'été', u'tée', 'a-b',
+    'b-a', 'z' * 13, 'z' * 14, 'a' * 255, 'a' * 256, 'ab' * 200,
+)
+
+
+class TestSignatures(unittest.TestCase):
+    """Tests of signatures of words."""
+
+    def assertSameAnagrams(self, signature):
+        """Assert if given signature groups words not as 'sorted_letters'."""
+        for word in WORDS:
+            for other_word in WORDS:
+                self.assertEqual(
+                    signature(word) == signature(other_word),
+                    sorted_letters(word) == sorted_letters(other_word),
+                    (signature.__name__, word, other_word)
+                )
+
+    def test_sorted_letters(self):
+        """Test signature of sorted letters."""
+        self.assertEqual(sorted_letters('Rat'), 'art')
+
+    def test_letter_counts(self):
+        """Test signature of packed counts of letters."""
+        self.assertEqual(letter_counts('Rat'),
+                         1 + (1 << 8 * 17) + (1 << 8 * 19))
+        self.assertEqual(letter_counts('a-b'), '-ab')
+        self.assertEqual(letter_counts('a' * 256), 'a' * 256)
+        self.assertSameAnagrams(letter_counts)
+
+    def test_prime_product(self):
+        """Test signature of product of prime numbers."""
+        self.assertEqual(prime_product('Rat'), 2 * 61 * 71)
+        self.assertEqual(prime_product('a-b'), '-ab')
+        self.assertEqual(prime_product('z' * 9), 101 ** 9)
+        self.assertEqual(prime_product('z' * 10), 'z' * 10)
+        self.assertSameAnagrams(prime_product)
+
+    def test_sign_many(self):
+        """Test signing of many words one by one."""
+        for signature in SIGNATURES.values():
+            self.assertListEqual(
+                list(sign_many(iter(WORDS), signature, use_numpy=False)),
+                [signature(word) for word in WORDS]
+            )
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_sign_many_with_numpy(self):
+        """Test signing of many words with NumPy."""
+        for signature in (letter_counts, prime_product):
+            self.assertListEqual(
+                list(sign_many(iter(WORDS), signature, use_numpy=True)),
+                [signature(word) for word in WORDS]
+            )
+
+    def test_sign_many_with_numpy_not_vectorized(self):
+        """Test that signature without vectorized version is rejected."""
+        with self.assertRaises(ValueError):
+            sign_many(WORDS, sorted_letters, use_numpy=True)
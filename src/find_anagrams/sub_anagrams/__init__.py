@@ -0,0 +1,146 @@
+"""Search of words which can be formed from a multiset of letters."""
+import binascii
+from collections import Counter
+
+from six import iteritems
+from six.moves import range
+
+from find_anagrams.words import WordStore
+
+
+def _bits_to_int(bits):
+    """Convert a little-endian bit array into an integer.
+
+    :param bits: A bytearray where bit 'i' is bit 'i % 8' of byte 'i // 8'.
+    :return: An integer.
+    """
+    return int(binascii.hexlify(bytes(bits[::-1])) or b'0', 16)
+
+
+class SubAnagramIndex(object):
+    """Index of groups of anagrams by counts of their letters.
+
+    It answers which words can be formed from a subset of a given multiset
+    of letters, e.g. in word games. Groups of anagrams of an anagram index
+    are numbered and for each letter and each amount 'k' a bitmap of groups
+    that contain the letter more than 'k' times is stored as an integer.
+    Groups that need more letters than given are excluded by a few bitwise
+    operations on the bitmaps without scanning words.
+
+    Groups are numbered from the longest words to the shortest ones, so
+    results are ordered by length descending and bounds of length are
+    ranges of bits.
+    Usage example:
+
+    .. code-block:: python
+
+        >>> index = SubAnagramIndex(AnagramIndex(['TAR', 'art', 'at', 'tt']))
+        >>>
+        >>> assert index.find('trap') == ['TAR', 'art', 'at']
+        >>> assert index.find('trap', max_length=2) == ['at']
+
+    The index is a snapshot of groups of the anagram index, so it must be
+    rebuilt after words are added to or removed from the anagram index.
+    """
+
+    __slots__ = ('_index', '_groups', '_length_ends', '_exceeding')
+
+    def __init__(self, index):
+        """Initialize an index.
+
+        :param index: An anagram index, e.g. 'AnagramIndex'.
+        """
+        super(SubAnagramIndex, self).__init__()
+
+        self._index = index
+
+        # a word of each group is enough to find the whole group
+        groups = sorted(
+            (group[0] for group in index.iter_groups(min_size=1)),
+            key=lambda word: (-len(word.lower()), sorted(word.lower())),
+        )
+        self._groups = WordStore(groups)
+
+        # item 'n' is amount of groups of words not shorter than 'n',
+        # so such groups have numbers from 0 to 'length_ends[n] - 1'
+        max_length = len(groups[0].lower()) if groups else 0
+        self._length_ends = length_ends = [0] * (max_length + 2)
+        # bit arrays of groups which contain a letter more than 'k' times
+        exceeding = {}
+        for group, word in enumerate(groups):
+            word = word.lower()
+            length_ends[len(word)] += 1
+            byte_idx, bit = group >> 3, 1 << (group & 7)
+            for letter, amount in iteritems(Counter(word)):
+                bit_arrays = exceeding.setdefault(letter, [])
+                for count in range(amount):
+                    if count == len(bit_arrays):
+                        bit_arrays.append(bytearray(len(groups) // 8 + 1))
+                    bit_arrays[count][byte_idx] |= bit
+        for length in range(max_length, -1, -1):
+            length_ends[length] += length_ends[length + 1]
+
+        self._exceeding = dict(
+            (letter, [_bits_to_int(bits) for bits in bit_arrays])
+            for letter, bit_arrays in iteritems(exceeding)
+        )
+
+    def _groups_in_length_range(self, min_length, max_length):
+        """Get a bitmap of groups with length in given range.
+
+        :param min_length: Minimal length of words.
+        :param max_length: Maximal length of words.
+        :return: An integer.
+        """
+        length_ends = self._length_ends
+        max_length = min(max_length, len(length_ends) - 2)
+        if min_length > max_length:
+            return 0
+        # longer words have lower numbers of groups
+        first = length_ends[max_length + 1]
+        last = length_ends[min_length]
+        return ((1 << last) - 1) ^ ((1 << first) - 1)
+
+    def find(self, letters, min_length=None, max_length=None, limit=None):
+        """Find words which can be formed from given letters.
+
+        Each of given letters can be used once. Letters are case-insensitive.
+        :param letters: A string of available letters.
+        :param min_length: Minimal length of found words, 1 by default.
+        :param max_length: Maximal length of found words. It is limited by
+        amount of given letters.
+        :param limit: Maximal amount of found words.
+        :return: A list of words ordered by length descending.
+        """
+        letters = letters.lower()
+        max_length = len(letters) if max_length is None else \
+            min(max_length, len(letters))
+        groups = self._groups_in_length_range(
+            max(min_length or 1, 1), max_length
+        )
+
+        available = Counter(letters)
+        for letter, bitmaps in iteritems(self._exceeding):
+            if not groups:
+                break
+            amount = available.get(letter, 0)
+            if amount < len(bitmaps):
+                groups &= ~bitmaps[amount]
+
+        return self._collect_words(groups, limit)
+
+    def _collect_words(self, groups, limit):
+        """Get words of groups from given bitmap.
+
+        :param groups: A bitmap of groups.
+        :param limit: Maximal amount of words.
+        :return: A list of words.
+        """
+        result = []
+        # the lowest bit goes first in the reversed binary representation
+        bits = bin(groups)[:1:-1]
+        group = bits.find('1')
+        while group >= 0 and (limit is None or len(result) < limit):
+            result.extend(self._index.lookup(self._groups[group]))
+            group = bits.find('1', group + 1)
+        return result if limit is None else result[:limit]
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Tests of index of sub-anagrams."""
+import unittest
+
+from find_anagrams import AnagramIndex, SubAnagramIndex
+
+
+class TestSubAnagramIndex(unittest.TestCase):
+    """Tests of index of sub-anagrams."""
+
+    def setUp(self):
+        """Create an index."""
+        self.words = [u'TAR', u'art', u'at', u'tt', u'a', u'trap', u'part',
+                      u'été']
+        self.index = SubAnagramIndex(AnagramIndex(self.words))
+
+    def test_find(self):
+        """Test finding of words formed from a subset of letters."""
+        self.assertListEqual(self.index.find('traP'),
+                             ['trap', 'part', 'TAR', 'art', 'at', 'a'])
+        self.assertListEqual(self.index.find('ttx'), ['tt'])
+        self.assertListEqual(self.index.find(u'téé'), [u'été'])
+        self.assertListEqual(self.index.find('xyz'), [])
+        self.assertListEqual(self.index.find(''), [])
+
+    def test_same_as_brute_force(self):
+        """Test that results are the same as of checking every word."""
+        def brute_force(letters):
+            return sorted(
+                word for word in self.words
+                if all(word.lower().count(letter) <= letters.count(letter)
+                       for letter in word.lower())
+            )
+
+        for letters in (u'trap', u'ttaa', u'rat', u'étét', u'partt'):
+            self.assertListEqual(sorted(self.index.find(letters)),
+                                 brute_force(letters))
+
+    def test_length_bounds(self):
+        """Test finding of words with bounds of length."""
+        self.assertListEqual(self.index.find('trap', min_length=3),
+                             ['trap', 'part', 'TAR', 'art'])
+        self.assertListEqual(self.index.find('trap', max_length=2),
+                             ['at', 'a'])
+        self.assertListEqual(
+            self.index.find('trap', min_length=2, max_length=3),
+            ['TAR', 'art', 'at']
+        )
+        self.assertListEqual(self.index.find('trap', min_length=5), [])
+        self.assertListEqual(self.index.find('trap', max_length=0), [])
+
+    def test_limit(self):
+        """Test limiting amount of found words."""
+        self.assertListEqual(self.index.find('trap', limit=3),
+                             ['trap', 'part', 'TAR'])
+        self.assertListEqual(self.index.find('trap', limit=0), [])
+
+    def test_empty(self):
+        """Test an index of empty list of words."""
+        index = SubAnagramIndex(AnagramIndex([]))
+
+        self.assertListEqual(index.find('trap'), [])
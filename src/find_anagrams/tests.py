@@ -1,7 +1,31 @@
 """Tests for LRU cache mechanism."""
+import sys
 from unittest import TestCase
 
-from find_anagrams import find_anagrams
+from mock import mock
+
+from find_anagrams import (
+    AnagramIndex, find_anagrams, find_anagrams_many, find_near_anagrams,
+    find_sub_anagrams, get_anagram_index,
+    iter_anagram_groups, letter_counts, prepare_storage_with_words,
+    prime_product, sorted_letters
+)
+
+
+def load_tests(loader, tests, pattern):
+    """Load tests of the module and of the server of anagram lookups.
+
+    The latter are loaded on Python 3.7+ only, since 'find_anagrams.server'
+    requires it.
+    :param loader: A loader of tests.
+    :param tests: Tests of the module.
+    :param pattern: A pattern of names of modules.
+    :return: A suite of tests.
+    """
+    if sys.version_info >= (3, 7):
+        from find_anagrams.server import coroutine_tests
+        tests.addTests(loader.loadTestsFromModule(coroutine_tests))
+    return tests
 
 
 class TestFindAnagrams(TestCase):
@@ -16,3 +40,127 @@ class TestFindAnagrams(TestCase):
             anagrams = find_anagrams(word, words)
 
             self.assertEqual(anagrams, result)
+
+    def test_index_is_reused(self):
+        """Test that an index of the same words is not rebuilt."""
+        words = ['TAR', 'art']
+        index = get_anagram_index(words)
+
+        self.assertIs(get_anagram_index(index), index)
+        self.assertIs(get_anagram_index(words), index)
+        self.assertIs(get_anagram_index(list(words)), index)
+        self.assertIsNot(get_anagram_index(words, prime_product), index)
+
+    def test_repeated_calls_dont_rebuild(self):
+        """Test that repeated calls with the same list build one index."""
+        words = ['TAR', 'art', 'TBD']
+
+        with mock.patch('find_anagrams.AnagramIndex',
+                        wraps=AnagramIndex) as index_mock:
+            for _ in range(3):
+                self.assertEqual(find_anagrams('rat', words), ['TAR', 'art'])
+
+        index_mock.assert_called_once_with(words, signature=sorted_letters)
+
+    def test_changed_index(self):
+        """Test that an index changed by a caller is not reused."""
+        words = ['art', 'dog']
+        index = get_anagram_index(words)
+        index.add('tar')
+
+        self.assertIsNot(get_anagram_index(words), index)
+        self.assertEqual(find_anagrams('rat', words), ['art'])
+
+    def test_changed_words(self):
+        """Test that changes of a list of words in place are found."""
+        words = ['art', 'dog']
+
+        self.assertEqual(find_anagrams('rat', words), ['art'])
+        words[0] = 'cat'
+        self.assertEqual(find_anagrams('rat', words), [])
+        words.append('tar')
+        self.assertEqual(find_anagrams('rat', words), ['tar'])
+
+    def test_find_anagrams_with_signature(self):
+        """Test finding of anagrams with different signature functions."""
+        words = ('TLDR', 'TAR', 'art', 'TBD', 'a-b', 'b-a')
+
+        for signature in (letter_counts, prime_product):
+            self.assertEqual(find_anagrams('Rat', words, signature),
+                             ['TAR', 'art'])
+            self.assertEqual(find_anagrams('ab-', words, signature),
+                             ['a-b', 'b-a'])
+
+    def test_prepare_storage_with_signature(self):
+        """Test preparing of storage with different signature functions."""
+        storage = prepare_storage_with_words(('TAR', 'art', 'TBD'),
+                                             prime_product)
+
+        self.assertListEqual(list(storage[3][2 * 61 * 71]), [0, 1])
+
+    def test_find_anagrams_many(self):
+        """Test finding of anagrams of many words at once."""
+        words = ('TLDR', 'TAR', 'art', 'TBD')
+
+        anagrams = find_anagrams_many(['Rat', 'dog', 'tra', 'bdt'], words)
+
+        self.assertListEqual(anagrams, [
+            ['TAR', 'art'], [], ['TAR', 'art'], ['TBD'],
+        ])
+
+    def test_iter_anagram_groups(self):
+        """Test iteration over all groups of anagrams."""
+        words = ('TLDR', 'TAR', 'art', 'TBD', 'dog', 'God', 'rat')
+
+        self.assertListEqual(sorted(iter_anagram_groups(words)), [
+            ['TAR', 'art', 'rat'], ['dog', 'God'],
+        ])
+        self.assertEqual(len(list(iter_anagram_groups(words, min_size=1))),
+                         4)
+
+    def test_find_sub_anagrams(self):
+        """Test finding of words formed from a subset of letters."""
+        words = ['TLDR', 'TAR', 'art', 'TBD', 'at', 'tt', 'trap']
+
+        self.assertListEqual(find_sub_anagrams('Trap', words),
+                             ['trap', 'TAR', 'art', 'at'])
+        self.assertListEqual(find_sub_anagrams('trap', words, max_length=3,
+                                               limit=1), ['TAR'])
+
+        words.append('pat')
+
+        self.assertListEqual(find_sub_anagrams('trap', words, min_length=3),
+                             ['trap', 'pat', 'TAR', 'art'])
+
+    def test_find_sub_anagrams_in_changed_index(self):
+        """Test that sub-anagrams are found after the index is changed."""
+        index = AnagramIndex(['art', 'dog'])
+
+        self.assertListEqual(find_sub_anagrams('cat', index), [])
+        index.add('cat')
+        index.remove('dog')
+        self.assertListEqual(find_sub_anagrams('cat', index), ['cat'])
+        index.compact()
+        self.assertListEqual(find_sub_anagrams('cat', index), ['cat'])
+
+    def test_find_near_anagrams(self):
+        """Test finding of words which differ by a few letters."""
+        words = ('TLDR', 'TAR', 'art', 'TBD', 'tart', 'at', 'tab', 'dog')
+
+        # order of words within the same amount of edits is not defined
+        self.assertListEqual(sorted(find_near_anagrams('Rat', words)),
+                             ['at', 'tab', 'tart'])
+        found = find_near_anagrams('rat', words, max_edits=2)
+        self.assertListEqual(sorted(found[:3]), ['at', 'tab', 'tart'])
+        self.assertListEqual(sorted(found[3:]), ['TBD', 'TLDR'])
+
+    def test_find_near_anagrams_in_changed_index(self):
+        """Test that near anagrams are found after the index is changed."""
+        index = AnagramIndex(['art', 'dog'])
+
+        self.assertListEqual(find_near_anagrams('god', index), [])
+        index.add('goad')
+        index.remove('dog')
+        self.assertListEqual(find_near_anagrams('god', index), ['goad'])
+        self.assertListEqual(find_near_anagrams('god', index, max_edits=2),
+                             ['goad'])
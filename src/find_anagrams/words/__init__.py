@@ -0,0 +1,101 @@
+"""Compact storage of words."""
+import io
+from array import array
+
+from six.moves import range
+
+
+class WordStore(object):
+    """Sequence of words stored in a single byte string.
+
+    Words are encoded with UTF-8 and appended to one byte array, their
+    offsets are stored in an array of integers. It takes a few bytes of
+    overhead per word instead of a separate string object for each one.
+    Words are decoded on access.
+    Usage example:
+
+    .. code-block:: python
+
+        >>> words = WordStore(['TAR', 'art'])
+        >>> words.append('rat')
+        >>>
+        >>> assert words[2] == 'rat'
+        >>> assert list(words) == ['TAR', 'art', 'rat']
+
+    """
+
+    __slots__ = ('_data', '_offsets')
+
+    def __init__(self, words=()):
+        """Initialize a store.
+
+        :param words: An iterable of words to be stored. It is consumed
+        lazily, so it can be a generator of any size.
+        """
+        super(WordStore, self).__init__()
+
+        self._data = bytearray()
+        self._offsets = array('L', [0])
+
+        self.extend(words)
+
+    @property
+    def nbytes(self):
+        """Get amount of bytes occupied by the store."""
+        offsets = self._offsets
+        return len(self._data) + len(offsets) * offsets.itemsize
+
+    def append(self, word):
+        """Append a word to the end of the store.
+
+        :param word: A word.
+        """
+        self._data += word.encode('utf-8')
+        self._offsets.append(len(self._data))
+
+    def extend(self, words):
+        """Append given words to the end of the store.
+
+        :param words: An iterable of words.
+        """
+        data = self._data
+        offsets = self._offsets
+        for word in words:
+            data += word.encode('utf-8')
+            offsets.append(len(data))
+
+    def __getitem__(self, idx):
+        """Get a word by given index.
+
+        :param idx: Index of a word.
+        :return: The word.
+        """
+        if idx < 0:
+            idx += len(self)
+        offsets = self._offsets
+        return self._data[offsets[idx]:offsets[idx + 1]].decode('utf-8')
+
+    def __iter__(self):
+        """Iterate over words in the store."""
+        data = self._data
+        offsets = self._offsets
+        for idx in range(len(offsets) - 1):
+            yield data[offsets[idx]:offsets[idx + 1]].decode('utf-8')
+
+    def __len__(self):
+        """Get amount of words in the store."""
+        return len(self._offsets) - 1
+
+
+def iter_words_from_file(path, encoding='utf-8'):
+    """Read words from a file line by line.
+
+    Words are separated by whitespaces. The file is never read entirely.
+    :param path: A path to a file.
+    :param encoding: Encoding of the file.
+    :return: Generator of words.
+    """
+    with io.open(path, encoding=encoding) as words_file:
+        for line in words_file:
+            for word in line.split():
+                yield word
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Tests of compact storage of words."""
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from find_anagrams import WordStore
+from find_anagrams.words import iter_words_from_file
+
+
+class TestWordStore(unittest.TestCase):
+    """Tests of compact storage of words."""
+
+    def test_creation_from_iterable(self):
+        """Test creation of a store from a generator."""
+        words = WordStore(word for word in ('TAR', u'été', 'art'))
+
+        self.assertEqual(len(words), 3)
+        self.assertListEqual(list(words), ['TAR', u'été', 'art'])
+
+    def test_append(self):
+        """Test appending of words."""
+        words = WordStore()
+
+        words.append('TAR')
+        words.extend(['', 'art'])
+
+        self.assertEqual(words[0], 'TAR')
+        self.assertEqual(words[1], '')
+        self.assertEqual(words[-1], 'art')
+        self.assertEqual(len(words), 3)
+
+
+class TestIterWordsFromFile(unittest.TestCase):
+    """Tests of reading words from a file."""
+
+    def setUp(self):
+        """Create a temporary directory."""
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.tmp_dir)
+
+    def test_iter_words(self):
+        """Test reading words separated by whitespaces."""
+        path = os.path.join(self.tmp_dir, 'dictionary.txt')
+        with io.open(path, 'w', encoding='utf-8') as dict_file:
+            dict_file.write(u'TAR art\n\n été \n')
+
+        self.assertListEqual(list(iter_words_from_file(path)),
+                             ['TAR', 'art', u'été'])
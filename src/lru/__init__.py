@@ -2,31 +2,116 @@
 
 Implementation of LRU cache mechanism.
 """
+import atexit
+import os
 from functools import wraps
+from timeit import default_timer
 
-from lru.cache import LruCache
+import six
 
+from lru.cache import LruCache, monotonic
+from lru.compact import CompactLruCache  # noqa: F401
+from lru.policies import PolicyCache
+from lru.sharded import ShardedLruCache
+from lru.shared import SharedLruCache
+from lru.stats import get_cache_info
 
-def lru_cache(max_size=None):
+# a marker of absence of a value in cache
+_missing = object()
+# cache size used if it is not specified
+default_max_size = 100
+# types of a single argument which is a key itself, since their hash is
+# computed fast or cached
+_fast_types = frozenset(six.integer_types + (str, six.text_type))
+
+
+def make_key(args, kwargs, typed=False):
+    """Make a key of cache from positional and keyword arguments.
+
+    A single argument of a type with a fast hash is a key itself, so a tuple
+    isn't created and hashed. Keyword arguments are sorted, so their order
+    doesn't matter.
+    :param args: A tuple of positional arguments.
+    :param kwargs: A dictionary of keyword arguments.
+    :param typed: Add types of arguments to the key or not.
+    :return: A key.
+    """
+    key = args
+    if kwargs:
+        kwargs_items = sorted(kwargs.items())
+        key += tuple(kwargs_items)
+    if typed:
+        key += tuple(type(value) for value in args)
+        if kwargs:
+            key += tuple(type(value) for _, value in kwargs_items)
+    elif len(key) == 1 and type(key[0]) in _fast_types:
+        return key[0]
+    return key
+
+
+def lru_cache(max_size=None, shards=None, cache_class=LruCache, ttl=None,
+              max_weight=None, weigher=None, policy=None, stats=False,
+              timing_interval=None, stats_hook=None, stats_hook_interval=60,
+              shared=False, slot_size=None, snapshot_path=None,
+              snapshot_interval=None, typed=False, batched=False,
+              executor=None, batch_size=None):
     """
     Decorate a function and add LRU cache mechanism to it.
 
     It is allowed to be applied to a function only.
     :param max_size: Maximum cache size. It is optional and equals to 100
+    by default unless cache is limited by weight.
+    :param shards: Amount of independently locked shards of cache. If it is
+    given, the decorated function can be called from several threads,
+    e.g. 1 protects cache by a single lock. Cache is not thread-safe
     by default.
-    :return: Decorated function.
+    :param cache_class: A class of cache, e.g. 'CompactLruCache' which
+    occupies less memory.
+    :param ttl: Time to live of results in seconds. It can be a function
+    that gets a result and returns its time to live. Results never expire
+    by default.
+    :param max_weight: Maximum total weight of results, e.g. their size in
+    bytes. Results heavier than that are not cached.
+    :param weigher: A function that gets a key and a result and returns
+    weight of the result. It is approximate size in bytes by default.
+    :param policy: An eviction policy, a name like 'arc' or 'tinylfu' or
+    a subclass of 'lru.policies.EvictionPolicy'. If it is given, results
+    are cached by 'PolicyCache'. It is LRU by default.
+    :param stats: Count hits, misses, inserts, evictions and expirations of
+    cache or not. It is supported by 'LruCache', also when it is sharded.
+    :param timing_interval: Measure duration of every n-th call of the
+    function on a miss. Calls are not timed by default.
+    :param stats_hook: A function that gets 'CacheInfo' with statistics.
+    It is called on a call of the decorated function if the interval has
+    passed since the previous call of the hook, e.g. to push statistics
+    to metrics.
+    :param stats_hook_interval: Minimal interval between calls of the hook
+    in seconds.
+    :param shared: Share results between processes forked after decoration
+    or not. If it is True, results are cached by 'SharedLruCache' in shared
+    memory, so they must be picklable.
+    :param slot_size: Maximum size of a pickled key and a result in shared
+    memory in bytes. Bigger results are not cached.
+    :param snapshot_path: A path to a snapshot of cache. If it is given,
+    cache is loaded from the snapshot when it exists and is dumped to it when
+    the interpreter exits. Cache must support it, e.g. 'LruCache' does.
+    :param snapshot_interval: Minimal interval between dumps of cache on
+    calls of the decorated function in seconds. Cache is dumped only on exit
+    by default.
+    :param typed: Cache results of arguments of different types separately
+    or not, e.g. results of 1 and 1.0.
+    :param batched: The function gets a list of keys and returns a list of
+    results in the same order or not. If it is True, the decorated function
+    gets keys too, but the function is called only for keys which results
+    are not in cache. Other arguments are passed to the function as is.
+    :param executor: An executor of 'concurrent.futures' which calls the
+    batched function for batches of keys in parallel. A function called by
+    a pool of processes must be picklable, so it can't be decorated in place.
+    :param batch_size: Maximum amount of keys passed to a single call of
+    the batched function. All missed keys are passed at once by default.
+    :return: Decorated function. Its method 'cache_info' gets 'CacheInfo'
+    with statistics and 'cache_clear' removes all results from cache.
     """
-    default_max_size = 100
-
-    def get_key_from_args(*args, **kwargs):
-        """Generate a key from positional and keyword arguments.
-
-        :param args: Positional arguments.
-        :param kwargs: Keyword arguments.
-        :return: Generated key.
-        """
-        return args + tuple(sorted(kwargs.items()))
-
     func = None
     if callable(max_size):
         # if decorator is applied without parameters
@@ -35,12 +120,94 @@ def lru_cache(max_size=None):
         max_size = default_max_size
     else:
         # if decorator is executed before applied
-        if max_size is None:
+        if max_size is None and max_weight is None:
             # if maximum size is not specified
             # set it to default
             max_size = default_max_size
 
-    cache = LruCache(max_size)
+    options = {}
+    if ttl is not None and not callable(ttl):
+        options['ttl'] = ttl
+    if max_weight is not None:
+        options['max_weight'] = max_weight
+    if weigher is not None:
+        options['weigher'] = weigher
+    if policy is not None:
+        options['policy'] = policy
+        if cache_class is LruCache:
+            cache_class = PolicyCache
+    if stats:
+        options['stats'] = True
+    if shared and cache_class is LruCache:
+        cache_class = SharedLruCache
+    if slot_size is not None:
+        options['slot_size'] = slot_size
+
+    if shards is None:
+        cache = cache_class(max_size, **options)
+    else:
+        cache = ShardedLruCache(max_size, shards, cache_class, **options)
+
+    if callable(ttl):
+        def put(key, value):
+            """Put a value in cache with its own time to live."""
+            cache.set(key, value, ttl(value))
+    else:
+        put = cache.__setitem__
+    cache_get = cache.get
+
+    if snapshot_path is not None:
+        if os.path.exists(snapshot_path):
+            cache.load(snapshot_path)
+        atexit.register(cache.dump, snapshot_path)
+
+    # amount of misses, amount of timed calls and their total duration
+    timing = [0, 0, 0.0]
+    # the next times to call the hook and to dump cache
+    next_hook_call = [monotonic() + stats_hook_interval]
+    next_snapshot = [monotonic() + (snapshot_interval or 0)]
+
+    def cache_info():
+        """Get statistics of cache.
+
+        :return: An instance of 'CacheInfo'.
+        """
+        return get_cache_info(cache, timing[1], timing[2])
+
+    def cache_clear():
+        """Remove all results from cache and reset statistics."""
+        cache.clear()
+        timing[:] = [0, 0, 0.0]
+
+    def call_on_miss(func, *args, **kwargs):
+        """Call a function on a miss, timing every n-th call.
+
+        :param func: A function.
+        :param args: Positional arguments for the function.
+        :param kwargs: Keyword arguments for the function.
+        :return: Result of execution of the function.
+        """
+        timing[0] += 1
+        if timing_interval and timing[0] % timing_interval == 0:
+            start_time = default_timer()
+            value = func(*args, **kwargs)
+            timing[1] += 1
+            timing[2] += default_timer() - start_time
+            return value
+        return func(*args, **kwargs)
+
+    def run_periodic_tasks():
+        """Call the hook of statistics and dump cache when it is time."""
+        if stats_hook is not None:
+            now = monotonic()
+            if now >= next_hook_call[0]:
+                next_hook_call[0] = now + stats_hook_interval
+                stats_hook(cache_info())
+        if snapshot_interval:
+            now = monotonic()
+            if now >= next_snapshot[0]:
+                next_snapshot[0] = now + snapshot_interval
+                cache.dump(snapshot_path)
 
     def decorator(func):
         """Decorate a function.
@@ -51,18 +218,132 @@ def lru_cache(max_size=None):
         def wrapper(*args, **kwargs):
             """Wrap a function.
 
+            Calls without keyword arguments, which are the most frequent
+            ones, make a key without a call of 'make_key': the tuple of
+            positional arguments or a single argument itself is a key.
             :param args: Positional arguments for the function.
             :param kwargs: Keyword arguments for the function.
             :return: Result of execution of the function.
             """
-            cache_key = get_key_from_args(*args, **kwargs)
-            if cache_key in cache:
-                return cache[cache_key]
+            if kwargs or typed:
+                cache_key = make_key(args, kwargs, typed)
+            elif len(args) == 1 and type(args[0]) in _fast_types:
+                cache_key = args[0]
             else:
+                cache_key = args
+            # a single lookup, so a result can't be evicted by another
+            # thread or expire between a check and getting it
+            value = cache_get(cache_key, _missing)
+            if value is _missing:
                 value = func(*args, **kwargs)
-                cache[cache_key] = value
-                return value
+                put(cache_key, value)
+            return value
+
+        @wraps(func)
+        def instrumented_wrapper(*args, **kwargs):
+            """Wrap a function, timing it and doing periodic tasks.
+
+            The hook of statistics is called and cache is dumped when their
+            intervals pass.
+            :param args: Positional arguments for the function.
+            :param kwargs: Keyword arguments for the function.
+            :return: Result of execution of the function.
+            """
+            cache_key = make_key(args, kwargs, typed)
+            value = cache_get(cache_key, _missing)
+            if value is _missing:
+                value = call_on_miss(func, *args, **kwargs)
+                put(cache_key, value)
+            run_periodic_tasks()
+            return value
+
+        def call_batched(keys, args, kwargs):
+            """Call a batched function for keys split into batches.
+
+            :param keys: A list of keys.
+            :param args: Other positional arguments for the function.
+            :param kwargs: Keyword arguments for the function.
+            :raise ValueError: If amount of results of a batch doesn't equal
+            to amount of its keys.
+            :return: A list of results in order of the keys.
+            """
+            if batch_size is None:
+                batches = [keys]
+            else:
+                batches = [keys[start:start + batch_size]
+                           for start in range(0, len(keys), batch_size)]
+            if executor is None:
+                batch_results = [func(batch, *args, **kwargs)
+                                 for batch in batches]
+            else:
+                futures = [executor.submit(func, batch, *args, **kwargs)
+                           for batch in batches]
+                batch_results = [future.result() for future in futures]
+
+            results = []
+            for batch, batch_result in zip(batches, batch_results):
+                batch_result = list(batch_result)
+                if len(batch_result) != len(batch):
+                    raise ValueError(
+                        '{} results are returned for {} keys'.format(
+                            len(batch_result), len(batch)
+                        )
+                    )
+                results.extend(batch_result)
+            return results
+
+        @wraps(func)
+        def batched_wrapper(keys, *args, **kwargs):
+            """Wrap a batched function.
+
+            Results of keys are got from cache at once, and the function is
+            called for missed keys only. A key repeated in the list is
+            passed to the function once.
+            :param keys: An iterable of keys.
+            :param args: Other positional arguments for the function.
+            :param kwargs: Keyword arguments for the function.
+            :return: A list of results in order of the keys.
+            """
+            keys = list(keys)
+            cache_keys = [make_key((key,) + args, kwargs, typed)
+                          for key in keys]
+            values = cache.get_many(cache_keys, _missing)
+
+            # positions of missed keys in the list by their keys of cache
+            missed_positions = {}
+            missed_keys = []
+            missed_cache_keys = []
+            for position, value in enumerate(values):
+                if value is _missing:
+                    cache_key = cache_keys[position]
+                    if cache_key not in missed_positions:
+                        missed_positions[cache_key] = []
+                        missed_keys.append(keys[position])
+                        missed_cache_keys.append(cache_key)
+                    missed_positions[cache_key].append(position)
+
+            if missed_keys:
+                results = call_on_miss(call_batched, missed_keys, args, kwargs)
+                new_items = list(zip(missed_cache_keys, results))
+                for cache_key, result in new_items:
+                    for position in missed_positions[cache_key]:
+                        values[position] = result
+                if callable(ttl):
+                    for cache_key, result in new_items:
+                        put(cache_key, result)
+                else:
+                    cache.set_many(new_items)
+            run_periodic_tasks()
+            return values
 
-        return wrapper
+        if batched:
+            result = batched_wrapper
+        elif timing_interval or stats_hook is not None or snapshot_interval:
+            result = instrumented_wrapper
+        else:
+            result = wrapper
+        result.cache_info = cache_info
+        result.cache_clear = cache_clear
+        return result
 
     return decorator(func) if func else decorator
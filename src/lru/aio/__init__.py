@@ -0,0 +1,136 @@
+"""LRU cache mechanism for coroutine functions.
+
+The module requires Python 3.5+.
+"""
+import asyncio
+from functools import wraps
+
+from lru import default_max_size, make_key
+from lru.cache import LruCache
+from lru.stats import get_cache_info
+
+# a marker of absence of a value in cache
+_missing = object()
+
+
+def async_lru_cache(max_size=None, cache_class=LruCache):
+    """
+    Decorate a coroutine function and add LRU cache mechanism to it.
+
+    Results of awaited coroutines are cached, not coroutine objects.
+    Concurrent calls with the same arguments share a single execution of
+    the function. Exceptions are not cached, every waiter of a failed
+    execution gets the exception and the next call executes the function
+    again. A cancelled call doesn't affect other waiters of the same
+    execution, the execution is cancelled when all its waiters are.
+    Usage example:
+
+    .. code-block:: python
+
+        >>> @async_lru_cache(1000)
+        ... async def fetch(url):
+        ...     return await http_get(url)
+        >>>
+        >>> # the page is requested only once
+        >>> await asyncio.gather(fetch(url), fetch(url))
+
+    :param max_size: Maximum cache size. It is optional and equals to 100
+    by default.
+    :param cache_class: A class of cache, e.g. 'CompactLruCache'.
+    :raise TypeError: If the decorated function is not a coroutine function.
+    :return: Decorated function. Its method 'cache_info' gets 'CacheInfo'
+    with statistics and 'cache_clear' removes all results from cache, like
+    ones of 'lru_cache'.
+    """
+    func = None
+    if callable(max_size):
+        # if decorator is applied without parameters
+        # the first argument will be a function
+        func = max_size
+        max_size = default_max_size
+    elif max_size is None:
+        max_size = default_max_size
+
+    cache = cache_class(max_size)
+    # executions in progress and amounts of their waiters by keys
+    in_flight = {}
+
+    def cache_info():
+        """Get statistics of cache.
+
+        :return: An instance of 'CacheInfo'.
+        """
+        return get_cache_info(cache)
+
+    def cache_clear():
+        """Remove all results from cache.
+
+        Executions in progress are not affected.
+        """
+        cache.clear()
+
+    def decorator(func):
+        """Decorate a function.
+
+        :param func: A coroutine function to be decorated.
+        """
+        if not asyncio.iscoroutinefunction(func):
+            raise TypeError('{} is not a coroutine function'.format(func))
+
+        def on_done(cache_key, task):
+            """Cache a result of a finished execution.
+
+            :param cache_key: A key of the execution.
+            :param task: A task of the execution.
+            """
+            # a cancelled execution has already been replaced by a new one
+            if in_flight.get(cache_key, (None,))[0] is task:
+                del in_flight[cache_key]
+            if not task.cancelled() and task.exception() is None:
+                cache[cache_key] = task.result()
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            """Wrap a function.
+
+            :param args: Positional arguments for the function.
+            :param kwargs: Keyword arguments for the function.
+            :return: Result of execution of the function.
+            """
+            cache_key = make_key(args, kwargs)
+            # a single lookup, since an item can expire between a check and
+            # getting it
+            value = cache.get(cache_key, _missing)
+            if value is not _missing:
+                return value
+
+            execution = in_flight.get(cache_key)
+            if execution is None:
+                task = asyncio.ensure_future(func(*args, **kwargs))
+                execution = in_flight[cache_key] = [task, 0]
+                task.add_done_callback(
+                    lambda done_task: on_done(cache_key, done_task)
+                )
+
+            task = execution[0]
+            execution[1] += 1
+            try:
+                # shielding prevents cancellation of the execution
+                # together with a single waiter
+                return await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if not task.done():
+                    execution[1] -= 1
+                    if not execution[1]:
+                        # the execution is forgotten at once, so a call made
+                        # before it is done starts a new one instead of
+                        # getting cancellation of this one
+                        del in_flight[cache_key]
+                        task.cancel()
+                raise
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator(func) if func else decorator
@@ -0,0 +1,220 @@
+"""Tests of LRU cache mechanism for coroutine functions.
+
+They are loaded by 'lru.tests' on Python 3.5+ only, since they use its
+syntax and the package can't be imported by older versions.
+"""
+import asyncio
+import unittest
+from functools import wraps
+
+from mock import mock
+
+from lru import CompactLruCache, LruCache
+from lru.aio import async_lru_cache
+
+
+def run_in_loop(test):
+    """Decorate a coroutine test and run it in a new event loop.
+
+    :param test: A coroutine function of a test.
+    :return: Decorated function.
+    """
+    @wraps(test)
+    def wrapper(self):
+        """Run the test until it is complete."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(test(self))
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+    return wrapper
+
+
+class TestAsyncLruCache(unittest.TestCase):
+    """Tests of LRU cache mechanism for coroutine functions."""
+
+    @run_in_loop
+    async def test_results_are_cached(self):
+        """Test that awaited results are cached."""
+        func_mock = mock.Mock()
+
+        @async_lru_cache
+        async def func(p1, p2):
+            func_mock(p1, p2)
+            return p1 + p2
+
+        self.assertEqual(await func(1, 2), 3)
+        self.assertEqual(await func(1, 2), 3)
+        self.assertEqual(await func(2, 2), 4)
+
+        self.assertEqual(func_mock.mock_calls, [
+            mock.call(1, 2), mock.call(2, 2),
+        ])
+
+    @run_in_loop
+    async def test_lru(self):
+        """Test that least recently used results are evicted."""
+        func_mock = mock.Mock()
+
+        @async_lru_cache(2, cache_class=CompactLruCache)
+        async def func(value):
+            func_mock(value)
+            return value
+
+        for value in (1, 2, 1, 3, 2):
+            await func(value)
+
+        self.assertEqual(func_mock.mock_calls, [
+            mock.call(1), mock.call(2), mock.call(3), mock.call(2),
+        ])
+
+    @run_in_loop
+    async def test_concurrent_calls_are_coalesced(self):
+        """Test that concurrent calls share a single execution."""
+        func_mock = mock.Mock()
+
+        @async_lru_cache()
+        async def func(value):
+            func_mock(value)
+            await asyncio.sleep(0.01)
+            return value * 2
+
+        results = await asyncio.gather(*[func(1) for _ in range(10)])
+
+        self.assertListEqual(results, [2] * 10)
+        func_mock.assert_called_once_with(1)
+
+    @run_in_loop
+    async def test_exceptions_are_not_cached(self):
+        """Test that every waiter gets an exception and it is not cached."""
+        func_mock = mock.Mock(side_effect=[ValueError, None])
+
+        @async_lru_cache
+        async def func(value):
+            await asyncio.sleep(0.01)
+            func_mock(value)
+            return value
+
+        results = await asyncio.gather(func(1), func(1),
+                                       return_exceptions=True)
+
+        self.assertIsInstance(results[0], ValueError)
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(await func(1), 1)
+        self.assertEqual(func_mock.call_count, 2)
+
+    @run_in_loop
+    async def test_cancellation_of_single_waiter(self):
+        """Test that cancellation of a waiter doesn't affect other ones."""
+        func_mock = mock.Mock()
+
+        @async_lru_cache
+        async def func(value):
+            func_mock(value)
+            await asyncio.sleep(0.01)
+            return value
+
+        first = asyncio.ensure_future(func(1))
+        second = asyncio.ensure_future(func(1))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        self.assertEqual(await second, 1)
+        self.assertTrue(first.cancelled())
+        self.assertEqual(await func(1), 1)
+        func_mock.assert_called_once_with(1)
+
+    @run_in_loop
+    async def test_cancellation_of_all_waiters(self):
+        """Test that an execution is cancelled when all waiters are."""
+        started, cancelled = asyncio.Event(), asyncio.Event()
+
+        @async_lru_cache
+        async def func(value):
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return value
+
+        waiter = asyncio.ensure_future(func(1))
+        await started.wait()
+        waiter.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+        # the cancelled execution is not cached
+        started.clear()
+        second = asyncio.ensure_future(func(1))
+        await asyncio.wait_for(started.wait(), 1)
+        second.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await second
+
+    @run_in_loop
+    async def test_call_after_cancellation(self):
+        """Test that a call after cancellation starts a new execution."""
+        func_mock = mock.Mock()
+
+        @async_lru_cache
+        async def func(value):
+            func_mock(value)
+            await asyncio.sleep(0.01)
+            return value
+
+        waiter = asyncio.ensure_future(func(1))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+
+        self.assertEqual(await func(1), 1)
+        self.assertTrue(waiter.cancelled())
+        self.assertEqual(func_mock.call_count, 2)
+
+    @run_in_loop
+    async def test_item_expires_after_check(self):
+        """Test that a result is looked up in cache once."""
+        class ExpiringCache(LruCache):
+            """Cache which items expire right after a check by 'in'."""
+
+            __slots__ = ()
+
+            def __getitem__(self, key):
+                raise KeyError(key)
+
+        func_mock = mock.Mock()
+
+        @async_lru_cache(cache_class=ExpiringCache)
+        async def func(value):
+            func_mock(value)
+            return value * 2
+
+        self.assertEqual(await func(1), 2)
+        self.assertEqual(await func(1), 2)
+        func_mock.assert_called_once_with(1)
+
+    @run_in_loop
+    async def test_cache_info_and_clear(self):
+        """Test statistics and clearing of cache like of 'lru_cache'."""
+        @async_lru_cache(2)
+        async def func(value):
+            return value * 2
+
+        for value in (1, 2, 3):
+            await func(value)
+
+        info = func.cache_info()
+        self.assertEqual((info.size, info.max_size), (2, 2))
+        func.cache_clear()
+        self.assertEqual(func.cache_info().size, 0)
+
+    def test_not_coroutine_function(self):
+        """Test that only coroutine functions can be decorated."""
+        with self.assertRaises(TypeError):
+            @async_lru_cache
+            def func(value):
+                return value
@@ -1,24 +1,61 @@
 """LRU cache implementation."""
+import gc
+import os
+import sys
+import time
+
+try:
+    from time import monotonic
+except ImportError:  # python 2
+    from time import time as monotonic
+
+from six.moves import cPickle as pickle
+
+from lru.stats import CacheStats
 from lru.structures.doubly_linked_list import DoublyLinkedList, Node
+from lru.structures.timing_wheel import TimingWheel
+
+# duration of a tick of a timing wheel of expiring items in seconds
+EXPIRY_RESOLUTION = 1.0
+# a marker of absence of a value in cache
+_missing = object()
+# the first bytes of a snapshot of cache
+MAGIC = b'LRUSNAP1'
+
+
+def get_size(key, value):
+    """Get approximate amount of bytes occupied by an item.
+
+    Only the key and the value objects are counted, not objects they refer.
+    :param key: A key.
+    :param value: A value.
+    :return: Amount of bytes.
+    """
+    return sys.getsizeof(key) + sys.getsizeof(value)
 
 
 class CacheObj(object):
     """Class for an object to be put in cache."""
 
-    __slots__ = ('age', 'key', 'value')
+    __slots__ = ('age', 'key', 'value', 'expires', 'weight')
 
-    def __init__(self, age, key, value):
+    def __init__(self, age, key, value, expires=None, weight=0):
         """Initialize an instance.
 
         :param age: Age of cache object. It is used in LRU cache mechanism.
         :param key: A key.
         :param value: A value.
+        :param expires: A time when the object expires, None if it never
+        expires.
+        :param weight: Weight of the object.
         """
         super(CacheObj, self).__init__()
 
         self.age = age
         self.key = key
         self.value = value
+        self.expires = expires
+        self.weight = weight
 
 
 class LruCache(object):
@@ -39,24 +76,91 @@ class LruCache(object):
         >>> assert cache['key2'] == 'value2'
         >>> assert cache['key3'] == 'value3'
 
+    Items can expire after a time to live, given for all items of cache or
+    for a single item:
+
+    .. code-block:: python
+
+        >>> cache = LruCache(100, ttl=60)
+        >>>
+        >>> cache['key1'] = 'value1'  # expires in a minute
+        >>> cache.set('key2', 'value2', ttl=5)  # expires in 5 seconds
+
+    Expiration is checked when an item is accessed. Besides, expired items
+    are removed incrementally by a timing wheel when items are put in cache,
+    so they don't occupy cache until they are evicted.
+
+    Cache can be limited by total weight of items instead of or together
+    with their amount, e.g. by their size in bytes:
+
+    .. code-block:: python
+
+        >>> cache = LruCache(None, max_weight=64 * 1024 * 1024,
+        ...                  weigher=lambda key, value: len(value))
+
+    Items can be saved to a file and restored with their order of recency,
+    e.g. to keep cache warm after a restart:
+
+    .. code-block:: python
+
+        >>> cache.dump('/var/cache/app.lru')
+        >>>
+        >>> cache = LruCache(1000)
+        >>> cache.load('/var/cache/app.lru')
+
     """
 
-    __slots__ = ('_age_cnt', '_storage', '_size', '_items_sorted_by_age')
+    __slots__ = ('_age_cnt', '_storage', '_size', '_items_sorted_by_age',
+                 '_ttl', '_expiry', '_max_weight', '_weigher', '_weight',
+                 '_stats')
 
-    def __init__(self, cache_size):
+    def __init__(self, cache_size, ttl=None, max_weight=None,
+                 weigher=get_size, stats=False):
         """Initialize cache.
 
-        :param cache_size: Maximum cache size.
+        :param cache_size: Maximum cache size. It can be None if cache is
+        limited by weight only.
+        :param ttl: Time to live of items in seconds. Items never expire
+        by default.
+        :param max_weight: Maximum total weight of items. Cache is not
+        limited by weight by default.
+        :param weigher: A function that gets a key and a value and returns
+        weight of an item. It is approximate size in bytes by default.
+        :param stats: Count hits, misses, inserts, evictions and expirations
+        or not. Hits and misses are counted by 'get' and '[]'.
         """
         super(LruCache, self).__init__()
 
         self._size = cache_size
+        self._ttl = ttl
+        self._max_weight = max_weight
+        self._weigher = weigher
+        self._weight = 0
         self._age_cnt = 0
         self._storage = {}
 
         # linked list is used to store items ordered by age
         # this allows significantly decrease cost of searching LRU item
         self._items_sorted_by_age = DoublyLinkedList()
+        # timing wheel of expiring items, it is created
+        # when the first such item is put in cache
+        self._expiry = None
+        self._stats = CacheStats() if stats else None
+
+    @property
+    def weight(self):
+        """Get total weight of items in cache."""
+        return self._weight
+
+    @property
+    def max_size(self):
+        """Get maximum cache size."""
+        return self._size
+
+    @property
+    def stats(self):
+        """Get statistics of cache, None if they are disabled."""
+        return self._stats
 
     def __setitem__(self, key, value):
         """Put a value under given key in cache.
@@ -64,43 +168,123 @@ class LruCache(object):
         :param key: A key under which the value must be put in cache.
         :param value: A value to be put in cache.
         """
+        self.set(key, value)
+
+    def set(self, key, value, ttl=None):
+        """Put a value under given key in cache.
+
+        :param key: A key under which the value must be put in cache.
+        :param value: A value to be put in cache.
+        :param ttl: Time to live of the item in seconds. It equals to time
+        to live of cache by default.
+        """
+        weight = 0
+        if self._max_weight is not None:
+            weight = self._weigher(key, value)
+            if weight > self._max_weight:
+                # the item doesn't fit even in empty cache,
+                # so it is rejected and its previous value is dropped
+                if key in self._storage:
+                    self._remove_item(key)
+                return
+
+        if ttl is None:
+            ttl = self._ttl
+        expires = None
+        if ttl is not None or self._expiry is not None:
+            now = monotonic()
+            self._remove_expired(now)
+            if ttl is not None:
+                expires = now + ttl
+
         if key in self._storage:
             # if key is in cache
-            self._update_item(key, value)
+            self._update_item(key, value, expires, weight)
         else:
             # if key is not in cache
-            self._add_item(key, value)
+            self._add_item(key, value, expires, weight)
+
+        if expires is not None:
+            if self._expiry is None:
+                self._expiry = TimingWheel(EXPIRY_RESOLUTION)
+            self._expiry.schedule(key, expires)
+
+    def _remove_expired(self, now):
+        """Remove items which have expired by given time.
 
-    def _update_item(self, key, value):
+        :param now: Current time.
+        """
+        if self._expiry is not None:
+            expired = self._expiry.advance(now)
+            for key in expired:
+                self._remove_item(key)
+            if self._stats is not None:
+                self._stats.expirations += len(expired)
+
+    def _update_item(self, key, value, expires=None, weight=0):
         """Update a value in cache under given key.
 
         :param key: Key under which an item must be updated.
         :param value: New value to be put in cache.
+        :param expires: A time when the item expires.
+        :param weight: Weight of the item.
         """
         node = self._storage[key]
         node.object.value = value
+        if node.object.expires is not None and expires is None:
+            self._expiry.unschedule(key)
+        node.object.expires = expires
+        self._weight += weight - node.object.weight
+        node.object.weight = weight
         self._update_age(node)
+        # the updated item is the most recently used one now,
+        # so other items are evicted if it has become heavier
+        self._remove_overweight(0)
 
-    def _add_item(self, key, value):
+    def _add_item(self, key, value, expires=None, weight=0):
         """Add new value into cache under given key.
 
         :param key: Key under which a value will be added to cache.
         :param value: Value to be put in cache.
+        :param expires: A time when the item expires.
+        :param weight: Weight of the item.
         :return:
         """
-        if len(self._storage) >= self._size:
+        if self._size is not None and len(self._storage) >= self._size:
             # if overflow of capacity
             # find a key of least recently used item
             lru_item_key = self._find_lru_item_key()
             if lru_item_key is not None:
                 self._remove_item(lru_item_key)
+                if self._stats is not None:
+                    self._stats.evictions += 1
+        self._remove_overweight(weight)
 
         # create new cache object
-        cache_obj = CacheObj(age=None, key=key, value=value)
+        cache_obj = CacheObj(age=None, key=key, value=value, expires=expires,
+                             weight=weight)
         node = Node(cache_obj)
         self._set_age(node)
         # add new item to cache
         self._storage[key] = node
+        self._weight += weight
+        if self._stats is not None:
+            self._stats.inserts += 1
+
+    def _remove_overweight(self, weight):
+        """Remove least recently used items until an item fits in cache.
+
+        :param weight: Weight of an item to be added.
+        """
+        if self._max_weight is None:
+            return
+        while self._weight + weight > self._max_weight:
+            lru_item_key = self._find_lru_item_key()
+            if lru_item_key is None:
+                break
+            self._remove_item(lru_item_key)
+            if self._stats is not None:
+                self._stats.evictions += 1
 
     def _remove_item(self, key):
         """Remove a value from cache under given key.
@@ -111,6 +295,9 @@ class LruCache(object):
         del self._storage[key]
 
         self._items_sorted_by_age.remove(node)
+        self._weight -= node.object.weight
+        if node.object.expires is not None:
+            self._expiry.unschedule(key)
 
     def _update_age(self, node):
         """Update age of given cache object.
@@ -118,8 +305,10 @@ class LruCache(object):
         It sets the next available age to a given object.
         :param node: A node with cache object which age must be updated.
         """
-        self._items_sorted_by_age.remove(node)
-        self._set_age(node)
+        # it is the hot path of a hit, so calls are inlined
+        self._age_cnt += 1
+        node.object.age = self._age_cnt
+        self._items_sorted_by_age.move_to_end(node)
 
     def _set_age(self, node):
         """Set age of given cache object.
@@ -157,7 +346,16 @@ class LruCache(object):
         :return: True if cache has a value under given key,
         False otherwise.
         """
-        return key in self._storage
+        node = self._storage.get(key)
+        if node is None:
+            return False
+        expires = node.object.expires
+        if expires is not None and expires <= monotonic():
+            self._remove_item(key)
+            if self._stats is not None:
+                self._stats.expirations += 1
+            return False
+        return True
 
     def __getitem__(self, key):
         """Get a value under the given key from cache.
@@ -166,26 +364,179 @@ class LruCache(object):
         :raise KeyError: If there is no value in cache under the given key.
         :return: Value from cache.
         """
-        if key in self._storage:
-            node = self._storage[key]
-            self._update_age(node)
-            return node.object.value
+        value = self.get(key, _missing)
+        if value is _missing:
+            raise KeyError
+        return value
+
+    def get(self, key, default=None):
+        """Get a value under the given key from cache.
+
+        Unlike a check by 'in' followed by getting a value, an item can't
+        expire in between.
+        :param key: A key under which a result is needed.
+        :param default: A value returned if there is no value under the key.
+        :return: Value from cache or the default value.
+        """
+        node = self._storage.get(key)
+        if node is not None:
+            expires = node.object.expires
+            if expires is None or expires > monotonic():
+                self._update_age(node)
+                if self._stats is not None:
+                    self._stats.hits += 1
+                return node.object.value
+            self._remove_item(key)
+            if self._stats is not None:
+                self._stats.expirations += 1
+
+        if self._stats is not None:
+            self._stats.misses += 1
+        return default
+
+    def get_many(self, keys, default=None):
+        """Get values under given keys from cache.
+
+        :param keys: An iterable of keys.
+        :param default: A value returned for keys which are not in cache.
+        :return: A list of values in order of the keys.
+        """
+        get = self.get
+        return [get(key, default) for key in keys]
 
-        raise KeyError
+    def set_many(self, items, ttl=None):
+        """Put values under given keys in cache.
+
+        :param items: An iterable of tuples of (key, value). Items are put
+        in their order, so the last ones are kept if cache is too small.
+        :param ttl: Time to live of the items in seconds. It equals to time
+        to live of cache by default.
+        """
+        set_item = self.set
+        for key, value in items:
+            set_item(key, value, ttl)
+
+    def clear(self):
+        """Remove all items from cache and reset its statistics."""
+        self._storage.clear()
+        self._items_sorted_by_age = DoublyLinkedList()
+        self._weight = 0
+        self._expiry = None
+        if self._stats is not None:
+            self._stats.reset()
 
     def __len__(self):
-        """Get amount of values in cache."""
+        """Get amount of values in cache.
+
+        Expired items are counted until they are removed.
+        """
         return len(self._storage)
 
     def items(self):
         """Get generator that iterates over items in cache.
 
         Each returned variable is a tuple of (key, value). Items are returned
-        from least to most recently used.
+        from least to most recently used, expired items are skipped.
         :return: Generator.
         """
+        for cache_obj in self._iter_objects():
+            yield cache_obj.key, cache_obj.value
+
+    def _iter_objects(self, now=None):
+        """Get generator that iterates over cache objects.
+
+        Objects are returned from least to most recently used, expired
+        objects are skipped.
+        :param now: Current time. It is got if cache has expiring items.
+        :return: Generator.
+        """
+        if now is None and self._expiry is not None:
+            now = monotonic()
         node = self._items_sorted_by_age.first_node
         while node is not None:
             cache_obj = node.object
-            yield cache_obj.key, cache_obj.value
+            if cache_obj.expires is None or cache_obj.expires > now:
+                yield cache_obj
             node = node.next
+
+    def dump(self, path):
+        """Write items of cache to a file.
+
+        Items are written one by one from least to most recently used with
+        times of their expiration, so memory isn't allocated for a copy
+        of cache. Keys and values are pickled. The file is replaced
+        atomically, so a reader never sees a partially written snapshot.
+        If an item can't be pickled, the error is raised and the file is not
+        changed.
+        :param path: A path to a file.
+        """
+        now = monotonic()
+        # monotonic time of a process is meaningless for another one,
+        # so expiration is written as wall clock time
+        wall_clock_now = time.time()
+        tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+        try:
+            with open(tmp_path, 'wb') as snapshot_file:
+                snapshot_file.write(MAGIC)
+                pickler = pickle.Pickler(snapshot_file,
+                                         pickle.HIGHEST_PROTOCOL)
+                for cache_obj in self._iter_objects(now):
+                    expires = None
+                    if cache_obj.expires is not None:
+                        expires = wall_clock_now + cache_obj.expires - now
+                    pickler.dump((cache_obj.key, cache_obj.value, expires))
+                    # items are independent, so pickled objects needn't be
+                    # remembered
+                    pickler.clear_memo()
+            os.rename(tmp_path, path)
+        except BaseException:
+            # e.g. a value can't be pickled, a partial snapshot is dropped
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def load(self, path):
+        """Put items from a file written by 'dump' in cache.
+
+        Items are put as the most recently used ones in the order they have
+        been dumped, so order of recency of a dumped cache is restored.
+        If there are more items than cache holds, the least recently used
+        ones are evicted. Items which have expired in between are skipped,
+        others keep their time of expiration. Items are weighed again.
+        The file must be trusted, since it is unpickled.
+        :param path: A path to a file.
+        :raise ValueError: If the file is not a snapshot of cache.
+        """
+        now = time.time()
+        # collections of garbage triggered by millions of new objects
+        # take more time than loading itself, and they can't free loaded
+        # objects anyway, since all of them are referred by cache
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(path, 'rb') as snapshot_file:
+                if snapshot_file.read(len(MAGIC)) != MAGIC:
+                    raise ValueError(
+                        '{} is not a snapshot of cache'.format(path)
+                    )
+                unpickler = pickle.Unpickler(snapshot_file)
+                while True:
+                    try:
+                        key, value, expires = unpickler.load()
+                    except EOFError:
+                        break
+                    if expires is None:
+                        ttl = self._ttl
+                    else:
+                        ttl = expires - now
+                        if ttl <= 0:
+                            continue
+                    if ttl is None and self._max_weight is None and \
+                            key not in self._storage:
+                        # the item is appended to the recency list directly
+                        self._add_item(key, value)
+                    else:
+                        self.set(key, value, ttl)
+        finally:
+            if gc_enabled:
+                gc.enable()
@@ -1,6 +1,13 @@
 """Tests of LRU cache."""
+import os
+import shutil
+import tempfile
+import threading
 import unittest
 
+from mock import mock
+from six.moves import range
+
 from lru import LruCache
 
 
@@ -48,3 +55,326 @@ class TestLruCache(unittest.TestCase):
 
         with self.assertRaises(KeyError):
             cache['k1']
+
+    def test_get_and_set_many(self):
+        """Test putting and getting several items at once."""
+        cache = LruCache(3)
+
+        cache.set_many([('k1', 100), ('k2', 200), ('k3', 300), ('k4', 400)])
+        values = cache.get_many(['k3', 'k1', 'k2'], 'default')
+
+        self.assertListEqual(values, [300, 'default', 200])
+        self.assertListEqual(list(cache.items()), [
+            ('k4', 400), ('k3', 300), ('k2', 200),
+        ])
+
+
+@mock.patch('lru.cache.monotonic')
+class TestLruCacheTtl(unittest.TestCase):
+    """Tests of expiration of items of LRU cache."""
+
+    def test_cache_ttl(self, monotonic):
+        """Test that items expire after time to live of cache."""
+        cache = LruCache(3, ttl=10)
+
+        monotonic.return_value = 100.0
+        cache['k1'] = 100
+        monotonic.return_value = 105.0
+        cache['k2'] = 200
+
+        self.assertEqual(cache['k1'], 100)
+        monotonic.return_value = 110.0
+        self.assertNotIn('k1', cache)
+        self.assertEqual(cache.get('k2'), 200)
+        with self.assertRaises(KeyError):
+            cache['k1']
+        monotonic.return_value = 115.0
+        self.assertIsNone(cache.get('k2'))
+        self.assertEqual(len(cache), 0)
+
+    def test_item_ttl(self, monotonic):
+        """Test that an item expires after its own time to live."""
+        cache = LruCache(3, ttl=10)
+
+        monotonic.return_value = 100.0
+        cache.set('k1', 100, ttl=1)
+        cache['k2'] = 200
+        monotonic.return_value = 101.0
+
+        self.assertNotIn('k1', cache)
+        self.assertIn('k2', cache)
+
+    def test_no_ttl(self, monotonic):
+        """Test that items of cache without time to live never expire."""
+        cache = LruCache(3)
+
+        monotonic.return_value = 100.0
+        cache.set('k1', 100, ttl=1)
+        cache['k2'] = 200
+        monotonic.return_value = 1000.0
+
+        self.assertNotIn('k1', cache)
+        self.assertIn('k2', cache)
+
+    def test_update_resets_ttl(self, monotonic):
+        """Test that updating of an item restarts its time to live."""
+        cache = LruCache(3)
+
+        monotonic.return_value = 100.0
+        cache.set('k1', 100, ttl=10)
+        monotonic.return_value = 105.0
+        cache['k1'] = 300
+        monotonic.return_value = 1000.0
+
+        self.assertEqual(cache['k1'], 300)
+
+    def test_expired_items_are_removed(self, monotonic):
+        """Test that expired items are removed when new ones are put."""
+        cache = LruCache(100)
+
+        monotonic.return_value = 100.0
+        for idx in range(10):
+            cache.set(idx, idx, ttl=5)
+        monotonic.return_value = 106.0
+        self.assertListEqual(list(cache.items()), [])
+        cache['k1'] = 100
+
+        self.assertEqual(len(cache), 1)
+        self.assertListEqual(list(cache.items()), [('k1', 100)])
+
+
+class TestLruCacheWeight(unittest.TestCase):
+    """Tests of LRU cache limited by weight."""
+
+    def test_evict_until_fits(self):
+        """Test that least recently used items are evicted to fit an item."""
+        cache = LruCache(None, max_weight=10,
+                         weigher=lambda key, value: len(value))
+
+        cache['k1'] = 'aaaa'
+        cache['k2'] = 'bbb'
+        cache['k3'] = 'cc'
+        cache['k1']
+        cache['k4'] = 'dddd'
+
+        self.assertListEqual(list(cache.items()), [
+            ('k3', 'cc'), ('k1', 'aaaa'), ('k4', 'dddd')
+        ])
+        self.assertEqual(cache.weight, 10)
+
+    def test_update_heavier(self):
+        """Test that other items are evicted when an item gets heavier."""
+        cache = LruCache(None, max_weight=10,
+                         weigher=lambda key, value: len(value))
+
+        cache['k1'] = 'aaaa'
+        cache['k2'] = 'bbb'
+        cache['k1'] = 'aaaaaaaa'
+
+        self.assertListEqual(list(cache.items()), [('k1', 'aaaaaaaa')])
+        self.assertEqual(cache.weight, 8)
+
+    def test_reject_too_heavy(self):
+        """Test that an item heavier than cache is not put in it."""
+        cache = LruCache(None, max_weight=10,
+                         weigher=lambda key, value: len(value))
+
+        cache['k1'] = 'aaaa'
+        cache['k2'] = 'b' * 11
+        cache['k1'] = 'a' * 11
+
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.weight, 0)
+
+    def test_size_and_weight(self):
+        """Test that cache is limited both by amount and weight of items."""
+        cache = LruCache(2, max_weight=100,
+                         weigher=lambda key, value: len(value))
+
+        cache['k1'] = 'a'
+        cache['k2'] = 'b'
+        cache['k3'] = 'c'
+
+        self.assertListEqual(list(cache.items()), [('k2', 'b'), ('k3', 'c')])
+        self.assertEqual(cache.weight, 2)
+
+    def test_default_weigher(self):
+        """Test that items are weighed by their size by default."""
+        cache = LruCache(None, max_weight=10 * 1024)
+
+        cache['k1'] = 'a' * 1024
+        self.assertGreater(cache.weight, 1024)
+        cache['k2'] = 'b' * 20 * 1024
+
+        self.assertListEqual(list(cache.items()), [('k1', 'a' * 1024)])
+
+
+class TestLruCacheStats(unittest.TestCase):
+    """Tests of statistics of LRU cache."""
+
+    def test_counters(self):
+        """Test that operations of cache are counted."""
+        cache = LruCache(2, stats=True)
+
+        cache['k1'] = 1
+        cache['k2'] = 2
+        cache['k3'] = 3
+        cache.get('k1')
+        cache.get('k3')
+        self.assertEqual(cache['k2'], 2)
+
+        stats = cache.stats
+        self.assertEqual(stats.hits, 2)
+        self.assertEqual(stats.misses, 1)
+        self.assertEqual(stats.inserts, 3)
+        self.assertEqual(stats.evictions, 1)
+
+    @mock.patch('lru.cache.monotonic')
+    def test_expirations(self, monotonic):
+        """Test that expired items are counted."""
+        cache = LruCache(10, ttl=10, stats=True)
+
+        monotonic.return_value = 100.0
+        cache['k1'] = 1
+        cache['k2'] = 2
+        monotonic.return_value = 110.0
+
+        self.assertIsNone(cache.get('k1'))
+        self.assertNotIn('k2', cache)
+        self.assertEqual(cache.stats.expirations, 2)
+        self.assertEqual(cache.stats.misses, 1)
+
+    def test_clear(self):
+        """Test that items and statistics are removed."""
+        cache = LruCache(10, stats=True)
+        cache['k1'] = 1
+        cache.get('k1')
+
+        cache.clear()
+
+        self.assertEqual(len(cache), 0)
+        self.assertListEqual(list(cache.items()), [])
+        self.assertEqual(cache.stats.hits, 0)
+        self.assertEqual(cache.stats.inserts, 0)
+
+    def test_disabled(self):
+        """Test that statistics are not collected by default."""
+        self.assertIsNone(LruCache(10).stats)
+
+
+class TestLruCacheSnapshot(unittest.TestCase):
+    """Tests of snapshots of LRU cache."""
+
+    def setUp(self):
+        """Create a directory for snapshots."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.path = os.path.join(tmp_dir, 'cache.lru')
+
+    def test_dump_and_load(self):
+        """Test that items are restored in order of recency."""
+        cache = LruCache(3)
+        cache['k1'] = 100
+        cache['k2'] = [200]
+        cache[('k', 3)] = 300
+        cache.get('k1')
+
+        cache.dump(self.path)
+        restored = LruCache(3)
+        restored.load(self.path)
+
+        self.assertListEqual(list(restored.items()), [
+            ('k2', [200]), (('k', 3), 300), ('k1', 100),
+        ])
+        restored['k4'] = 400
+        self.assertNotIn('k2', restored)
+        self.assertEqual(os.listdir(os.path.dirname(self.path)),
+                         ['cache.lru'])
+
+    def test_dump_unpicklable(self):
+        """Test that a failed dump leaves neither snapshot nor its parts."""
+        cache = LruCache(3)
+        cache['k1'] = 100
+        cache['k2'] = threading.Lock()
+
+        with self.assertRaises(Exception):
+            cache.dump(self.path)
+
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), [])
+
+    def test_load_into_smaller_cache(self):
+        """Test that the most recently used items are kept."""
+        cache = LruCache(100)
+        for idx in range(100):
+            cache[idx] = idx
+
+        cache.dump(self.path)
+        restored = LruCache(10)
+        restored.load(self.path)
+
+        self.assertListEqual(list(restored.items()),
+                             [(idx, idx) for idx in range(90, 100)])
+
+    def test_load_existing_keys(self):
+        """Test that loaded items replace items of cache."""
+        cache = LruCache(3)
+        cache['k1'] = 100
+        cache.dump(self.path)
+
+        restored = LruCache(3)
+        restored['k1'] = 'old'
+        restored['k2'] = 200
+        restored.load(self.path)
+
+        self.assertEqual(len(restored), 2)
+        self.assertListEqual(list(restored.items()), [
+            ('k2', 200), ('k1', 100),
+        ])
+
+    @mock.patch('lru.cache.time.time')
+    @mock.patch('lru.cache.monotonic')
+    def test_expiration(self, monotonic, wall_clock):
+        """Test that items keep time of their expiration."""
+        cache = LruCache(3)
+        monotonic.return_value = 100.0
+        cache.set('k1', 100, ttl=10)
+        cache.set('k2', 200, ttl=60)
+        cache['k3'] = 300
+
+        wall_clock.return_value = 1000.0
+        cache.dump(self.path)
+        # the process is restarted
+        monotonic.return_value = 5.0
+        wall_clock.return_value = 1020.0
+        restored = LruCache(3)
+        restored.load(self.path)
+
+        self.assertListEqual(list(restored.items()), [
+            ('k2', 200), ('k3', 300),
+        ])
+        monotonic.return_value = 44.0
+        self.assertIn('k2', restored)
+        monotonic.return_value = 45.0
+        self.assertNotIn('k2', restored)
+
+    def test_weight(self):
+        """Test that loaded items are weighed."""
+        cache = LruCache(3)
+        cache['k1'] = 'aaaa'
+        cache['k2'] = 'bb'
+        cache.dump(self.path)
+
+        restored = LruCache(None, max_weight=5,
+                            weigher=lambda key, value: len(value))
+        restored.load(self.path)
+
+        self.assertListEqual(list(restored.items()), [('k2', 'bb')])
+        self.assertEqual(restored.weight, 2)
+
+    def test_load_not_snapshot(self):
+        """Test that a file of another format is rejected."""
+        with open(self.path, 'wb') as snapshot_file:
+            snapshot_file.write(b'something else')
+
+        with self.assertRaises(ValueError):
+            LruCache(3).load(self.path)
@@ -0,0 +1,204 @@
+"""Compact LRU cache implementation."""
+from array import array
+
+
+class CompactLruCache(object):
+    """LRU cache without objects per item.
+
+    It has the same interface as 'LruCache', but items are not wrapped into
+    nodes of a linked list. Every item occupies a slot: its key and value are
+    stored in lists and links of the recency list are stored in arrays of
+    integers at the index of the slot. The lists and the arrays are allocated
+    for all slots at once, and a slot of an evicted item is reused by a new
+    one, so nothing is allocated by puts except of a dictionary entry.
+    Usage example:
+
+    .. code-block:: python
+
+        >>> cache = CompactLruCache(2)
+        >>>
+        >>> cache['key1'] = 'value1'
+        >>> cache['key2'] = 'value2'
+        >>> cache['key3'] = 'value3'
+        >>>
+        >>> assert cache['key2'] == 'value2'
+        >>> assert cache['key3'] == 'value3'
+
+    """
+
+    __slots__ = ('_size', '_slots', '_keys', '_values', '_prev', '_next',
+                 '_used', '_first', '_last')
+
+    def __init__(self, cache_size):
+        """Initialize cache.
+
+        :param cache_size: Maximum cache size.
+        """
+        super(CompactLruCache, self).__init__()
+
+        self._size = cache_size
+        # slots of items by keys
+        self._slots = {}
+        self._allocate()
+
+    def _allocate(self):
+        """Allocate empty slots."""
+        # like 'LruCache', cache of size 0 keeps the last item
+        slots = max(self._size, 1)
+        self._keys = [None] * slots
+        self._values = [None] * slots
+        # links to previous and next slots in order of recency,
+        # -1 means no slot
+        self._prev = array('l', [-1]) * slots
+        self._next = array('l', [-1]) * slots
+        # amount of used slots, so the next one is free
+        self._used = 0
+        # slots of least and most recently used items
+        self._first = -1
+        self._last = -1
+
+    @property
+    def max_size(self):
+        """Get maximum cache size."""
+        return self._size
+
+    def _unlink(self, slot):
+        """Remove a slot from the recency list.
+
+        :param slot: A slot.
+        """
+        prev_slot, next_slot = self._prev[slot], self._next[slot]
+        if prev_slot == -1:
+            self._first = next_slot
+        else:
+            self._next[prev_slot] = next_slot
+        if next_slot == -1:
+            self._last = prev_slot
+        else:
+            self._prev[next_slot] = prev_slot
+
+    def _link_last(self, slot):
+        """Put a slot at the end of the recency list.
+
+        :param slot: A slot.
+        """
+        last = self._last
+        self._prev[slot] = last
+        self._next[slot] = -1
+        if last == -1:
+            self._first = slot
+        else:
+            self._next[last] = slot
+        self._last = slot
+
+    def _update_age(self, slot):
+        """Mark a slot as the most recently used one.
+
+        :param slot: A slot.
+        """
+        if slot != self._last:
+            self._unlink(slot)
+            self._link_last(slot)
+
+    def __setitem__(self, key, value):
+        """Put a value under given key in cache.
+
+        :param key: A key under which the value must be put in cache.
+        :param value: A value to be put in cache.
+        """
+        slot = self._slots.get(key)
+        if slot is not None:
+            # if key is in cache
+            self._values[slot] = value
+            self._update_age(slot)
+            return
+
+        if self._used < len(self._keys):
+            # take a free slot
+            slot = self._used
+            self._used += 1
+            self._keys[slot] = key
+            self._values[slot] = value
+            self._link_last(slot)
+        else:
+            # if overflow of capacity
+            # reuse the slot of least recently used item
+            slot = self._first
+            del self._slots[self._keys[slot]]
+            self._keys[slot] = key
+            self._values[slot] = value
+            self._update_age(slot)
+        self._slots[key] = slot
+
+    def __contains__(self, key):
+        """Has cache a value under given key or not.
+
+        :param key: A key to check.
+        :return: True if cache has a value under given key,
+        False otherwise.
+        """
+        return key in self._slots
+
+    def __getitem__(self, key):
+        """Get a value under the given key from cache.
+
+        :param key: A key under which a result is needed.
+        :raise KeyError: If there is no value in cache under the given key.
+        :return: Value from cache.
+        """
+        slot = self._slots[key]
+        self._update_age(slot)
+        return self._values[slot]
+
+    def get(self, key, default=None):
+        """Get a value under the given key from cache.
+
+        :param key: A key under which a result is needed.
+        :param default: A value returned if there is no value under the key.
+        :return: Value from cache or the default value.
+        """
+        slot = self._slots.get(key)
+        if slot is None:
+            return default
+        self._update_age(slot)
+        return self._values[slot]
+
+    def get_many(self, keys, default=None):
+        """Get values under given keys from cache.
+
+        :param keys: An iterable of keys.
+        :param default: A value returned for keys which are not in cache.
+        :return: A list of values in order of the keys.
+        """
+        get = self.get
+        return [get(key, default) for key in keys]
+
+    def set_many(self, items):
+        """Put values under given keys in cache.
+
+        :param items: An iterable of tuples of (key, value). Items are put
+        in their order, so the last ones are kept if cache is too small.
+        """
+        for key, value in items:
+            self[key] = value
+
+    def clear(self):
+        """Remove all items from cache."""
+        self._slots.clear()
+        self._allocate()
+
+    def __len__(self):
+        """Get amount of values in cache."""
+        return len(self._slots)
+
+    def items(self):
+        """Get generator that iterates over items in cache.
+
+        Each returned variable is a tuple of (key, value). Items are returned
+        from least to most recently used.
+        :return: Generator.
+        """
+        slot = self._first
+        while slot != -1:
+            yield self._keys[slot], self._values[slot]
+            slot = self._next[slot]
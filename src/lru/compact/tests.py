@@ -0,0 +1,109 @@
+"""Tests of compact LRU cache."""
+import random
+import unittest
+
+from six.moves import range
+
+from lru import CompactLruCache, LruCache
+
+
+class TestCompactLruCache(unittest.TestCase):
+    """Tests of compact LRU cache."""
+
+    def test_set_item(self):
+        """Test putting item in cache."""
+        cache = CompactLruCache(3)
+
+        cache['k1'] = 100
+        cache['k2'] = 200
+        cache['k3'] = 300
+        cache['k4'] = 400
+
+        self.assertEqual(len(cache), 3)
+        self.assertNotIn('k1', cache)
+        self.assertListEqual(list(cache.items()), [
+            ('k2', 200), ('k3', 300), ('k4', 400)
+        ])
+
+    def test_update_item(self):
+        """Test update item in cache."""
+        cache = CompactLruCache(3)
+
+        cache['k1'] = 100
+        cache['k2'] = 200
+        cache['k1'] = 300
+
+        self.assertEqual(len(cache), 2)
+        self.assertListEqual(list(cache.items()), [
+            ('k2', 200), ('k1', 300),
+        ])
+
+    def test_get_item(self):
+        """Test that getting item makes it the most recently used one."""
+        cache = CompactLruCache(3)
+
+        cache['k1'] = 100
+        cache['k2'] = 200
+        cache['k3'] = 300
+
+        self.assertEqual(cache['k1'], 100)
+        cache['k4'] = 400
+        self.assertListEqual(list(cache.items()), [
+            ('k3', 300), ('k1', 100), ('k4', 400)
+        ])
+
+    def test_get_non_existed_item(self):
+        """Test getting non-existed item from cache."""
+        cache = CompactLruCache(3)
+
+        with self.assertRaises(KeyError):
+            cache['k1']
+
+    def test_same_as_lru_cache(self):
+        """Test that random operations give the same result as LruCache."""
+        rnd = random.Random(0)
+        cache, expected = CompactLruCache(10), LruCache(10)
+
+        for idx in range(2000):
+            key = rnd.randrange(20)
+            if rnd.random() < 0.5:
+                cache[key] = expected[key] = idx
+            else:
+                self.assertEqual(key in cache, key in expected)
+                if key in expected:
+                    self.assertEqual(cache[key], expected[key])
+
+        self.assertListEqual(list(cache.items()), list(expected.items()))
+
+    def test_slots_are_preallocated(self):
+        """Test that arrays of slots are not resized by puts."""
+        cache = CompactLruCache(3)
+        addresses = (cache._prev.buffer_info(), cache._next.buffer_info())
+
+        for key in range(10):
+            cache[key] = key
+
+        self.assertTupleEqual(
+            (cache._prev.buffer_info(), cache._next.buffer_info()), addresses
+        )
+        self.assertListEqual(list(cache.items()), [(7, 7), (8, 8), (9, 9)])
+
+    def test_clear(self):
+        """Test that all items are removed and slots are reused."""
+        cache = CompactLruCache(2)
+        cache.set_many([('k1', 100), ('k2', 200)])
+
+        cache.clear()
+        cache.set_many([('k3', 300), ('k4', 400), ('k5', 500)])
+
+        self.assertEqual(len(cache), 2)
+        self.assertListEqual(list(cache.items()), [('k4', 400), ('k5', 500)])
+
+    def test_get_and_set_many(self):
+        """Test putting and getting several items at once."""
+        cache = CompactLruCache(3)
+
+        cache.set_many([('k1', 100), ('k2', 200), ('k3', 300), ('k4', 400)])
+
+        self.assertListEqual(cache.get_many(['k3', 'k1', 'k2'], 'default'),
+                             [300, 'default', 200])
@@ -0,0 +1,67 @@
+"""Contention tests of thread-safe LRU cache.
+
+Throughput of cache with a single lock is compared with throughput of
+sharded cache for different amounts of threads. Each thread mostly gets
+values and sometimes puts new ones.
+"""
+import random
+import threading
+import time
+
+from six.moves import range
+
+from lru import ShardedLruCache
+
+cache_size = 100000
+operations = 200000
+thread_counts = (1, 2, 4, 8, 16)
+shard_counts = (1, 16, 64)
+
+
+def run_worker(cache, keys):
+    """Get and put values of given keys.
+
+    :param cache: A cache.
+    :param keys: A list of keys.
+    """
+    get = cache.get
+    for idx, key in enumerate(keys):
+        if idx % 10 == 0:
+            cache[key] = key
+        else:
+            get(key)
+
+
+def measure_throughput(shards, threads_amount):
+    """Measure amount of operations per second.
+
+    :param shards: Amount of shards of cache.
+    :param threads_amount: Amount of threads.
+    :return: Amount of operations per second.
+    """
+    cache = ShardedLruCache(cache_size, shards)
+    for key in range(cache_size):
+        cache[key] = key
+
+    rnd = random.Random(0)
+    per_thread = operations // threads_amount
+    threads = [
+        threading.Thread(target=run_worker, args=(
+            cache,
+            [rnd.randrange(cache_size * 2) for _ in range(per_thread)],
+        ))
+        for _ in range(threads_amount)
+    ]
+    start_time = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return per_thread * threads_amount / (time.time() - start_time)
+
+
+for shards in shard_counts:
+    for threads_amount in thread_counts:
+        print('shards {shards}, threads {threads}: {throughput:.0f} ops/s'
+              .format(shards=shards, threads=threads_amount,
+                      throughput=measure_throughput(shards, threads_amount)))
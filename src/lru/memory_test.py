@@ -0,0 +1,29 @@
+"""Memory tests of LRU cache implementations.
+
+Memory occupied by cache is traced by 'tracemalloc' (Python 3), keys and
+values are allocated before, so only memory of cache itself is measured.
+"""
+import tracemalloc
+
+from six.moves import range
+
+from lru import CompactLruCache, LruCache
+
+cache_size = 1000000
+cache_classes = (LruCache, CompactLruCache)
+
+keys = [(idx, idx + 1) for idx in range(cache_size)]
+
+for cache_class in cache_classes:
+    tracemalloc.start()
+    cache = cache_class(cache_size)
+    for key in keys:
+        cache[key] = key
+    used_memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print('{name} ({size}): {memory:.1f} MiB, {per_item:.1f} bytes per item'
+          .format(name=cache_class.__name__, size=cache_size,
+                  memory=used_memory / 1024.0 ** 2,
+                  per_item=float(used_memory) / cache_size))
+    del cache
@@ -1,29 +1,84 @@
 """Performance tests of LRU cache implementation."""
+from timeit import default_timer
+
 from six.moves import range
 
-from lru import lru_cache
+from lru import CompactLruCache, LruCache, lru_cache
 from utils import timed
 
 cache_sizes = (1000, 10000, 100000, 1000000)
+cache_classes = (LruCache, CompactLruCache)
+
+for cache_class in cache_classes:
+    for size in cache_sizes:
+        title = '{} {}'.format(cache_class.__name__, size)
+
+        @lru_cache(size, cache_class=cache_class)
+        def test_func(p1, p2):
+            """Test cache."""
+            return p1 + p2
+
+        @timed(title)
+        def fill_cache():
+            """Fill empty cache."""
+            for idx in range(size):
+                test_func(idx, idx + 1)
+
+        fill_cache()
+
+        @timed(title)
+        def get_from_cache():
+            """Get all values from fully stocked cache."""
+            for idx in range(size):
+                test_func(idx, idx + 1)
 
-for size in cache_sizes:
-    @lru_cache(size)
-    def test_func(p1, p2):
+        get_from_cache()
+
+        @timed(title)
+        def replace_cache():
+            """Replace all values in fully stocked cache with the new ones."""
+            for idx in range(size):
+                test_func(idx + 1, idx)
+
+        replace_cache()
+
+# overhead of a hit compared with 'functools.lru_cache',
+# which is implemented in C since Python 3.5
+try:
+    from functools import lru_cache as functools_lru_cache
+except ImportError:  # python 2
+    functools_lru_cache = None
+
+decorators = [
+    ('LruCache', lru_cache(1000)),
+    ('CompactLruCache', lru_cache(1000, cache_class=CompactLruCache)),
+    ('LruCache typed', lru_cache(1000, typed=True)),
+]
+if functools_lru_cache is not None:
+    decorators.append(('functools.lru_cache', functools_lru_cache(1000)))
+calls = (
+    ('1 argument', [((idx,), {}) for idx in range(1000)]),
+    ('2 arguments', [((idx, idx), {}) for idx in range(1000)]),
+    ('keyword argument', [((idx,), {'p2': idx}) for idx in range(1000)]),
+)
+repeat = 100
+
+for name, decorator in decorators:
+    @decorator
+    def test_func(p1, p2=0):
         """Test cache."""
         return p1 + p2
 
-    @timed(size)
-    def fill_cache():
-        """Fill empty cache."""
-        for idx in range(size):
-            test_func(idx, idx + 1)
-
-    fill_cache()
+    for title, arguments in calls:
+        for args, kwargs in arguments:
+            test_func(*args, **kwargs)
 
-    @timed(size)
-    def replace_cache():
-        """Replace all values in fully stocked cache with the new ones."""
-        for idx in range(size):
-            test_func(idx + 1, idx)
+        start_time = default_timer()
+        for _ in range(repeat):
+            for args, kwargs in arguments:
+                test_func(*args, **kwargs)
+        duration = default_timer() - start_time
 
-    replace_cache()
+        print('hit ({} {}): {:.0f} ns'.format(
+            name, title, duration / repeat / len(arguments) * 1e9
+        ))
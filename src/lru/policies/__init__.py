@@ -0,0 +1,679 @@
+"""Eviction policies of cache.
+
+A policy decides which keys are evicted from cache, the cache itself stores
+values. Besides LRU there are policies which are resistant to scans, when
+many keys are accessed once and push frequently used keys out of LRU cache.
+"""
+from collections import OrderedDict
+
+from lru.structures.count_min_sketch import CountMinSketch
+
+
+def _move_to_end(ordered, key):
+    """Move a key to the end of an ordered dictionary.
+
+    :param ordered: An ordered dictionary.
+    :param key: A key in the dictionary.
+    """
+    ordered[key] = ordered.pop(key)
+
+
+def _pop_first(ordered):
+    """Remove and get the first key of an ordered dictionary.
+
+    :param ordered: An ordered dictionary.
+    :return: A key.
+    """
+    return ordered.popitem(last=False)[0]
+
+
+class EvictionPolicy(object):
+    """Base class of eviction policies.
+
+    A policy tracks keys of cache. Cache notifies it about hits and misses
+    and asks which keys to evict when a new key is inserted.
+    """
+
+    __slots__ = ('_capacity',)
+
+    def __init__(self, capacity):
+        """Initialize a policy.
+
+        :param capacity: Maximal amount of keys in cache.
+        """
+        super(EvictionPolicy, self).__init__()
+
+        self._capacity = max(capacity, 1)
+
+    @property
+    def capacity(self):
+        """Get maximal amount of keys in cache."""
+        return self._capacity
+
+    def on_hit(self, key):
+        """Record an access to a key which is in cache.
+
+        :param key: A key.
+        """
+        raise NotImplementedError
+
+    def on_miss(self, key):
+        """Record an access to a key which is not in cache.
+
+        :param key: A key.
+        """
+
+    def on_insert(self, key):
+        """Insert a key which is not in cache.
+
+        :param key: A key.
+        :return: A list of evicted keys. It contains the inserted key if the
+        policy doesn't admit it.
+        """
+        raise NotImplementedError
+
+    def on_remove(self, key):
+        """Remove a key which is in cache.
+
+        :param key: A key.
+        """
+        raise NotImplementedError
+
+    def __iter__(self):
+        """Iterate over keys in cache."""
+        raise NotImplementedError
+
+    def __len__(self):
+        """Get amount of keys in cache."""
+        raise NotImplementedError
+
+
+class LruPolicy(EvictionPolicy):
+    """Least recently used key is evicted."""
+
+    __slots__ = ('_keys',)
+
+    def __init__(self, capacity):
+        """Initialize a policy.
+
+        :param capacity: Maximal amount of keys in cache.
+        """
+        super(LruPolicy, self).__init__(capacity)
+
+        self._keys = OrderedDict()
+
+    def on_hit(self, key):
+        """Record an access to a key which is in cache.
+
+        :param key: A key.
+        """
+        _move_to_end(self._keys, key)
+
+    def on_insert(self, key):
+        """Insert a key which is not in cache.
+
+        :param key: A key.
+        :return: A list of evicted keys.
+        """
+        evicted = []
+        if len(self._keys) >= self._capacity:
+            evicted.append(_pop_first(self._keys))
+        self._keys[key] = None
+        return evicted
+
+    def on_remove(self, key):
+        """Remove a key which is in cache.
+
+        :param key: A key.
+        """
+        del self._keys[key]
+
+    def __contains__(self, key):
+        """Is a key in cache or not.
+
+        :param key: A key to check.
+        :return: True if the key is in cache, False otherwise.
+        """
+        return key in self._keys
+
+    def __iter__(self):
+        """Iterate over keys from least to most recently used."""
+        return iter(self._keys)
+
+    def __len__(self):
+        """Get amount of keys in cache."""
+        return len(self._keys)
+
+
+class SlruPolicy(EvictionPolicy):
+    """Segmented LRU.
+
+    New keys get into a probationary segment and keys accessed again are
+    promoted to a protected segment. Keys are evicted from the probationary
+    segment, so keys accessed once, e.g. by a scan, can't push out keys
+    accessed several times.
+    """
+
+    __slots__ = ('_probation', '_protected', '_protected_capacity')
+
+    def __init__(self, capacity, protected_ratio=0.8):
+        """Initialize a policy.
+
+        :param capacity: Maximal amount of keys in cache.
+        :param protected_ratio: A share of the protected segment.
+        """
+        super(SlruPolicy, self).__init__(capacity)
+
+        self._probation = OrderedDict()
+        self._protected = OrderedDict()
+        self._protected_capacity = int(self._capacity * protected_ratio)
+
+    def on_hit(self, key):
+        """Record an access to a key which is in cache.
+
+        :param key: A key.
+        """
+        if key in self._protected:
+            _move_to_end(self._protected, key)
+            return
+
+        del self._probation[key]
+        self._protected[key] = None
+        if len(self._protected) > self._protected_capacity:
+            # the least recently used protected key gets another chance
+            self._probation[_pop_first(self._protected)] = None
+
+    def get_victim(self):
+        """Get a key which would be evicted next.
+
+        :return: A key or None if there are no keys.
+        """
+        for segment in (self._probation, self._protected):
+            for key in segment:
+                return key
+        return None
+
+    def on_insert(self, key):
+        """Insert a key which is not in cache.
+
+        :param key: A key.
+        :return: A list of evicted keys.
+        """
+        evicted = []
+        if len(self) >= self._capacity:
+            victim = self.get_victim()
+            self.on_remove(victim)
+            evicted.append(victim)
+        self._probation[key] = None
+        return evicted
+
+    def on_remove(self, key):
+        """Remove a key which is in cache.
+
+        :param key: A key.
+        """
+        if key in self._probation:
+            del self._probation[key]
+        else:
+            del self._protected[key]
+
+    def __iter__(self):
+        """Iterate over probationary and then protected keys."""
+        for segment in (self._probation, self._protected):
+            for key in segment:
+                yield key
+
+    def __len__(self):
+        """Get amount of keys in cache."""
+        return len(self._probation) + len(self._protected)
+
+
+class TwoQueuePolicy(EvictionPolicy):
+    """2Q (http://www.vldb.org/conf/1994/P439.PDF).
+
+    New keys get into a FIFO queue. Keys evicted from it are remembered in
+    a queue of ghost keys without values, and keys inserted again while they
+    are remembered get into the main LRU queue. So only keys which are
+    accessed repeatedly over a longer period get into the main queue.
+    """
+
+    __slots__ = ('_in', '_out', '_main', '_in_capacity', '_out_capacity')
+
+    def __init__(self, capacity, in_ratio=0.25, out_ratio=0.5):
+        """Initialize a policy.
+
+        :param capacity: Maximal amount of keys in cache.
+        :param in_ratio: A share of the FIFO queue of new keys.
+        :param out_ratio: Amount of ghost keys relative to the capacity.
+        """
+        super(TwoQueuePolicy, self).__init__(capacity)
+
+        self._in = OrderedDict()
+        self._out = OrderedDict()
+        self._main = OrderedDict()
+        self._in_capacity = max(int(self._capacity * in_ratio), 1)
+        self._out_capacity = max(int(self._capacity * out_ratio), 1)
+
+    def on_hit(self, key):
+        """Record an access to a key which is in cache.
+
+        :param key: A key.
+        """
+        # an access to a key of the FIFO queue is considered correlated
+        # with the first one, so it doesn't change its position
+        if key in self._main:
+            _move_to_end(self._main, key)
+
+    def on_insert(self, key):
+        """Insert a key which is not in cache.
+
+        :param key: A key.
+        :return: A list of evicted keys.
+        """
+        if key in self._out:
+            del self._out[key]
+            self._main[key] = None
+        else:
+            self._in[key] = None
+
+        evicted = []
+        while len(self) > self._capacity:
+            if len(self._in) > self._in_capacity or not self._main:
+                old_key = _pop_first(self._in)
+                self._out[old_key] = None
+                if len(self._out) > self._out_capacity:
+                    _pop_first(self._out)
+            else:
+                old_key = _pop_first(self._main)
+            evicted.append(old_key)
+        return evicted
+
+    def on_remove(self, key):
+        """Remove a key which is in cache.
+
+        :param key: A key.
+        """
+        if key in self._in:
+            del self._in[key]
+        else:
+            del self._main[key]
+
+    def __iter__(self):
+        """Iterate over keys of the FIFO queue and then of the main one."""
+        for queue in (self._in, self._main):
+            for key in queue:
+                yield key
+
+    def __len__(self):
+        """Get amount of keys in cache."""
+        return len(self._in) + len(self._main)
+
+
+class ArcPolicy(EvictionPolicy):
+    """Adaptive replacement cache.
+
+    It is described in "ARC: A Self-Tuning, Low Overhead Replacement Cache"
+    by N. Megiddo and D. S. Modha. Keys accessed once and keys accessed at
+    least twice are kept in two LRU lists, and recently evicted keys of both
+    lists are remembered as ghosts. A hit of a ghost shifts the target size
+    of the lists in its favour, so the policy adapts between recency and
+    frequency.
+    """
+
+    __slots__ = ('_t1', '_t2', '_b1', '_b2', '_target')
+
+    def __init__(self, capacity):
+        """Initialize a policy.
+
+        :param capacity: Maximal amount of keys in cache.
+        """
+        super(ArcPolicy, self).__init__(capacity)
+
+        # keys accessed once and at least twice
+        self._t1 = OrderedDict()
+        self._t2 = OrderedDict()
+        # ghosts of keys evicted from the lists above
+        self._b1 = OrderedDict()
+        self._b2 = OrderedDict()
+        # target size of the list of keys accessed once
+        self._target = 0.0
+
+    def on_hit(self, key):
+        """Record an access to a key which is in cache.
+
+        :param key: A key.
+        """
+        if key in self._t1:
+            del self._t1[key]
+        else:
+            del self._t2[key]
+        self._t2[key] = None
+
+    def _replace(self, key, evicted):
+        """Evict a key from one of the lists into its ghost list.
+
+        :param key: A key being inserted.
+        :param evicted: A list of evicted keys to be extended.
+        """
+        t1_size = len(self._t1)
+        if t1_size and (t1_size > self._target or
+                        (key in self._b2 and t1_size == self._target)):
+            old_key = _pop_first(self._t1)
+            self._b1[old_key] = None
+        else:
+            old_key = _pop_first(self._t2)
+            self._b2[old_key] = None
+        evicted.append(old_key)
+
+    def on_insert(self, key):
+        """Insert a key which is not in cache.
+
+        :param key: A key.
+        :return: A list of evicted keys.
+        """
+        capacity = self._capacity
+        evicted = []
+        is_full = len(self) >= capacity
+
+        if key in self._b1:
+            self._target = min(
+                capacity,
+                self._target + max(len(self._b2) / float(len(self._b1)), 1)
+            )
+            if is_full:
+                self._replace(key, evicted)
+            del self._b1[key]
+            self._t2[key] = None
+            return evicted
+
+        if key in self._b2:
+            self._target = max(
+                0.0,
+                self._target - max(len(self._b1) / float(len(self._b2)), 1)
+            )
+            if is_full:
+                self._replace(key, evicted)
+            del self._b2[key]
+            self._t2[key] = None
+            return evicted
+
+        l1_size = len(self._t1) + len(self._b1)
+        if l1_size >= capacity:
+            if len(self._t1) < capacity:
+                _pop_first(self._b1)
+                if is_full:
+                    self._replace(key, evicted)
+            else:
+                evicted.append(_pop_first(self._t1))
+        else:
+            total = l1_size + len(self._t2) + len(self._b2)
+            if total >= 2 * capacity:
+                _pop_first(self._b2)
+            if is_full:
+                self._replace(key, evicted)
+        self._t1[key] = None
+        return evicted
+
+    def on_remove(self, key):
+        """Remove a key which is in cache.
+
+        :param key: A key.
+        """
+        if key in self._t1:
+            del self._t1[key]
+        else:
+            del self._t2[key]
+
+    def __iter__(self):
+        """Iterate over keys accessed once and then over other keys."""
+        for keys in (self._t1, self._t2):
+            for key in keys:
+                yield key
+
+    def __len__(self):
+        """Get amount of keys in cache."""
+        return len(self._t1) + len(self._t2)
+
+
+class TinyLfuPolicy(EvictionPolicy):
+    """W-TinyLFU (https://arxiv.org/abs/1512.00727).
+
+    New keys get into a small LRU window. A key evicted from the window is
+    a candidate for the main segmented LRU. It is admitted only if its
+    frequency, estimated by a count-min sketch of recent accesses, is higher
+    than frequency of a key which the main segment would evict. So rarely
+    accessed keys, e.g. of scans, don't push frequently accessed ones out.
+    Frequencies are counted on hits and misses of lookups.
+    """
+
+    __slots__ = ('_window', '_main', '_sketch')
+
+    def __init__(self, capacity, window_ratio=0.01):
+        """Initialize a policy.
+
+        :param capacity: Maximal amount of keys in cache.
+        :param window_ratio: A share of the LRU window.
+        """
+        super(TinyLfuPolicy, self).__init__(capacity)
+
+        window_capacity = max(int(self._capacity * window_ratio), 1)
+        self._window = LruPolicy(window_capacity)
+        self._main = SlruPolicy(self._capacity - window_capacity) \
+            if self._capacity > window_capacity else None
+        # a wider sketch has less collisions of rarely used keys with
+        # frequently used ones, aging period follows the paper
+        self._sketch = CountMinSketch(
+            4 * self._capacity, sample_size=10 * self._capacity
+        )
+
+    def on_hit(self, key):
+        """Record an access to a key which is in cache.
+
+        :param key: A key.
+        """
+        self._sketch.add(key)
+        if key in self._window:
+            self._window.on_hit(key)
+        else:
+            self._main.on_hit(key)
+
+    def on_miss(self, key):
+        """Record an access to a key which is not in cache.
+
+        :param key: A key.
+        """
+        self._sketch.add(key)
+
+    def on_insert(self, key):
+        """Insert a key which is not in cache.
+
+        :param key: A key.
+        :return: A list of evicted keys.
+        """
+        candidates = self._window.on_insert(key)
+        if not candidates or self._main is None:
+            return candidates
+
+        candidate = candidates[0]
+        main = self._main
+        if len(main) < main.capacity:
+            main.on_insert(candidate)
+            return []
+
+        victim = main.get_victim()
+        if self._sketch.estimate(candidate) > self._sketch.estimate(victim):
+            main.on_remove(victim)
+            main.on_insert(candidate)
+            return [victim]
+        return [candidate]
+
+    def on_remove(self, key):
+        """Remove a key which is in cache.
+
+        :param key: A key.
+        """
+        if key in self._window:
+            self._window.on_remove(key)
+        else:
+            self._main.on_remove(key)
+
+    def __iter__(self):
+        """Iterate over keys of the main segment and then of the window."""
+        if self._main is not None:
+            for key in self._main:
+                yield key
+        for key in self._window:
+            yield key
+
+    def __len__(self):
+        """Get amount of keys in cache."""
+        return len(self._window) + (len(self._main) if self._main else 0)
+
+
+POLICIES = {
+    'lru': LruPolicy,
+    'slru': SlruPolicy,
+    '2q': TwoQueuePolicy,
+    'arc': ArcPolicy,
+    'tinylfu': TinyLfuPolicy,
+}
+
+# a marker of absence of a value in cache
+_missing = object()
+
+
+class PolicyCache(object):
+    """Cache with a pluggable eviction policy.
+
+    It has the same interface as 'LruCache'.
+    Usage example:
+
+    .. code-block:: python
+
+        >>> cache = PolicyCache(1000, policy='tinylfu')
+        >>>
+        >>> cache['key1'] = 'value1'
+        >>>
+        >>> assert cache['key1'] == 'value1'
+
+    """
+
+    __slots__ = ('_storage', '_policy', '_policy_class', '_size')
+
+    def __init__(self, cache_size, policy='lru'):
+        """Initialize cache.
+
+        :param cache_size: Maximum cache size.
+        :param policy: A name of a policy from 'POLICIES' or a subclass of
+        'EvictionPolicy'.
+        :raise ValueError: If there is no policy with given name.
+        """
+        super(PolicyCache, self).__init__()
+
+        if not isinstance(policy, type):
+            try:
+                policy = POLICIES[policy]
+            except KeyError:
+                raise ValueError('Unknown eviction policy {}'.format(policy))
+        self._policy_class = policy
+        self._size = cache_size
+        self._policy = policy(cache_size)
+        self._storage = {}
+
+    @property
+    def max_size(self):
+        """Get maximum cache size."""
+        return self._size
+
+    def clear(self):
+        """Remove all items from cache and forget history of the policy."""
+        self._storage.clear()
+        self._policy = self._policy_class(self._size)
+
+    def __setitem__(self, key, value):
+        """Put a value under given key in cache.
+
+        The value is not put if the policy doesn't admit the key.
+        :param key: A key under which the value must be put in cache.
+        :param value: A value to be put in cache.
+        """
+        storage = self._storage
+        if key in storage:
+            storage[key] = value
+            self._policy.on_hit(key)
+            return
+
+        for evicted_key in self._policy.on_insert(key):
+            if evicted_key == key:
+                return
+            del storage[evicted_key]
+        storage[key] = value
+
+    def __contains__(self, key):
+        """Has cache a value under given key or not.
+
+        :param key: A key to check.
+        :return: True if cache has a value under given key,
+        False otherwise.
+        """
+        return key in self._storage
+
+    def __getitem__(self, key):
+        """Get a value under the given key from cache.
+
+        :param key: A key under which a result is needed.
+        :raise KeyError: If there is no value in cache under the given key.
+        :return: Value from cache.
+        """
+        value = self.get(key, _missing)
+        if value is _missing:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        """Get a value under the given key from cache.
+
+        :param key: A key under which a result is needed.
+        :param default: A value returned if there is no value under the key.
+        :return: Value from cache or the default value.
+        """
+        value = self._storage.get(key, _missing)
+        if value is _missing:
+            self._policy.on_miss(key)
+            return default
+        self._policy.on_hit(key)
+        return value
+
+    def get_many(self, keys, default=None):
+        """Get values under given keys from cache.
+
+        :param keys: An iterable of keys.
+        :param default: A value returned for keys which are not in cache.
+        :return: A list of values in order of the keys.
+        """
+        get = self.get
+        return [get(key, default) for key in keys]
+
+    def set_many(self, items):
+        """Put values under given keys in cache.
+
+        :param items: An iterable of tuples of (key, value). Items are put
+        in their order, so the last ones are kept if cache is too small.
+        """
+        for key, value in items:
+            self[key] = value
+
+    def __len__(self):
+        """Get amount of values in cache."""
+        return len(self._storage)
+
+    def items(self):
+        """Get generator that iterates over items in cache.
+
+        Each returned variable is a tuple of (key, value) in order of the
+        policy, e.g. from least to most recently used for LRU.
+        :return: Generator.
+        """
+        storage = self._storage
+        for key in self._policy:
+            yield key, storage[key]
@@ -0,0 +1,98 @@
+"""Tests of eviction policies."""
+import random
+import unittest
+
+from six.moves import range
+
+from lru import LruCache, PolicyCache
+from lru.policies import POLICIES, LruPolicy
+
+
+class TestPolicyCache(unittest.TestCase):
+    """Tests of cache with eviction policies."""
+
+    def run_random_workload(self, cache):
+        """Put and get random keys.
+
+        :param cache: A cache.
+        """
+        rnd = random.Random(0)
+        for idx in range(5000):
+            key = int(rnd.paretovariate(1.0)) % 100
+            if cache.get(key) is None:
+                cache[key] = idx
+
+    def test_capacity_and_consistency(self):
+        """Test that every policy keeps cache within its size."""
+        for name in POLICIES:
+            cache = PolicyCache(20, policy=name)
+
+            self.run_random_workload(cache)
+
+            self.assertLessEqual(len(cache), 20, name)
+            self.assertEqual(len(list(cache.items())), len(cache), name)
+
+    def test_lru_same_as_lru_cache(self):
+        """Test that LRU policy evicts the same keys as LruCache."""
+        cache, expected = PolicyCache(10), LruCache(10)
+
+        self.run_random_workload(cache)
+        self.run_random_workload(expected)
+
+        self.assertListEqual(list(cache.items()), list(expected.items()))
+
+    def test_scan_resistance(self):
+        """Test that frequently used keys survive a scan."""
+        for name in ('slru', '2q', 'arc', 'tinylfu'):
+            cache = PolicyCache(100, policy=name)
+            hot_keys = list(range(10))
+            scan_keys = iter(range(1000, 2000))
+            # hot keys are accessed between scans of new keys
+            for _ in range(10):
+                for key in hot_keys:
+                    if cache.get(key) is None:
+                        cache[key] = key
+                for _, key in zip(range(50), scan_keys):
+                    if cache.get(key) is None:
+                        cache[key] = key
+
+            for key in hot_keys:
+                self.assertIn(key, cache, name)
+
+    def test_lru_is_not_scan_resistant(self):
+        """Test that a scan pushes all keys out of LRU cache."""
+        cache = PolicyCache(100, policy='lru')
+        for key in range(10):
+            cache[key] = key
+            cache[key]
+        for key in range(1000, 1500):
+            cache[key] = key
+
+        self.assertNotIn(0, cache)
+
+    def test_get_and_update(self):
+        """Test getting and updating of values."""
+        cache = PolicyCache(10, policy='arc')
+
+        cache['k1'] = 100
+        cache['k1'] = 200
+
+        self.assertEqual(cache['k1'], 200)
+        self.assertEqual(cache.get('k2', 'default'), 'default')
+        with self.assertRaises(KeyError):
+            cache['k2']
+
+    def test_policy_class(self):
+        """Test that a class of a policy is accepted."""
+        cache = PolicyCache(2, policy=LruPolicy)
+
+        cache['k1'] = 100
+        cache['k2'] = 200
+        cache['k3'] = 300
+
+        self.assertListEqual(list(cache.items()), [('k2', 200), ('k3', 300)])
+
+    def test_unknown_policy(self):
+        """Test that an unknown name of a policy is rejected."""
+        with self.assertRaises(ValueError):
+            PolicyCache(10, policy='mru')
@@ -0,0 +1,98 @@
+"""Simulation of hit ratios of eviction policies.
+
+Every policy serves the same sequences of requests: keys with Zipf
+distribution of popularity, the same keys interrupted by scans of keys
+which are requested once, and a loop over a few more keys than cache holds.
+"""
+import bisect
+import random
+import time
+
+from six.moves import range
+
+from lru import PolicyCache
+from lru.policies import POLICIES
+
+cache_size = 1000
+keys_amount = 50000
+requests_amount = 200000
+
+
+def generate_zipf(rnd, amount, alpha=0.9):
+    """Generate keys with Zipf distribution of popularity.
+
+    :param rnd: A random generator.
+    :param amount: Amount of keys.
+    :param alpha: Skew of the distribution.
+    :return: Generator of keys.
+    """
+    cumulative = []
+    total = 0.0
+    for rank in range(1, keys_amount + 1):
+        total += 1.0 / (rank ** alpha)
+        cumulative.append(total)
+    for _ in range(amount):
+        yield bisect.bisect_left(cumulative, rnd.random() * total)
+
+
+def generate_scans(rnd, amount, scan_size=5000, period=20000):
+    """Generate Zipf keys interrupted by scans of unique keys.
+
+    :param rnd: A random generator.
+    :param amount: Amount of keys.
+    :param scan_size: Amount of keys of a scan.
+    :param period: Amount of Zipf keys between scans.
+    :return: Generator of keys.
+    """
+    unique_key = keys_amount
+    for idx, key in enumerate(generate_zipf(rnd, amount - amount // 5)):
+        yield key
+        if idx % period == period - 1:
+            for _ in range(scan_size):
+                unique_key += 1
+                yield unique_key
+
+
+def generate_loop(rnd, amount):
+    """Generate keys of a loop over slightly more keys than cache holds.
+
+    :param rnd: A random generator.
+    :param amount: Amount of keys.
+    :return: Generator of keys.
+    """
+    loop_size = cache_size + cache_size // 10
+    for idx in range(amount):
+        yield idx % loop_size
+
+
+def simulate(policy, requests):
+    """Get a hit ratio of a policy.
+
+    :param policy: A name of a policy.
+    :param requests: A list of keys.
+    :return: A tuple of a hit ratio and duration in seconds.
+    """
+    cache = PolicyCache(cache_size, policy=policy)
+    hits = 0
+    start_time = time.time()
+    for key in requests:
+        if cache.get(key) is None:
+            cache[key] = key
+        else:
+            hits += 1
+    return float(hits) / len(requests), time.time() - start_time
+
+
+workloads = (
+    ('zipf', generate_zipf),
+    ('zipf with scans', generate_scans),
+    ('loop', generate_loop),
+)
+
+for title, generate in workloads:
+    requests = list(generate(random.Random(0), requests_amount))
+    for policy in sorted(POLICIES):
+        hit_ratio, duration = simulate(policy, requests)
+        print('{title}, {policy}: hit ratio {hit_ratio:.3f} ({duration:.2f} s)'
+              .format(title=title, policy=policy, hit_ratio=hit_ratio,
+                      duration=duration))
@@ -0,0 +1,231 @@
+"""Thread-safe LRU cache split into independently locked shards."""
+from threading import Lock
+
+import six
+from six.moves import range
+
+from lru.cache import LruCache
+from lru.stats import CacheStats
+
+
+def _split(total, parts):
+    """Split a limit between parts.
+
+    :param total: A limit, None if there is no limit.
+    :param parts: Amount of parts.
+    :return: A list of limits of parts which sum equals to the limit.
+    """
+    if total is None:
+        return [None] * parts
+    if not isinstance(total, six.integer_types):
+        return [total / float(parts)] * parts
+    return [total // parts + (idx < total % parts) for idx in range(parts)]
+
+
+class ShardedLruCache(object):
+    """Thread-safe LRU cache.
+
+    Keys are distributed over a few LRU caches (shards) by their hashes.
+    Every shard has its own lock, so threads which access different shards
+    don't wait for each other. Each shard evicts its own least recently used
+    item, so eviction order is LRU within a shard, and approximately LRU for
+    the whole cache.
+    Usage example:
+
+    .. code-block:: python
+
+        >>> cache = ShardedLruCache(1000, shards=16)
+        >>>
+        >>> cache['key1'] = 'value1'
+        >>>
+        >>> assert cache['key1'] == 'value1'
+        >>> assert cache.get('key2') is None
+
+    """
+
+    __slots__ = ('_shards', '_locks')
+
+    def __init__(self, cache_size, shards=16, cache_class=LruCache,
+                 **options):
+        """Initialize cache.
+
+        :param cache_size: Maximum cache size. It is divided between shards.
+        It can be None if cache is limited by weight only.
+        :param shards: Amount of shards. It is reduced to the cache size if
+        the latter is smaller, so every shard holds at least one item.
+        :param cache_class: A class of cache of a shard.
+        :param options: Keyword arguments of the class of cache, e.g. 'ttl'.
+        Maximum weight is divided between shards too, so an item heavier than
+        a share of a shard is not cached.
+        """
+        super(ShardedLruCache, self).__init__()
+
+        if cache_size is not None:
+            shards = min(shards, cache_size)
+        shards = max(shards, 1)
+        sizes = _split(cache_size, shards)
+        weights = _split(options.pop('max_weight', None), shards)
+        self._shards = []
+        for size, weight in zip(sizes, weights):
+            if weight is not None:
+                options['max_weight'] = weight
+            self._shards.append(cache_class(size, **options))
+        self._locks = [Lock() for _ in range(shards)]
+
+    @property
+    def max_size(self):
+        """Get maximum cache size."""
+        sizes = [shard.max_size for shard in self._shards]
+        return None if None in sizes else sum(sizes)
+
+    @property
+    def stats(self):
+        """Get statistics summed over shards, None if they are disabled."""
+        if getattr(self._shards[0], 'stats', None) is None:
+            return None
+        return CacheStats.combine(shard.stats for shard in self._shards)
+
+    def _get_shard(self, key):
+        """Get a shard of given key and its lock.
+
+        :param key: A key.
+        :return: A tuple of a cache and a lock.
+        """
+        idx = hash(key) % len(self._shards)
+        return self._shards[idx], self._locks[idx]
+
+    def __setitem__(self, key, value):
+        """Put a value under given key in cache.
+
+        :param key: A key under which the value must be put in cache.
+        :param value: A value to be put in cache.
+        """
+        shard, lock = self._get_shard(key)
+        with lock:
+            shard[key] = value
+
+    def set(self, key, value, ttl=None):
+        """Put a value under given key in cache.
+
+        :param key: A key under which the value must be put in cache.
+        :param value: A value to be put in cache.
+        :param ttl: Time to live of the item in seconds. It is supported if
+        the class of cache supports it.
+        """
+        shard, lock = self._get_shard(key)
+        with lock:
+            if ttl is None:
+                # classes of cache without time to live have no 'set'
+                shard[key] = value
+            else:
+                shard.set(key, value, ttl)
+
+    def __contains__(self, key):
+        """Has cache a value under given key or not.
+
+        :param key: A key to check.
+        :return: True if cache has a value under given key,
+        False otherwise.
+        """
+        shard, lock = self._get_shard(key)
+        with lock:
+            return key in shard
+
+    def __getitem__(self, key):
+        """Get a value under the given key from cache.
+
+        :param key: A key under which a result is needed.
+        :raise KeyError: If there is no value in cache under the given key.
+        :return: Value from cache.
+        """
+        shard, lock = self._get_shard(key)
+        with lock:
+            return shard[key]
+
+    def get(self, key, default=None):
+        """Get a value under the given key from cache.
+
+        Unlike a check by 'in' followed by getting a value, it is atomic, so
+        the value can't be evicted by another thread in between.
+        :param key: A key under which a result is needed.
+        :param default: A value returned if there is no value under the key.
+        :return: Value from cache or the default value.
+        """
+        shard, lock = self._get_shard(key)
+        with lock:
+            return shard.get(key, default)
+
+    def _group_by_shard(self, keys):
+        """Group positions of keys by shards of the keys.
+
+        :param keys: A list of keys.
+        :return: A dictionary of lists of positions by indices of shards.
+        """
+        groups = {}
+        shards_amount = len(self._shards)
+        for position, key in enumerate(keys):
+            groups.setdefault(hash(key) % shards_amount, []).append(position)
+        return groups
+
+    def get_many(self, keys, default=None):
+        """Get values under given keys from cache.
+
+        Keys are grouped by shards, so every shard is locked once.
+        :param keys: An iterable of keys.
+        :param default: A value returned for keys which are not in cache.
+        :return: A list of values in order of the keys.
+        """
+        keys = list(keys)
+        values = [default] * len(keys)
+        for idx, positions in self._group_by_shard(keys).items():
+            shard = self._shards[idx]
+            with self._locks[idx]:
+                for position in positions:
+                    values[position] = shard.get(keys[position], default)
+        return values
+
+    def set_many(self, items, ttl=None):
+        """Put values under given keys in cache.
+
+        Items are grouped by shards, so every shard is locked once.
+        :param items: An iterable of tuples of (key, value). Items of
+        a shard are put in their order.
+        :param ttl: Time to live of the items in seconds. It is supported if
+        the class of cache supports it.
+        """
+        items = list(items)
+        groups = self._group_by_shard([key for key, _ in items])
+        for idx, positions in groups.items():
+            shard = self._shards[idx]
+            with self._locks[idx]:
+                for position in positions:
+                    key, value = items[position]
+                    if ttl is None:
+                        shard[key] = value
+                    else:
+                        shard.set(key, value, ttl)
+
+    def clear(self):
+        """Remove all items from cache."""
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
+
+    def __len__(self):
+        """Get amount of values in cache."""
+        return sum(len(shard) for shard in self._shards)
+
+    def items(self):
+        """Get generator that iterates over items in cache.
+
+        Each returned variable is a tuple of (key, value). Items of each
+        shard are returned from least to most recently used, shard by shard.
+        Every shard is copied under its lock, so the generator can be used
+        while other threads change the cache.
+        :return: Generator.
+        """
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                items = list(shard.items())
+            for item in items:
+                yield item
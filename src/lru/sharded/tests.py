@@ -0,0 +1,141 @@
+"""Tests of thread-safe sharded LRU cache."""
+import threading
+import unittest
+
+from six.moves import range
+
+from lru import CompactLruCache, ShardedLruCache
+
+
+class TestShardedLruCache(unittest.TestCase):
+    """Tests of thread-safe sharded LRU cache."""
+
+    def test_set_and_get_item(self):
+        """Test putting items in cache and getting them."""
+        cache = ShardedLruCache(100, shards=4)
+
+        for idx in range(10):
+            cache[idx] = idx * 10
+
+        self.assertEqual(len(cache), 10)
+        self.assertEqual(cache[3], 30)
+        self.assertIn(3, cache)
+        self.assertNotIn(10, cache)
+        self.assertEqual(cache.get(3), 30)
+        self.assertIsNone(cache.get(10))
+        self.assertEqual(cache.get(10, 'default'), 'default')
+        self.assertDictEqual(
+            dict(cache.items()), dict((idx, idx * 10) for idx in range(10))
+        )
+
+    def test_get_non_existed_item(self):
+        """Test getting non-existed item from cache."""
+        cache = ShardedLruCache(100, shards=4)
+
+        with self.assertRaises(KeyError):
+            cache['k1']
+
+    def test_size_is_divided_between_shards(self):
+        """Test that cache holds no more items than its size."""
+        cache = ShardedLruCache(10, shards=4)
+
+        for idx in range(100):
+            cache[idx] = idx
+
+        self.assertLessEqual(len(cache), 10)
+        # the last item of each shard is always kept
+        self.assertIn(99, cache)
+
+    def test_more_shards_than_size(self):
+        """Test that every shard holds at least one item."""
+        cache = ShardedLruCache(2, shards=16)
+
+        for idx in range(100):
+            cache[idx] = idx
+
+        self.assertEqual(len(cache), 2)
+
+    def test_lru_within_shard(self):
+        """Test that a single shard evicts least recently used items."""
+        cache = ShardedLruCache(3, shards=1)
+
+        cache['k1'] = 100
+        cache['k2'] = 200
+        cache['k3'] = 300
+        cache['k1']
+        cache['k4'] = 400
+
+        self.assertListEqual(list(cache.items()), [
+            ('k3', 300), ('k1', 100), ('k4', 400)
+        ])
+
+    def test_concurrent_access(self):
+        """Test that concurrent threads don't break cache."""
+        cache = ShardedLruCache(50, shards=4)
+        errors = []
+
+        def worker(offset):
+            """Put and get items."""
+            try:
+                for idx in range(2000):
+                    key = (idx + offset) % 200
+                    cache[key] = key
+                    value = cache.get(key)
+                    if value is not None and value != key:
+                        errors.append(value)
+            except Exception as exc:  # pragma: no cover
+                errors.append(exc)
+
+        threads = [
+            threading.Thread(target=worker, args=(idx * 7,))
+            for idx in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertListEqual(errors, [])
+        self.assertLessEqual(len(cache), 50)
+        self.assertEqual(len(list(cache.items())), len(cache))
+
+    def test_get_and_set_many(self):
+        """Test putting and getting several items at once."""
+        cache = ShardedLruCache(100, shards=4)
+
+        cache.set_many((idx, idx * 10) for idx in range(10))
+
+        self.assertListEqual(cache.get_many([9, 3, 10, 3], 'default'),
+                             [90, 30, 'default', 30])
+        self.assertEqual(len(cache), 10)
+
+    def test_max_weight(self):
+        """Test that maximum weight is divided between shards."""
+        cache = ShardedLruCache(100, shards=4, max_weight=1000,
+                                weigher=lambda key, value: 100)
+
+        for idx in range(100):
+            cache[idx] = idx
+
+        self.assertEqual(len(cache), 8)
+
+    def test_weight_only(self):
+        """Test cache limited by weight only."""
+        cache = ShardedLruCache(None, shards=4, max_weight=1000,
+                                weigher=lambda key, value: 100)
+
+        for idx in range(100):
+            cache[idx] = idx
+
+        self.assertEqual(len(cache), 8)
+        self.assertIsNone(cache.max_size)
+
+    def test_shard_class_without_ttl(self):
+        """Test putting items in shards of a class without time to live."""
+        cache = ShardedLruCache(100, shards=4, cache_class=CompactLruCache)
+
+        cache.set('k1', 100)
+        cache.set_many((idx, idx * 10) for idx in range(10))
+
+        self.assertEqual(cache.get('k1'), 100)
+        self.assertListEqual(cache.get_many([9, 3]), [90, 30])
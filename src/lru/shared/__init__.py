@@ -0,0 +1,413 @@
+"""LRU cache shared by several processes."""
+import ctypes
+import mmap
+import multiprocessing
+import zlib
+
+from six.moves import cPickle as pickle
+
+# indices of fields of the header of a segment
+_FIRST, _LAST, _COUNT, _USED, _FREE = range(5)
+_HEADER_FIELDS = 5
+# a marker of absence of a value in cache
+_missing = object()
+
+
+class SharedLruCache(object):
+    """LRU cache in a shared memory segment.
+
+    It has the same interface as 'LruCache', but items are stored in an
+    anonymous shared memory mapping instead of the heap of a process. Forked
+    processes inherit the mapping and its lock, so workers forked from
+    a process that has created cache share its items.
+
+    Every item occupies a slot of fixed size which holds its key and value
+    serialized by pickle, so keys are compared by their serialized form.
+    Slots are found by a hash table of chains, and links of chains and of the
+    recency list are stored in arrays of integers in the segment at the index
+    of the slot, like in 'CompactLruCache'. A slot of an evicted item is
+    reused by a new one. Items that don't fit in a slot are not cached.
+    All operations are made under a lock shared by processes.
+    Usage example:
+
+    .. code-block:: python
+
+        >>> cache = SharedLruCache(1000, slot_size=4096)
+        >>>
+        >>> if os.fork() == 0:
+        ...     cache['key1'] = 'value1'
+        ...     os._exit(0)
+        >>>
+        >>> os.wait()
+        >>> assert cache['key1'] == 'value1'
+
+    """
+
+    __slots__ = ('_size', '_slot_size', '_lock', '_memory', '_header',
+                 '_prev', '_next', '_chain', '_hashes', '_key_lengths',
+                 '_value_lengths', '_buckets', '_data_offset')
+
+    def __init__(self, cache_size, slot_size=1024):
+        """Initialize cache.
+
+        :param cache_size: Maximum cache size.
+        :param slot_size: Maximum size of a serialized key and a value
+        of an item in bytes.
+        :raise ValueError: If the size of cache or of a slot is not positive.
+        """
+        super(SharedLruCache, self).__init__()
+
+        # slot 0 means no slot, and the segment can't grow later
+        if cache_size is None or cache_size < 1:
+            raise ValueError(
+                'Size of shared cache must be positive, not {}'.format(
+                    cache_size
+                )
+            )
+        if slot_size < 1:
+            raise ValueError(
+                'Size of a slot must be positive, not {}'.format(slot_size)
+            )
+
+        self._size = cache_size
+        self._slot_size = slot_size
+        self._lock = multiprocessing.Lock()
+
+        # the amount of buckets is a power of two, so a bucket of a hash
+        # is got by a mask
+        buckets = 1
+        while buckets < cache_size:
+            buckets *= 2
+        # slots are numbered from 1, so zeros of a new segment mean no slot
+        slots = cache_size + 1
+        arrays = [
+            ('_header', ctypes.c_int32, _HEADER_FIELDS),
+            ('_prev', ctypes.c_int32, slots),
+            ('_next', ctypes.c_int32, slots),
+            ('_chain', ctypes.c_int32, slots),
+            ('_hashes', ctypes.c_uint32, slots),
+            ('_key_lengths', ctypes.c_uint32, slots),
+            ('_value_lengths', ctypes.c_uint32, slots),
+            ('_buckets', ctypes.c_int32, buckets),
+        ]
+        self._data_offset = sum(
+            ctypes.sizeof(item_type) * length
+            for _, item_type, length in arrays
+        )
+        self._memory = mmap.mmap(
+            -1, self._data_offset + cache_size * slot_size
+        )
+        offset = 0
+        for name, item_type, length in arrays:
+            array_type = item_type * length
+            setattr(self, name, array_type.from_buffer(self._memory, offset))
+            offset += ctypes.sizeof(array_type)
+
+    @property
+    def max_size(self):
+        """Get maximum cache size."""
+        return self._size
+
+    def _get_offset(self, slot):
+        """Get an offset of data of a slot in the segment.
+
+        :param slot: A slot.
+        :return: An offset.
+        """
+        return self._data_offset + (slot - 1) * self._slot_size
+
+    def _find(self, key_data, key_hash):
+        """Find a slot of a key.
+
+        :param key_data: A serialized key.
+        :param key_hash: A hash of the serialized key.
+        :return: A slot or 0 if the key is not in cache.
+        """
+        slot = self._buckets[key_hash & (len(self._buckets) - 1)]
+        while slot:
+            if self._hashes[slot] == key_hash and \
+                    self._key_lengths[slot] == len(key_data):
+                offset = self._get_offset(slot)
+                if self._memory[offset:offset + len(key_data)] == key_data:
+                    return slot
+            slot = self._chain[slot]
+        return 0
+
+    def _unlink(self, slot):
+        """Remove a slot from the recency list.
+
+        :param slot: A slot.
+        """
+        header = self._header
+        prev_slot, next_slot = self._prev[slot], self._next[slot]
+        if prev_slot:
+            self._next[prev_slot] = next_slot
+        else:
+            header[_FIRST] = next_slot
+        if next_slot:
+            self._prev[next_slot] = prev_slot
+        else:
+            header[_LAST] = prev_slot
+
+    def _link_last(self, slot):
+        """Put a slot at the end of the recency list.
+
+        :param slot: A slot.
+        """
+        header = self._header
+        last = header[_LAST]
+        self._prev[slot] = last
+        self._next[slot] = 0
+        if last:
+            self._next[last] = slot
+        else:
+            header[_FIRST] = slot
+        header[_LAST] = slot
+
+    def _update_age(self, slot):
+        """Mark a slot as the most recently used one.
+
+        :param slot: A slot.
+        """
+        if slot != self._header[_LAST]:
+            self._unlink(slot)
+            self._link_last(slot)
+
+    def _unchain(self, slot):
+        """Remove a slot from the chain of its bucket.
+
+        :param slot: A slot.
+        """
+        bucket = self._hashes[slot] & (len(self._buckets) - 1)
+        current = self._buckets[bucket]
+        if current == slot:
+            self._buckets[bucket] = self._chain[slot]
+            return
+        while self._chain[current] != slot:
+            current = self._chain[current]
+        self._chain[current] = self._chain[slot]
+
+    def _remove(self, slot):
+        """Remove an item and put its slot to the list of free slots.
+
+        :param slot: A slot.
+        """
+        header = self._header
+        self._unlink(slot)
+        self._unchain(slot)
+        self._next[slot] = header[_FREE]
+        header[_FREE] = slot
+        header[_COUNT] -= 1
+
+    def _allocate(self):
+        """Get a slot for a new item.
+
+        :return: A free slot or a slot of the least recently used item
+        which is evicted.
+        """
+        header = self._header
+        slot = header[_FREE]
+        if slot:
+            header[_FREE] = self._next[slot]
+        elif header[_USED] < self._size:
+            header[_USED] += 1
+            slot = header[_USED]
+        else:
+            # if overflow of capacity
+            # reuse the slot of least recently used item
+            slot = header[_FIRST]
+            self._unlink(slot)
+            self._unchain(slot)
+            return slot
+        header[_COUNT] += 1
+        return slot
+
+    def _write(self, slot, key_data, value_data):
+        """Write a serialized item into a slot.
+
+        :param slot: A slot.
+        :param key_data: A serialized key.
+        :param value_data: A serialized value.
+        """
+        offset = self._get_offset(slot)
+        data = key_data + value_data
+        self._memory[offset:offset + len(data)] = data
+        self._key_lengths[slot] = len(key_data)
+        self._value_lengths[slot] = len(value_data)
+
+    def _read_value(self, slot):
+        """Read a serialized value from a slot.
+
+        :param slot: A slot.
+        :return: Bytes.
+        """
+        offset = self._get_offset(slot) + self._key_lengths[slot]
+        return self._memory[offset:offset + self._value_lengths[slot]]
+
+    @staticmethod
+    def _dump_key(key):
+        """Serialize a key.
+
+        :param key: A key.
+        :return: A tuple of bytes and their hash.
+        """
+        key_data = pickle.dumps(key, pickle.HIGHEST_PROTOCOL)
+        return key_data, zlib.crc32(key_data) & 0xffffffff
+
+    def _put(self, key_data, key_hash, value_data):
+        """Put a serialized item in cache.
+
+        It must be called under the lock.
+        :param key_data: A serialized key.
+        :param key_hash: A hash of the serialized key.
+        :param value_data: A serialized value.
+        """
+        slot = self._find(key_data, key_hash)
+        if len(key_data) + len(value_data) > self._slot_size:
+            # the item doesn't fit in a slot,
+            # so it is rejected and its previous value is dropped
+            if slot:
+                self._remove(slot)
+            return
+
+        if slot:
+            # if key is in cache
+            self._update_age(slot)
+        else:
+            slot = self._allocate()
+            self._hashes[slot] = key_hash
+            bucket = key_hash & (len(self._buckets) - 1)
+            self._chain[slot] = self._buckets[bucket]
+            self._buckets[bucket] = slot
+            self._link_last(slot)
+        self._write(slot, key_data, value_data)
+
+    def _take(self, key_data, key_hash):
+        """Get a serialized value and mark it as the most recently used.
+
+        It must be called under the lock.
+        :param key_data: A serialized key.
+        :param key_hash: A hash of the serialized key.
+        :return: Bytes or None if the key is not in cache.
+        """
+        slot = self._find(key_data, key_hash)
+        if not slot:
+            return None
+        self._update_age(slot)
+        return self._read_value(slot)
+
+    def __setitem__(self, key, value):
+        """Put a value under given key in cache.
+
+        :param key: A key under which the value must be put in cache.
+        :param value: A value to be put in cache.
+        """
+        key_data, key_hash = self._dump_key(key)
+        value_data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._put(key_data, key_hash, value_data)
+
+    def set_many(self, items):
+        """Put values under given keys in cache.
+
+        Items are serialized before the lock is acquired, and the lock is
+        acquired once.
+        :param items: An iterable of tuples of (key, value). Items are put
+        in their order, so the last ones are kept if cache is too small.
+        """
+        serialized = []
+        for key, value in items:
+            key_data, key_hash = self._dump_key(key)
+            value_data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            serialized.append((key_data, key_hash, value_data))
+        with self._lock:
+            for key_data, key_hash, value_data in serialized:
+                self._put(key_data, key_hash, value_data)
+
+    def __contains__(self, key):
+        """Has cache a value under given key or not.
+
+        :param key: A key to check.
+        :return: True if cache has a value under given key,
+        False otherwise.
+        """
+        key_data, key_hash = self._dump_key(key)
+        with self._lock:
+            return bool(self._find(key_data, key_hash))
+
+    def __getitem__(self, key):
+        """Get a value under the given key from cache.
+
+        :param key: A key under which a result is needed.
+        :raise KeyError: If there is no value in cache under the given key.
+        :return: Value from cache.
+        """
+        value = self.get(key, _missing)
+        if value is _missing:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        """Get a value under the given key from cache.
+
+        Unlike a check by 'in' followed by getting a value, it is atomic, so
+        the value can't be evicted by another process in between.
+        :param key: A key under which a result is needed.
+        :param default: A value returned if there is no value under the key.
+        :return: Value from cache or the default value.
+        """
+        key_data, key_hash = self._dump_key(key)
+        with self._lock:
+            value_data = self._take(key_data, key_hash)
+        if value_data is None:
+            return default
+        return pickle.loads(value_data)
+
+    def get_many(self, keys, default=None):
+        """Get values under given keys from cache.
+
+        The lock is acquired once.
+        :param keys: An iterable of keys.
+        :param default: A value returned for keys which are not in cache.
+        :return: A list of values in order of the keys.
+        """
+        dumped_keys = [self._dump_key(key) for key in keys]
+        with self._lock:
+            serialized = [self._take(key_data, key_hash)
+                          for key_data, key_hash in dumped_keys]
+        return [default if value_data is None else pickle.loads(value_data)
+                for value_data in serialized]
+
+    def clear(self):
+        """Remove all items from cache."""
+        with self._lock:
+            for array in (self._header, self._buckets):
+                ctypes.memset(ctypes.addressof(array), 0,
+                              ctypes.sizeof(array))
+
+    def __len__(self):
+        """Get amount of values in cache."""
+        return self._header[_COUNT]
+
+    def items(self):
+        """Get generator that iterates over items in cache.
+
+        Each returned variable is a tuple of (key, value). Items are returned
+        from least to most recently used. They are copied under the lock, so
+        the generator can be used while other processes change the cache.
+        :return: Generator.
+        """
+        serialized = []
+        with self._lock:
+            slot = self._header[_FIRST]
+            while slot:
+                offset = self._get_offset(slot)
+                key_length = self._key_lengths[slot]
+                serialized.append((
+                    self._memory[offset:offset + key_length],
+                    self._read_value(slot),
+                ))
+                slot = self._next[slot]
+
+        for key_data, value_data in serialized:
+            yield pickle.loads(key_data), pickle.loads(value_data)
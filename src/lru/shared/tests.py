@@ -0,0 +1,188 @@
+"""Tests of LRU cache shared by processes."""
+import multiprocessing
+import unittest
+
+from mock import mock
+from six.moves import range
+
+from lru import SharedLruCache, lru_cache
+
+# workers must inherit cache, so they are forked
+if hasattr(multiprocessing, 'get_context'):
+    context = multiprocessing.get_context('fork')
+else:  # python 2
+    context = multiprocessing
+
+
+def fill(cache, start, stop):
+    """Put items in cache in another process.
+
+    :param cache: Cache.
+    :param start: The first key.
+    :param stop: The key after the last one.
+    """
+    for key in range(start, stop):
+        cache[key] = 'value{}'.format(key)
+
+
+def run_processes(target, args_list):
+    """Run a function in several processes and wait for them.
+
+    :param target: A function.
+    :param args_list: A list of tuples of arguments of processes.
+    :return: A list of exit codes.
+    """
+    processes = [context.Process(target=target, args=args)
+                 for args in args_list]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    return [process.exitcode for process in processes]
+
+
+class TestSharedLruCache(unittest.TestCase):
+    """Tests of LRU cache shared by processes."""
+
+    def test_set_item(self):
+        """Test putting item in cache."""
+        cache = SharedLruCache(3)
+
+        cache['k1'] = 100
+        cache['k2'] = 200
+        cache['k3'] = 300
+        cache['k4'] = 400
+
+        self.assertEqual(len(cache), 3)
+        self.assertNotIn('k1', cache)
+        self.assertListEqual(list(cache.items()), [
+            ('k2', 200), ('k3', 300), ('k4', 400)
+        ])
+
+    def test_update_item(self):
+        """Test update item in cache."""
+        cache = SharedLruCache(3)
+
+        cache['k1'] = 100
+        cache['k2'] = 200
+        cache['k1'] = 'a longer value'
+
+        self.assertEqual(len(cache), 2)
+        self.assertListEqual(list(cache.items()), [
+            ('k2', 200), ('k1', 'a longer value'),
+        ])
+
+    def test_get_item(self):
+        """Test getting items from cache."""
+        cache = SharedLruCache(2)
+
+        cache[('k1', 1)] = [1, 2]
+        cache['k2'] = 200
+        self.assertEqual(cache[('k1', 1)], [1, 2])
+        cache['k3'] = 300
+
+        self.assertEqual(cache.get(('k1', 1)), [1, 2])
+        self.assertIsNone(cache.get('k2'))
+        self.assertEqual(cache.get('k2', 'default'), 'default')
+        with self.assertRaises(KeyError):
+            cache['k2']
+
+    def test_reject_too_big(self):
+        """Test that an item bigger than a slot is not put in cache."""
+        cache = SharedLruCache(3, slot_size=64)
+
+        cache['k1'] = 'a'
+        cache['k2'] = 'b'
+        cache['k1'] = 'a' * 64
+        cache['k3'] = 'c'
+        cache['k4'] = 'd'
+
+        self.assertListEqual(list(cache.items()), [
+            ('k2', 'b'), ('k3', 'c'), ('k4', 'd'),
+        ])
+
+    def test_collisions(self):
+        """Test that keys are found and evicted among many keys."""
+        cache = SharedLruCache(100)
+
+        for key in range(1000):
+            cache[key] = key
+            self.assertEqual(cache[key], key)
+
+        self.assertEqual(len(cache), 100)
+        self.assertListEqual(list(cache.items()),
+                             [(key, key) for key in range(900, 1000)])
+
+    def test_clear(self):
+        """Test that all items are removed."""
+        cache = SharedLruCache(3)
+        cache['k1'] = 100
+
+        cache.clear()
+        cache['k2'] = 200
+
+        self.assertEqual(len(cache), 1)
+        self.assertNotIn('k1', cache)
+        self.assertListEqual(list(cache.items()), [('k2', 200)])
+
+    def test_get_and_set_many(self):
+        """Test putting and getting several items at once."""
+        cache = SharedLruCache(3)
+
+        cache.set_many([('k1', 100), ('k2', 200), ('k3', 300), ('k4', 400)])
+        values = cache.get_many(['k3', 'k1', 'k2'], 'default')
+
+        self.assertListEqual(values, [300, 'default', 200])
+        self.assertListEqual(list(cache.items()), [
+            ('k4', 400), ('k3', 300), ('k2', 200),
+        ])
+
+    def test_invalid_size(self):
+        """Test that cache without slots is not created."""
+        for cache_size, slot_size in ((0, 1024), (-1, 1024), (None, 1024),
+                                      (3, 0)):
+            with self.assertRaises(ValueError):
+                SharedLruCache(cache_size, slot_size)
+
+    def test_processes(self):
+        """Test that items put by processes are shared."""
+        cache = SharedLruCache(1000)
+
+        exit_codes = run_processes(
+            fill, [(cache, start, start + 200) for start in range(0, 800, 200)]
+        )
+
+        self.assertListEqual(exit_codes, [0] * 4)
+        self.assertEqual(len(cache), 800)
+        for key in range(800):
+            self.assertEqual(cache[key], 'value{}'.format(key))
+
+    def test_processes_evict(self):
+        """Test that processes evict items of each other."""
+        cache = SharedLruCache(100)
+
+        exit_codes = run_processes(
+            fill,
+            [(cache, start, start + 500) for start in range(0, 2000, 500)],
+        )
+
+        self.assertListEqual(exit_codes, [0] * 4)
+        self.assertEqual(len(cache), 100)
+        for key, value in cache.items():
+            self.assertEqual(value, 'value{}'.format(key))
+
+    def test_decorator(self):
+        """Test that results of a function are shared by processes."""
+        func_mock = mock.Mock()
+
+        @lru_cache(10, shared=True)
+        def func(value):
+            func_mock(value)
+            return value * 2
+
+        exit_codes = run_processes(func, [(1,), (2,)])
+
+        self.assertListEqual(exit_codes, [0, 0])
+        self.assertEqual(func(1), 2)
+        self.assertEqual(func(2), 4)
+        func_mock.assert_not_called()
@@ -0,0 +1,73 @@
+"""Statistics of cache."""
+from collections import namedtuple
+
+
+class CacheInfo(namedtuple('CacheInfo', (
+    'hits', 'misses', 'inserts', 'evictions', 'expirations', 'size',
+    'max_size', 'timed_misses', 'miss_time',
+))):
+    """Snapshot of statistics of cache.
+
+    Counters are None if statistics are disabled. 'miss_time' is total time
+    in seconds spent by a cached function in 'timed_misses' sampled calls.
+    """
+
+    __slots__ = ()
+
+
+def get_cache_info(cache, timed_misses=0, miss_time=0.0):
+    """Get a snapshot of statistics of cache.
+
+    :param cache: Cache, its counters are taken from its 'stats' if it has
+    them.
+    :param timed_misses: Amount of sampled calls of a cached function.
+    :param miss_time: Total duration of the sampled calls in seconds.
+    :return: An instance of 'CacheInfo'.
+    """
+    cache_stats = getattr(cache, 'stats', None)
+    if cache_stats is None:
+        counters = (None,) * 5
+    else:
+        counters = (
+            cache_stats.hits, cache_stats.misses, cache_stats.inserts,
+            cache_stats.evictions, cache_stats.expirations,
+        )
+    return CacheInfo(*counters + (
+        len(cache), getattr(cache, 'max_size', None), timed_misses, miss_time,
+    ))
+
+
+class CacheStats(object):
+    """Counters of cache operations."""
+
+    __slots__ = ('hits', 'misses', 'inserts', 'evictions', 'expirations')
+
+    def __init__(self):
+        """Initialize counters."""
+        super(CacheStats, self).__init__()
+
+        self.reset()
+
+    def reset(self):
+        """Set all counters to zero."""
+        self.hits = 0
+        self.misses = 0
+        self.inserts = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def combine(cls, stats):
+        """Sum counters of several caches.
+
+        :param stats: An iterable of statistics.
+        :return: New statistics.
+        """
+        result = cls()
+        for item in stats:
+            result.hits += item.hits
+            result.misses += item.misses
+            result.inserts += item.inserts
+            result.evictions += item.evictions
+            result.expirations += item.expirations
+        return result
@@ -0,0 +1,90 @@
+"""Count-min sketch."""
+_mask = 0xFFFFFFFFFFFFFFFF
+# odd multipliers of hashes of rows of a sketch
+_seeds = (
+    0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9,
+    0xD6E8FEB86659FD93,
+)
+# maximal value of a counter
+_max_count = 15
+
+
+class CountMinSketch(object):
+    """Count-min sketch (https://en.wikipedia.org/wiki/Count-min_sketch).
+
+    It estimates frequencies of keys in constant memory. A key increments
+    one counter in each of a few rows chosen by independent hashes, and an
+    estimate is the minimal of the counters, so it is never lower than the
+    frequency, but can be higher because of collisions. Counters are small
+    and saturate at 15. After a sample of additions all counters are halved,
+    so the sketch tracks recent frequencies, as required by TinyLFU
+    (https://arxiv.org/abs/1512.00727).
+    Usage example:
+
+    .. code-block:: python
+
+        >>> sketch = CountMinSketch(1024)
+        >>> sketch.add('key1')
+        >>> sketch.add('key1')
+        >>>
+        >>> assert sketch.estimate('key1') >= 2
+
+    """
+
+    __slots__ = ('_counters', '_width_bits', '_sample_size', '_additions')
+
+    def __init__(self, width, sample_size=None):
+        """Initialize a sketch.
+
+        :param width: Minimal amount of counters in a row. It is rounded up
+        to a power of two.
+        :param sample_size: Amount of additions after which counters are
+        halved. It is ten times the width by default.
+        """
+        super(CountMinSketch, self).__init__()
+
+        self._width_bits = max(int(width - 1).bit_length(), 4)
+        self._counters = bytearray(len(_seeds) << self._width_bits)
+        self._sample_size = sample_size or 10 * (1 << self._width_bits)
+        self._additions = 0
+
+    def _iter_positions(self, key):
+        """Iterate over positions of counters of given key.
+
+        :param key: A hashable key.
+        :return: Generator of positions.
+        """
+        key_hash = hash(key) & _mask
+        shift = 64 - self._width_bits
+        for row, seed in enumerate(_seeds):
+            yield (row << self._width_bits) + \
+                (((key_hash ^ (key_hash >> 29)) * seed & _mask) >> shift)
+
+    def add(self, key):
+        """Increment frequency of a key.
+
+        :param key: A hashable key.
+        """
+        counters = self._counters
+        for position in self._iter_positions(key):
+            if counters[position] < _max_count:
+                counters[position] += 1
+
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._reset()
+
+    def _reset(self):
+        """Halve all counters."""
+        self._counters = bytearray(count >> 1 for count in self._counters)
+        self._additions //= 2
+
+    def estimate(self, key):
+        """Get estimated frequency of a key.
+
+        :param key: A hashable key.
+        :return: An integer from 0 to 15.
+        """
+        counters = self._counters
+        return min(counters[position]
+                   for position in self._iter_positions(key))
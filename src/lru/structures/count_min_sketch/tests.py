@@ -0,0 +1,43 @@
+"""Tests of count-min sketch."""
+import unittest
+
+from six.moves import range
+
+from lru.structures.count_min_sketch import CountMinSketch
+
+
+class TestCountMinSketch(unittest.TestCase):
+    """Tests of count-min sketch."""
+
+    def test_estimate(self):
+        """Test that estimates are not lower than frequencies."""
+        sketch = CountMinSketch(1024, sample_size=10 ** 6)
+
+        for key in range(100):
+            for _ in range(key % 10):
+                sketch.add(key)
+
+        for key in range(100):
+            self.assertGreaterEqual(sketch.estimate(key), key % 10)
+        self.assertEqual(sketch.estimate('missing'), 0)
+
+    def test_saturation(self):
+        """Test that counters don't exceed the maximum."""
+        sketch = CountMinSketch(16, sample_size=10 ** 6)
+
+        for _ in range(100):
+            sketch.add('key')
+
+        self.assertEqual(sketch.estimate('key'), 15)
+
+    def test_reset(self):
+        """Test that counters are halved after a sample of additions."""
+        sketch = CountMinSketch(16, sample_size=10)
+
+        for _ in range(8):
+            sketch.add('key')
+        self.assertEqual(sketch.estimate('key'), 8)
+        sketch.add('key')
+        sketch.add('key')
+
+        self.assertEqual(sketch.estimate('key'), 5)
@@ -99,6 +99,30 @@ class DoublyLinkedList(object):
             node.prev.next = new_node
         node.prev = new_node
 
+    def move_to_end(self, node):
+        """Move given node of the list to its end.
+
+        It is the same as removing the node and inserting it at the end,
+        but links are changed in place.
+        :param node: A node of the list.
+        """
+        next_node = node.next
+        if next_node is None:
+            # the node is already the last one
+            return
+        prev_node = node.prev
+        if prev_node is None:
+            self._first_node = next_node
+        else:
+            prev_node.next = next_node
+        next_node.prev = prev_node
+
+        last_node = self._last_node
+        last_node.next = node
+        node.prev = last_node
+        node.next = None
+        self._last_node = node
+
     def remove(self, node):
         """Remove given node from the list.
 
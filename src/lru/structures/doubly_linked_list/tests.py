@@ -102,3 +102,22 @@ class TestDoublyLinkedList(unittest.TestCase):
         linked_list.remove(node_to_remove)
 
         self.assertListItemsEqual(linked_list, [1, 3])
+
+    def test_move_to_end(self):
+        """Test moving a node to the end of a list."""
+        linked_list = DoublyLinkedList()
+        nodes = [Node(idx) for idx in range(4)]
+        for node in nodes:
+            linked_list.insert_end(node)
+
+        linked_list.move_to_end(nodes[0])
+        self.assertListItemsEqual(linked_list, [1, 2, 3, 0])
+        linked_list.move_to_end(nodes[2])
+        self.assertListItemsEqual(linked_list, [1, 3, 0, 2])
+        linked_list.move_to_end(nodes[2])
+        self.assertListItemsEqual(linked_list, [1, 3, 0, 2])
+
+        self.assertEqual(linked_list.first_node, nodes[1])
+        self.assertEqual(linked_list.last_node, nodes[2])
+        self.assertIsNone(nodes[1].prev)
+        self.assertEqual(nodes[2].prev, nodes[0])
@@ -0,0 +1,108 @@
+"""Hashed timing wheel."""
+from six import iteritems
+from six.moves import range
+
+
+class TimingWheel(object):
+    """Hashed timing wheel.
+
+    It keeps keys with their deadlines and finds expired ones without
+    scanning all keys (see "Hashed and Hierarchical Timing Wheels" by
+    G. Varghese and T. Lauck). Time is divided into ticks of a fixed
+    resolution and a key is put into a bucket of the tick of its deadline
+    modulo amount of buckets. Advancing the wheel examines only buckets of
+    ticks which have completely passed since the previous advance, so a key
+    is examined once per rotation of the wheel and keys expire with
+    precision of a tick.
+    Usage example:
+
+    .. code-block:: python
+
+        >>> wheel = TimingWheel(resolution=1.0)
+        >>> wheel.schedule('key1', 10.5)
+        >>> wheel.schedule('key2', 20.5)
+        >>>
+        >>> assert wheel.advance(15.0) == ['key1']
+        >>> assert wheel.advance(15.5) == []
+
+    """
+
+    __slots__ = ('_resolution', '_buckets', '_ticks', '_current_tick')
+
+    def __init__(self, resolution=1.0, buckets=512):
+        """Initialize a wheel.
+
+        :param resolution: Duration of a tick.
+        :param buckets: Amount of buckets.
+        """
+        super(TimingWheel, self).__init__()
+
+        self._resolution = float(resolution)
+        # deadlines of keys by keys in each bucket
+        self._buckets = [{} for _ in range(buckets)]
+        # ticks of deadlines by keys
+        self._ticks = {}
+        self._current_tick = None
+
+    def schedule(self, key, deadline):
+        """Add a key or change its deadline.
+
+        :param key: A key.
+        :param deadline: A time when the key expires.
+        """
+        self.unschedule(key)
+        tick = int(deadline // self._resolution)
+        self._buckets[tick % len(self._buckets)][key] = deadline
+        self._ticks[key] = tick
+        if self._current_tick is None or tick < self._current_tick:
+            self._current_tick = tick
+
+    def unschedule(self, key):
+        """Remove a key if it is in the wheel.
+
+        :param key: A key.
+        """
+        tick = self._ticks.pop(key, None)
+        if tick is not None:
+            del self._buckets[tick % len(self._buckets)][key]
+
+    def advance(self, now):
+        """Remove and get keys which deadlines have passed.
+
+        Keys which deadlines are within the current tick are not returned
+        until the tick passes.
+        :param now: Current time.
+        :return: A list of expired keys.
+        """
+        if not self._ticks:
+            self._current_tick = None
+            return []
+
+        now_tick = int(now // self._resolution)
+        buckets = self._buckets
+        # every bucket is examined at most once
+        first_tick = max(self._current_tick, now_tick - len(buckets))
+        expired = []
+        for tick in range(first_tick, now_tick):
+            bucket = buckets[tick % len(buckets)]
+            if bucket:
+                expired.extend(
+                    key for key, deadline in iteritems(bucket)
+                    if deadline <= now
+                )
+        for key in expired:
+            self.unschedule(key)
+        self._current_tick = max(self._current_tick, now_tick)
+        return expired
+
+    def __contains__(self, key):
+        """Is a key in the wheel or not.
+
+        :param key: A key to check.
+        :return: True if the key is scheduled, False otherwise.
+        """
+        return key in self._ticks
+
+    def __len__(self):
+        """Get amount of keys in the wheel."""
+        return len(self._ticks)
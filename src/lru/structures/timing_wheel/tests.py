@@ -0,0 +1,53 @@
+"""Tests of hashed timing wheel."""
+import unittest
+
+from six.moves import range
+
+from lru.structures.timing_wheel import TimingWheel
+
+
+class TestTimingWheel(unittest.TestCase):
+    """Tests of hashed timing wheel."""
+
+    def test_advance(self):
+        """Test that keys are returned once their ticks have passed."""
+        wheel = TimingWheel(resolution=1.0, buckets=8)
+        wheel.schedule('k1', 10.5)
+        wheel.schedule('k2', 11.5)
+        wheel.schedule('k3', 30.5)
+
+        self.assertListEqual(wheel.advance(10.9), [])
+        self.assertListEqual(wheel.advance(11.0), ['k1'])
+        self.assertListEqual(wheel.advance(12.0), ['k2'])
+        self.assertEqual(len(wheel), 1)
+        # 'k3' shares a bucket with passed ticks, but expires later
+        self.assertListEqual(wheel.advance(30.0), [])
+        self.assertListEqual(wheel.advance(31.0), ['k3'])
+        self.assertEqual(len(wheel), 0)
+
+    def test_advance_more_than_rotation(self):
+        """Test that all buckets are examined after a long pause."""
+        wheel = TimingWheel(resolution=1.0, buckets=8)
+        for idx in range(20):
+            wheel.schedule(idx, idx + 0.5)
+
+        self.assertListEqual(sorted(wheel.advance(100.0)), list(range(20)))
+
+    def test_schedule_again(self):
+        """Test that scheduling of a key replaces its deadline."""
+        wheel = TimingWheel(resolution=1.0, buckets=8)
+        wheel.schedule('k1', 1.5)
+        wheel.schedule('k1', 5.5)
+
+        self.assertListEqual(wheel.advance(3.0), [])
+        self.assertListEqual(wheel.advance(6.0), ['k1'])
+
+    def test_unschedule(self):
+        """Test removal of a key."""
+        wheel = TimingWheel()
+        wheel.schedule('k1', 1.5)
+        wheel.unschedule('k1')
+        wheel.unschedule('k2')
+
+        self.assertNotIn('k1', wheel)
+        self.assertListEqual(wheel.advance(10.0), [])
@@ -1,9 +1,45 @@
 """Tests for LRU cache mechanism."""
+import os
+import shutil
+import sys
+import tempfile
+import threading
 from unittest import TestCase
 
 from mock import mock
+from six.moves import range
 
-from lru import lru_cache
+from lru import CompactLruCache, lru_cache, make_key
+
+try:
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+except ImportError:  # python 2
+    ProcessPoolExecutor = ThreadPoolExecutor = None
+
+
+def square_all(values):
+    """Square values in a pool of processes.
+
+    :param values: A list of numbers.
+    :return: A list of squares.
+    """
+    return [value * value for value in values]
+
+
+def load_tests(loader, tests, pattern):
+    """Load tests of the module and of coroutine functions.
+
+    The latter are loaded on Python 3.5+ only, since 'lru.aio' uses syntax
+    of it.
+    :param loader: A loader of tests.
+    :param tests: Tests of the module.
+    :param pattern: A pattern of names of modules.
+    :return: A suite of tests.
+    """
+    if sys.version_info >= (3, 5):
+        from lru.aio import coroutine_tests
+        tests.addTests(loader.loadTestsFromModule(coroutine_tests))
+    return tests
 
 
 class TestLruCache(TestCase):
@@ -79,3 +115,438 @@ class TestLruCache(TestCase):
             mock.call(1),
             mock.call(2),
         ])
+
+    def test_thread_safe(self):
+        """Test that sharded cache can be used from several threads."""
+        func_mock = mock.Mock()
+
+        @lru_cache(100, shards=4)
+        def func(value):
+            func_mock(value)
+            return value * 2
+
+        results = []
+
+        def worker():
+            """Call the function with the same arguments."""
+            results.extend(func(idx) for idx in range(50))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertListEqual(
+            sorted(results), sorted([idx * 2 for idx in range(50)] * 4)
+        )
+        self.assertGreaterEqual(func_mock.call_count, 50)
+        func_mock.reset_mock()
+        self.assertEqual(func(10), 20)
+        func_mock.assert_not_called()
+
+    def test_cache_class(self):
+        """Test that the decorator uses cache of given class."""
+        func_mock = mock.Mock()
+
+        @lru_cache(2, cache_class=CompactLruCache)
+        def func(value):
+            func_mock(value)
+            return value
+
+        func(1)
+        func(2)
+        func(1)
+        func(3)  # removes 2
+        func(2)
+
+        self.assertEqual(func_mock.mock_calls, [
+            mock.call(1), mock.call(2), mock.call(3), mock.call(2),
+        ])
+
+    @mock.patch('lru.cache.monotonic')
+    def test_ttl(self, monotonic):
+        """Test that results expire after time to live."""
+        func_mock = mock.Mock()
+
+        @lru_cache(10, ttl=10)
+        def func(value):
+            func_mock(value)
+            return value
+
+        monotonic.return_value = 100.0
+        func(1)
+        func(1)
+        monotonic.return_value = 110.0
+        func(1)
+
+        self.assertEqual(func_mock.mock_calls, [mock.call(1), mock.call(1)])
+
+    @mock.patch('lru.cache.monotonic')
+    def test_ttl_of_result(self, monotonic):
+        """Test that time to live can depend on a result."""
+        func_mock = mock.Mock()
+
+        @lru_cache(10, ttl=lambda value: value)
+        def func(value):
+            func_mock(value)
+            return value
+
+        monotonic.return_value = 100.0
+        func(1)
+        func(5)
+        monotonic.return_value = 102.0
+        func(1)
+        func(5)
+
+        self.assertEqual(func_mock.mock_calls, [
+            mock.call(1), mock.call(5), mock.call(1),
+        ])
+
+    def test_max_weight(self):
+        """Test that cache is limited by weight of results."""
+        func_mock = mock.Mock()
+
+        @lru_cache(max_weight=10, weigher=lambda key, value: len(value))
+        def func(value):
+            func_mock(value)
+            return value
+
+        func('aaaa')
+        func('bbbbbb')
+        func('cc')  # removes 'aaaa'
+        func('d' * 11)  # is not cached
+        func('bbbbbb')
+        func('aaaa')
+        func('d' * 11)
+
+        self.assertEqual(func_mock.mock_calls, [
+            mock.call('aaaa'), mock.call('bbbbbb'), mock.call('cc'),
+            mock.call('d' * 11), mock.call('aaaa'), mock.call('d' * 11),
+        ])
+
+    def test_max_weight_sharded(self):
+        """Test that sharded cache is limited by total weight of results."""
+        func_mock = mock.Mock()
+
+        @lru_cache(max_weight=400, weigher=lambda key, value: 100, shards=4)
+        def func(value):
+            func_mock(value)
+            return value
+
+        for value in range(20):
+            func(value)
+
+        self.assertEqual(func.cache_info().size, 4)
+
+    def test_policy(self):
+        """Test that results are cached with given eviction policy."""
+        func_mock = mock.Mock()
+
+        @lru_cache(100, policy='tinylfu')
+        def func(value):
+            func_mock(value)
+            return value
+
+        for _ in range(5):
+            for value in range(10):
+                func(value)
+        for value in range(1000, 1500):
+            func(value)
+        func_mock.reset_mock()
+        for value in range(10):
+            func(value)
+
+        func_mock.assert_not_called()
+
+    def test_cache_info(self):
+        """Test statistics of cache."""
+        @lru_cache(2, stats=True)
+        def func(value):
+            return value
+
+        func(1)
+        func(1)
+        func(2)
+        func(3)  # removes 1
+        func(1)
+
+        info = func.cache_info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 4)
+        self.assertEqual(info.inserts, 4)
+        self.assertEqual(info.evictions, 2)
+        self.assertEqual(info.expirations, 0)
+        self.assertEqual(info.size, 2)
+        self.assertEqual(info.max_size, 2)
+
+    def test_cache_info_disabled(self):
+        """Test that only size of cache is given without statistics."""
+        @lru_cache(10)
+        def func(value):
+            return value
+
+        func(1)
+
+        info = func.cache_info()
+        self.assertIsNone(info.hits)
+        self.assertIsNone(info.misses)
+        self.assertEqual(info.size, 1)
+        self.assertEqual(info.max_size, 10)
+
+    def test_cache_info_sharded(self):
+        """Test that statistics of shards are combined."""
+        @lru_cache(10, shards=2, stats=True)
+        def func(value):
+            return value
+
+        for value in range(4):
+            func(value)
+            func(value)
+
+        info = func.cache_info()
+        self.assertEqual(info.hits, 4)
+        self.assertEqual(info.misses, 4)
+        self.assertEqual(info.size, 4)
+        self.assertEqual(info.max_size, 10)
+
+    def test_cache_clear(self):
+        """Test that results and statistics are removed."""
+        func_mock = mock.Mock()
+
+        @lru_cache(10, stats=True, timing_interval=1)
+        def func(value):
+            func_mock(value)
+            return value
+
+        func(1)
+        func.cache_clear()
+        func(1)
+
+        self.assertEqual(func_mock.mock_calls, [mock.call(1), mock.call(1)])
+        info = func.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.size, 1)
+        self.assertEqual(info.timed_misses, 1)
+
+    @mock.patch('lru.default_timer')
+    def test_timing_interval(self, default_timer):
+        """Test that every n-th miss is timed."""
+        default_timer.side_effect = [10.0, 10.5, 20.0, 20.25]
+
+        @lru_cache(10, timing_interval=2)
+        def func(value):
+            return value
+
+        for value in range(5):
+            func(value)
+        func(0)
+
+        info = func.cache_info()
+        self.assertEqual(info.timed_misses, 2)
+        self.assertEqual(info.miss_time, 0.75)
+
+    @mock.patch('lru.monotonic')
+    def test_stats_hook(self, monotonic):
+        """Test that the hook is called not more often than the interval."""
+        stats_hook = mock.Mock()
+        monotonic.return_value = 100.0
+
+        @lru_cache(10, stats=True, stats_hook=stats_hook,
+                   stats_hook_interval=10)
+        def func(value):
+            return value
+
+        func(1)
+        stats_hook.assert_not_called()
+        monotonic.return_value = 110.0
+        func(1)
+        monotonic.return_value = 115.0
+        func(1)
+
+        self.assertEqual(stats_hook.call_count, 1)
+        self.assertEqual(stats_hook.call_args[0][0].hits, 1)
+        self.assertEqual(stats_hook.call_args[0][0].misses, 1)
+
+    @mock.patch('lru.atexit.register')
+    def test_snapshot(self, register):
+        """Test that cache is loaded from a snapshot and dumped on exit."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, 'cache.lru')
+        func_mock = mock.Mock()
+
+        def func(value):
+            func_mock(value)
+            return value
+
+        cached_func = lru_cache(10, snapshot_path=path)(func)
+        cached_func(1)
+        cached_func(2)
+        dump, dump_path = register.call_args[0]
+        dump(dump_path)
+        func_mock.reset_mock()
+        cached_func = lru_cache(10, snapshot_path=path)(func)
+        cached_func(1)
+        cached_func(2)
+
+        func_mock.assert_not_called()
+
+    @mock.patch('lru.atexit.register')
+    @mock.patch('lru.monotonic')
+    def test_snapshot_interval(self, monotonic, register):
+        """Test that cache is dumped periodically."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, 'cache.lru')
+        monotonic.return_value = 100.0
+
+        @lru_cache(10, snapshot_path=path, snapshot_interval=60)
+        def func(value):
+            return value
+
+        func(1)
+        self.assertFalse(os.path.exists(path))
+        monotonic.return_value = 160.0
+        func(2)
+
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(func.cache_info().size, 2)
+
+    def test_typed(self):
+        """Test that results of arguments of different types are separate."""
+        func_mock = mock.Mock()
+
+        @lru_cache(10, typed=True)
+        def func(value, other=0):
+            func_mock(value, other)
+            return value
+
+        self.assertIs(type(func(1)), int)
+        self.assertIs(type(func(1.0)), float)
+        func(1, other=2)
+        func(1, other=2.0)
+        func(1)
+        func(1.0, other=2.0)
+
+        self.assertEqual(func_mock.call_count, 5)
+
+    def test_make_key(self):
+        """Test keys of arguments."""
+        self.assertEqual(make_key((1,), {}), 1)
+        self.assertEqual(make_key(('a',), {}), 'a')
+        self.assertEqual(make_key((1.0,), {}), (1.0,))
+        self.assertEqual(make_key((1, 2), {}), (1, 2))
+        self.assertEqual(make_key((1,), {'b': 3, 'a': 2}),
+                         make_key((1,), {'a': 2, 'b': 3}))
+        self.assertEqual(make_key((1,), {}, typed=True), (1, int))
+        self.assertNotEqual(make_key((1,), {'a': 2}, typed=True),
+                            make_key((1,), {'a': 2.0}, typed=True))
+
+    def test_batched(self):
+        """Test that a batched function is called for missed keys only."""
+        func_mock = mock.Mock()
+
+        @lru_cache(10, batched=True)
+        def func(keys):
+            func_mock(keys)
+            return [key * 10 for key in keys]
+
+        self.assertListEqual(func([1, 2, 3]), [10, 20, 30])
+        self.assertListEqual(func([4, 2, 4, 5, 1]), [40, 20, 40, 50, 10])
+        self.assertListEqual(func([]), [])
+        self.assertListEqual(func([5, 4]), [50, 40])
+
+        self.assertEqual(func_mock.mock_calls, [
+            mock.call([1, 2, 3]), mock.call([4, 5]),
+        ])
+
+    def test_batched_arguments(self):
+        """Test that other arguments are passed and are parts of keys."""
+        func_mock = mock.Mock()
+
+        @lru_cache(10, batched=True)
+        def func(keys, factor, offset=0):
+            func_mock(keys, factor, offset)
+            return [key * factor + offset for key in keys]
+
+        self.assertListEqual(func([1, 2], 10), [10, 20])
+        self.assertListEqual(func([1, 2], 100, offset=1), [101, 201])
+        self.assertListEqual(func([2, 3], 10), [20, 30])
+
+        self.assertEqual(func_mock.mock_calls, [
+            mock.call([1, 2], 10, 0), mock.call([1, 2], 100, 1),
+            mock.call([3], 10, 0),
+        ])
+
+    def test_batched_sharded_policy(self):
+        """Test a batched function with sharded cache of a policy."""
+        func_mock = mock.Mock()
+
+        @lru_cache(100, shards=4, policy='arc', batched=True)
+        def func(keys):
+            func_mock(keys)
+            return [key * 10 for key in keys]
+
+        self.assertListEqual(func([1, 2]), [10, 20])
+        self.assertListEqual(func([2, 3]), [20, 30])
+
+        self.assertEqual(func_mock.mock_calls, [
+            mock.call([1, 2]), mock.call([3]),
+        ])
+
+    def test_batch_size(self):
+        """Test that missed keys are split into batches."""
+        func_mock = mock.Mock()
+
+        @lru_cache(10, batched=True, batch_size=2)
+        def func(keys):
+            func_mock(keys)
+            return keys
+
+        self.assertListEqual(func(['a', 'b', 'c', 'd', 'e']),
+                             ['a', 'b', 'c', 'd', 'e'])
+
+        self.assertEqual(func_mock.mock_calls, [
+            mock.call(['a', 'b']), mock.call(['c', 'd']), mock.call(['e']),
+        ])
+
+    def test_batched_wrong_results(self):
+        """Test that amount of results must equal to amount of keys."""
+        @lru_cache(10, batched=True)
+        def func(keys):
+            return keys[1:]
+
+        with self.assertRaises(ValueError):
+            func([1, 2])
+
+    def test_batched_thread_pool(self):
+        """Test that batches are processed by a pool of threads."""
+        if ThreadPoolExecutor is None:
+            self.skipTest('concurrent.futures is not available')
+        executor = ThreadPoolExecutor(4)
+        self.addCleanup(executor.shutdown)
+        threads = set()
+
+        @lru_cache(100, batched=True, executor=executor, batch_size=10)
+        def func(keys):
+            threads.add(threading.current_thread())
+            return [key * 10 for key in keys]
+
+        self.assertListEqual(func(range(50)),
+                             [key * 10 for key in range(50)])
+        self.assertNotIn(threading.current_thread(), threads)
+
+    def test_batched_process_pool(self):
+        """Test that batches are processed by a pool of processes."""
+        if ProcessPoolExecutor is None:
+            self.skipTest('concurrent.futures is not available')
+        executor = ProcessPoolExecutor(2)
+        self.addCleanup(executor.shutdown)
+        func = lru_cache(100, batched=True, executor=executor,
+                         batch_size=10, stats=True)(square_all)
+
+        self.assertListEqual(func(range(30)),
+                             [key * key for key in range(30)])
+        self.assertListEqual(func([3, 31]), [9, 961])
+        self.assertEqual(func.cache_info().hits, 1)